@@ -4,3 +4,8 @@ set -o errexit
 pip install -r requirements.txt
 python manage.py collectstatic --noinput
 python manage.py migrate
+python manage.py createcachetable
+python manage.py rebuild_leaderboard
+python manage.py rebuild_species_records
+python manage.py reconcile_counters
+python manage.py build_image_derivatives
@@ -7,11 +7,9 @@ from django.utils.html import format_html
 from django.urls import path
 from django.shortcuts import redirect, get_object_or_404
 
-from .models import Catch, Species, SpeciesPhoto, SpeciesBaitIdea
-from .services.wikipedia import (
-    fetch_wikipedia_summary_pt,
-    try_extract_scientific_name_from_summary,
-)
+from .models import Catch, Species, SpeciesPhoto, SpeciesBaitIdea, SpeciesEnrichmentJob
+from .services.enrichment import enrich_species
+from .services.scoring import score_catches
 
 
 class SpeciesPhotoInline(admin.TabularInline):
@@ -50,6 +48,7 @@ class SpeciesAdmin(admin.ModelAdmin):
     list_display = (
         "cover_thumb",
         "name",
+        "category",
         "min_length_fmt",
         "points_per_cm_fmt",
         "is_competition_allowed",
@@ -57,7 +56,7 @@ class SpeciesAdmin(admin.ModelAdmin):
         "wiki_update_btn",
         "updated_at",
     )
-    list_filter = ("is_competition_allowed",)
+    list_filter = ("is_competition_allowed", "category")
     search_fields = ("name", "scientific_name", "slug", "wikipedia_title")
     prepopulated_fields = {"slug": ("name",)}
     ordering = ("name",)
@@ -66,10 +65,7 @@ class SpeciesAdmin(admin.ModelAdmin):
 
     @admin.display(description="Foto")
     def cover_thumb(self, obj: Species):
-        url = getattr(obj, "cover_image", None)
-        # cover_image é @property no seu model, retorna url ou None
-        if callable(url):
-            url = url()
+        url = obj.cover_url
         if not url:
             return format_html("<span style='color:#999'>—</span>")
         return format_html(
@@ -157,35 +153,16 @@ class SpeciesAdmin(admin.ModelAdmin):
         Atualiza species.summary e species.image_url (e tenta scientific_name) com base no wikipedia_title.
         Retorna True se atualizou algo.
         """
-        if not species.wikipedia_title:
-            return False
+        return bool(enrich_species(species))
 
-        data = fetch_wikipedia_summary_pt(species.wikipedia_title)
-        if not data:
-            return False
 
-        changed = False
-
-        summary = data.get("summary")
-        if summary and (not species.summary or species.summary.strip() == ""):
-            species.summary = summary
-            changed = True
-
-        image_url = data.get("image_url")
-        if image_url and (not species.image_url or species.image_url.strip() == ""):
-            species.image_url = image_url
-            changed = True
-
-        if not species.scientific_name and summary:
-            sci = try_extract_scientific_name_from_summary(summary)
-            if sci:
-                species.scientific_name = sci
-                changed = True
-
-        if changed:
-            species.save()
-
-        return changed
+@admin.register(SpeciesEnrichmentJob)
+class SpeciesEnrichmentJobAdmin(admin.ModelAdmin):
+    list_display = ("species", "status", "attempts", "requested_at", "finished_at", "worker", "last_error")
+    list_filter = ("status",)
+    list_select_related = ("species",)
+    search_fields = ("species__name",)
+    readonly_fields = ("started_at", "finished_at", "worker", "last_error")
 
 
 @admin.register(Catch)
@@ -203,6 +180,13 @@ class CatchAdmin(admin.ModelAdmin):
     list_select_related = ("member", "species")
     search_fields = ("member__name", "species__name", "location", "bait")
 
+    def get_changelist_instance(self, request):
+        # pontua a página inteira de uma vez (motor em lote, sem Decimal por linha)
+        cl = super().get_changelist_instance(request)
+        for obj, units in zip(cl.result_list, score_catches(cl.result_list)):
+            obj.points_units = units
+        return cl
+
     @admin.display(description="Pontos")
     def points_display(self, obj: Catch):
         pts = obj.calc_points()
@@ -1,7 +1,20 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
+
+from core.services.uploads import UploadRejected, ingest_image
 from .models import Catch
 
 class CatchCreateForm(forms.ModelForm):
     class Meta:
         model = Catch
         fields = ("photo", "species", "length_cm", "weight_kg", "location", "caught_at", "bait")
+
+    def clean_photo(self):
+        photo = self.cleaned_data.get("photo")
+        if not isinstance(photo, UploadedFile):
+            return photo
+        # orientação corrigida, sem EXIF/GPS, no máximo UPLOAD_PHOTO_MAX_SIDE px
+        try:
+            return ingest_image(photo)
+        except UploadRejected as exc:
+            raise forms.ValidationError(str(exc))
@@ -0,0 +1,64 @@
+# catches/management/commands/enrichment_worker.py
+from __future__ import annotations
+
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from catches.models import Species
+from catches.services.enrichment import enqueue_enrichment, needs_enrichment, process_queue, worker_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Processa a fila de enriquecimento das espécies (Wikipedia). "
+        "Roda em loop; use --once para esvaziar a fila e sair (ex: cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Processa o que houver na fila e sai.")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Segundos de espera com a fila vazia.")
+        parser.add_argument("--batch", type=int, default=20, help="Jobs por rodada antes de checar sinais.")
+        parser.add_argument(
+            "--enqueue-missing",
+            action="store_true",
+            help="Antes de começar, enfileira todas as espécies com resumo/imagem faltando.",
+        )
+
+    def handle(self, *args, **opts):
+        self._stop = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        if opts["enqueue_missing"]:
+            queued = sum(
+                enqueue_enrichment(s)
+                for s in Species.objects.exclude(wikipedia_title__isnull=True).exclude(wikipedia_title="")
+                if needs_enrichment(s)
+            )
+            self.stdout.write(f"{queued} espécie(s) enfileirada(s).")
+
+        worker = worker_name()
+        self.stdout.write(f"Worker {worker} iniciado.")
+        total_ok = total_fail = 0
+
+        while not self._stop:
+            close_old_connections()
+            ok, fail = process_queue(limit=opts["batch"], worker=worker)
+            total_ok += ok
+            total_fail += fail
+            if ok or fail:
+                self.stdout.write(f"Rodada: {ok} ok, {fail} falha(s).")
+
+            if opts["once"] and not (ok or fail):
+                break
+            if not (ok or fail):
+                time.sleep(opts["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Worker encerrado: {total_ok} ok, {total_fail} falha(s)."))
+
+    def _request_stop(self, signum, frame):
+        # termina o job atual e sai
+        self._stop = True
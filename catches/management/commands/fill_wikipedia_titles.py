@@ -1,72 +1,10 @@
 # catches/management/commands/fill_wikipedia_titles.py
 from __future__ import annotations
 
-import re
-import requests
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from catches.models import Species
-
-UA = "NabosSystem/1.0 (contact: dev@nabos.local)"
-
-
-def normalize_title(s: str) -> str:
-    s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-
-def wiki_opensearch_pt(query: str) -> str | None:
-    """
-    Retorna o melhor título sugerido pela Wikipedia PT para uma busca.
-    Usa opensearch (rápido).
-    """
-    if not query:
-        return None
-
-    url = "https://pt.wikipedia.org/w/api.php"
-    params = {
-        "action": "opensearch",
-        "format": "json",
-        "search": query,
-        "limit": 1,
-        "namespace": 0,
-        "redirects": "resolve",
-    }
-    r = requests.get(url, params=params, timeout=10, headers={"User-Agent": UA})
-    if r.status_code != 200:
-        return None
-
-    data = r.json()
-    # formato: [search, [titles], [descriptions], [urls]]
-    titles = data[1] if len(data) > 1 else []
-    if titles:
-        return normalize_title(titles[0])
-    return None
-
-
-def page_exists_pt(title: str) -> bool:
-    """
-    Confere se a página existe na Wikipedia PT.
-    """
-    if not title:
-        return False
-
-    url = "https://pt.wikipedia.org/w/api.php"
-    params = {
-        "action": "query",
-        "format": "json",
-        "titles": title,
-    }
-    r = requests.get(url, params=params, timeout=10, headers={"User-Agent": UA})
-    if r.status_code != 200:
-        return False
-    data = r.json()
-    pages = (data.get("query") or {}).get("pages") or {}
-    for _, page in pages.items():
-        # pageid = -1 indica inexistente
-        if page.get("missing") is not None:
-            return False
-    return True
+from catches.services.wikipedia import MAX_WORKERS, Checkpoint, WikipediaClient, checkpoint_path, map_concurrent
 
 
 class Command(BaseCommand):
@@ -89,6 +27,10 @@ class Command(BaseCommand):
             action="store_true",
             help="Mostra o que faria, mas não salva.",
         )
+        parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Buscas simultâneas na Wikipedia.")
+        parser.add_argument("--no-cache", action="store_true", help="Ignora o cache em disco das respostas.")
+        parser.add_argument("--resume", action="store_true", help="Pula as espécies já feitas na última rodada (checkpoint).")
+        parser.add_argument("--checkpoint", type=str, default="", help="Arquivo de checkpoint (padrão: junto do cache).")
 
     def handle(self, *args, **opts):
         force: bool = opts["force"]
@@ -103,39 +45,48 @@ class Command(BaseCommand):
         if limit and limit > 0:
             qs = qs[:limit]
 
-        total = qs.count()
+        client = WikipediaClient(cache_dir=None if opts["no_cache"] else settings.WIKIPEDIA_CACHE_DIR)
+        checkpoint = Checkpoint(opts["checkpoint"] or checkpoint_path("fill_wikipedia_titles"), resume=opts["resume"])
+        if not opts["resume"] and not dry:
+            checkpoint.clear()
+
+        species = [s for s in qs if s.pk not in checkpoint]
+        total = len(species)
         ok = fail = skip = 0
 
-        for s in qs:
-            if (s.wikipedia_title and not force):
+        # 1) sugestões (opensearch) em paralelo
+        guesses = {}
+        for s, guess, error in map_concurrent(lambda sp: client.opensearch(sp.name), species, opts["workers"]):
+            if error:
+                fail += 1
+                self.stdout.write(self.style.ERROR(f"[FAIL] {s.name}: {error}"))
+            elif not guess:
                 skip += 1
-                continue
-
-            query = s.name
-            try:
-                guess = wiki_opensearch_pt(query)
-
-                if not guess:
-                    skip += 1
-                    self.stdout.write(f"[SKIP] {s.name} -> sem sugestão")
-                    continue
+                self.stdout.write(f"[SKIP] {s.name} -> sem sugestão")
+            else:
+                guesses[s] = guess
 
-                # valida que existe
-                if not page_exists_pt(guess):
-                    skip += 1
-                    self.stdout.write(f"[SKIP] {s.name} -> sugestão '{guess}' não existe")
-                    continue
+        # 2) valida que existem: 50 títulos por chamada
+        existing = client.existing_titles(guesses.values())
 
-                if dry:
-                    self.stdout.write(f"[DRY] {s.name} -> wikipedia_title='{guess}'")
-                else:
-                    s.wikipedia_title = guess
-                    s.save(update_fields=["wikipedia_title"])
-                    self.stdout.write(self.style.SUCCESS(f"[OK] {s.name} -> {guess}"))
-                ok += 1
+        for s in sorted(guesses, key=lambda sp: sp.name):
+            guess = guesses[s]
+            if guess not in existing:
+                skip += 1
+                self.stdout.write(f"[SKIP] {s.name} -> sugestão '{guess}' não existe")
+                continue
 
-            except Exception as e:
-                fail += 1
-                self.stdout.write(self.style.ERROR(f"[FAIL] {s.name}: {e}"))
+            if dry:
+                self.stdout.write(f"[DRY] {s.name} -> wikipedia_title='{guess}'")
+            else:
+                s.wikipedia_title = guess
+                s.save(update_fields=["wikipedia_title"])
+                checkpoint.mark(s.pk)
+                self.stdout.write(self.style.SUCCESS(f"[OK] {s.name} -> {guess}"))
+            ok += 1
 
         self.stdout.write(self.style.SUCCESS(f"Total: {total} | OK: {ok} | Falhas: {fail} | Skips: {skip}"))
+        self.stdout.write(
+            f"Requisições: {client.stats['network']} rede | {client.stats['cached']} cache | "
+            f"{client.stats['revalidated']} revalidadas (304)"
+        )
@@ -0,0 +1,12 @@
+# catches/management/commands/rebuild_species_records.py
+from django.core.management.base import BaseCommand
+
+from catches.services.records import rebuild_all_records
+
+
+class Command(BaseCommand):
+    help = "Recalcula do zero os recordes por espécie (geral e por temporada)."
+
+    def handle(self, *args, **kwargs):
+        total = rebuild_all_records()
+        self.stdout.write(self.style.SUCCESS(f"Recordes recalculados para {total} espécie(s)."))
@@ -1,9 +1,11 @@
 # catches/management/commands/update_species_wiki.py
 from __future__ import annotations
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from catches.models import Species
-from catches.services.wikipedia import fetch_wikipedia_summary_pt, try_extract_scientific_name_from_summary
+from catches.services.enrichment import apply_wikipedia_data
+from catches.services.wikipedia import MAX_WORKERS, Checkpoint, WikipediaClient, checkpoint_path, map_concurrent
 
 
 class Command(BaseCommand):
@@ -12,6 +14,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--slug", type=str, help="Atualiza apenas uma espécie pelo slug.")
         parser.add_argument("--force", action="store_true", help="Sobrescreve summary/image_url mesmo se já existir.")
+        parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Buscas simultâneas na Wikipedia.")
+        parser.add_argument("--no-cache", action="store_true", help="Ignora o cache em disco das respostas.")
+        parser.add_argument("--resume", action="store_true", help="Pula as espécies já feitas na última rodada (checkpoint).")
+        parser.add_argument("--checkpoint", type=str, default="", help="Arquivo de checkpoint (padrão: junto do cache).")
 
     def handle(self, *args, **options):
         slug = options.get("slug")
@@ -21,52 +27,42 @@ class Command(BaseCommand):
         if slug:
             qs = qs.filter(slug=slug)
 
-        total = qs.count()
+        client = WikipediaClient(cache_dir=None if options["no_cache"] else settings.WIKIPEDIA_CACHE_DIR)
+        checkpoint = Checkpoint(options["checkpoint"] or checkpoint_path("update_species_wiki"), resume=options["resume"])
+        if not options["resume"]:
+            checkpoint.clear()
+
+        species = list(qs)
+        total = len(species)
         ok = 0
         fail = 0
         skip = 0
 
-        for s in qs:
-            if not s.wikipedia_title:
+        todo = []
+        for s in species:
+            if not s.wikipedia_title or s.pk in checkpoint:
                 skip += 1
-                continue
+            else:
+                todo.append(s)
 
-            data = fetch_wikipedia_summary_pt(s.wikipedia_title)
-            if not data:
+        # rede em paralelo; gravação no banco só nesta thread
+        for s, data, error in map_concurrent(lambda sp: client.summary(sp.wikipedia_title), todo, options["workers"]):
+            if error or not data:
                 fail += 1
+                if error:
+                    self.stdout.write(self.style.ERROR(f"[FAIL] {s.name}: {error}"))
                 continue
 
-            changed = False
-
-            summary = data.get("summary")
-            image_url = data.get("image_url")
-
-            if force:
-                if summary:
-                    s.summary = summary
-                    changed = True
-                if image_url:
-                    s.image_url = image_url
-                    changed = True
-            else:
-                if summary and not s.summary:
-                    s.summary = summary
-                    changed = True
-                if image_url and not s.image_url:
-                    s.image_url = image_url
-                    changed = True
-
-            if not s.scientific_name and summary:
-                sci = try_extract_scientific_name_from_summary(summary)
-                if sci:
-                    s.scientific_name = sci
-                    changed = True
-
-            if changed:
+            if apply_wikipedia_data(s, data, force=force):
                 s.save()
                 ok += 1
             else:
                 # já tinha tudo preenchido
                 skip += 1
+            checkpoint.mark(s.pk)
 
         self.stdout.write(self.style.SUCCESS(f"Total: {total} | OK: {ok} | Falhas: {fail} | Skips: {skip}"))
+        self.stdout.write(
+            f"Requisições: {client.stats['network']} rede | {client.stats['cached']} cache | "
+            f"{client.stats['revalidated']} revalidadas (304)"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0007_species_is_competition_allowed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='species',
+            name='category',
+            field=models.CharField(blank=True, choices=[('A', 'Categoria A'), ('B', 'Categoria B'), ('C', 'Categoria C')], default='', max_length=1, verbose_name='Categoria'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0008_species_category'),
+        ('members', '0003_alter_member_options_member_gender_alter_member_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpeciesRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('length', 'Maior tamanho'), ('weight', 'Mais pesado'), ('points', 'Maior pontuação')], max_length=10, verbose_name='Tipo')),
+                ('season', models.PositiveSmallIntegerField(default=0, verbose_name='Temporada')),
+                ('value', models.DecimalField(decimal_places=4, max_digits=14, verbose_name='Valor')),
+                ('caught_at', models.DateTimeField(verbose_name='Data da captura')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Recorde da espécie',
+                'verbose_name_plural': 'Recordes das espécies',
+                'ordering': ['species', '-season', 'kind'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='catch',
+            index=models.Index(fields=['species', '-length_cm'], name='catch_species_length_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='catch',
+            index=models.Index(fields=['species', '-weight_kg'], name='catch_species_weight_idx'),
+        ),
+        migrations.AddField(
+            model_name='speciesrecord',
+            name='catch',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catches.catch', verbose_name='Captura'),
+        ),
+        migrations.AddField(
+            model_name='speciesrecord',
+            name='member',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.member', verbose_name='Membro'),
+        ),
+        migrations.AddField(
+            model_name='speciesrecord',
+            name='species',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records', to='catches.species', verbose_name='Espécie'),
+        ),
+        migrations.AddConstraint(
+            model_name='speciesrecord',
+            constraint=models.UniqueConstraint(fields=('species', 'kind', 'season'), name='species_record_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0009_species_records'),
+        ('members', '0005_member_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='catch',
+            index=models.Index(fields=['member', '-caught_at', '-id'], name='catch_member_history_idx'),
+        ),
+    ]
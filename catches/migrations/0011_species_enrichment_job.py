@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0010_catch_member_history_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpeciesEnrichmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Na fila'), ('running', 'Processando'), ('done', 'Concluído'), ('failed', 'Falhou')], default='pending', max_length=10, verbose_name='Status')),
+                ('force', models.BooleanField(default=False, verbose_name='Sobrescrever dados')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('requested_at', models.DateTimeField(verbose_name='Pedido em')),
+                ('available_at', models.DateTimeField(verbose_name='Disponível a partir de')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+                ('worker', models.CharField(blank=True, default='', max_length=80, verbose_name='Worker')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último erro')),
+                ('species', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='enrichment_job', to='catches.species', verbose_name='Espécie')),
+            ],
+            options={
+                'verbose_name': 'Enriquecimento (Wikipedia)',
+                'verbose_name_plural': 'Fila de enriquecimento (Wikipedia)',
+                'ordering': ['status', 'available_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='enrich_job_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:43
+
+from django.db import migrations, models
+
+
+def fill_cover_url(apps, schema_editor):
+    Species = apps.get_model("catches", "Species")
+    SpeciesPhoto = apps.get_model("catches", "SpeciesPhoto")
+
+    # primeira foto de cada espécie (mesma ordem do model: -created_at)
+    first_photo = {}
+    for photo in SpeciesPhoto.objects.exclude(image="").order_by("species_id", "-created_at", "-id"):
+        first_photo.setdefault(photo.species_id, photo)
+
+    species = list(Species.objects.only("id", "image_url"))
+    for s in species:
+        photo = first_photo.get(s.id)
+        s.cover_url = photo.image.url if photo else (s.image_url or "")
+    Species.objects.bulk_update(species, ["cover_url"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0011_species_enrichment_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='species',
+            name='cover_url',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='Capa (URL)'),
+        ),
+        migrations.RunPython(fill_cover_url, migrations.RunPython.noop),
+    ]
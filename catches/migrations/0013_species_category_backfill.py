@@ -0,0 +1,47 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:40
+
+from django.db import migrations
+
+# regra oficial (seed_species_rules.RULES) congelada aqui: a migração não
+# pode mudar de comportamento quando o comando mudar
+CATEGORY_BY_NAME = {
+    "ROBALO FLECHA": "A",
+    "ROBALO PEVA": "A",
+    "PESCADA AMARELA": "A",
+    "PAMPO / SARNAMBIGUARA": "A",
+    "LINGUADO": "A",
+    "ANCHOVA": "A",
+    "PESCADA BRANCA": "B",
+    "PIRAÚNA": "B",
+    "SARGO": "B",
+    "XARÉU AMARELO": "B",
+    "XARÉU BRANCO / GALO PENACHO": "B",
+    "CORVINA": "C",
+    "BAIACÚ": "C",
+    "GUAIVIRA": "C",
+    "FAQUECO": "C",
+    "XERELETE": "C",
+    "GALO": "C",
+}
+
+
+def fill_category(apps, schema_editor):
+    Species = apps.get_model("catches", "Species")
+
+    # só quem ficou sem categoria na 0008 (não sobrescreve o que o admin mudou)
+    by_category = {}
+    for name, category in CATEGORY_BY_NAME.items():
+        by_category.setdefault(category, []).append(name)
+    for category, names in by_category.items():
+        Species.objects.filter(name__in=names, category="").update(category=category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0012_species_cover_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_category, migrations.RunPython.noop),
+    ]
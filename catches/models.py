@@ -1,10 +1,38 @@
-from decimal import Decimal
 from django.db import models
 from django.utils.text import slugify
+from core.services.images import card_image_url
 from members.models import Member
+from .services.scoring import SpeciesRule, units_to_int
+
+
+class SpeciesQuerySet(models.QuerySet):
+    CARD_BAIT_IDEAS = 3
+
+    def cards(self):
+        """
+        Projeção dos cards de espécie: tudo que o card usa, em número fixo
+        de queries (não cresce com o tamanho da página):
+        - card_bait_ideas: no máximo 3 iscas por espécie (prefetch fatiado,
+          o Django filtra com window function numa query só);
+        - catches_count;
+        - a capa já vem na própria linha (cover_url).
+        """
+        return self.annotate(catches_count=models.Count("catches")).prefetch_related(
+            models.Prefetch(
+                "bait_ideas",
+                queryset=SpeciesBaitIdea.objects.order_by("bait_name", "id")[: self.CARD_BAIT_IDEAS],
+                to_attr="card_bait_ideas",
+            )
+        )
 
 
 class Species(models.Model):
+    CATEGORY_CHOICES = [
+        ("A", "Categoria A"),
+        ("B", "Categoria B"),
+        ("C", "Categoria C"),
+    ]
+
     name = models.CharField("Nome comum", max_length=120, unique=True)
     slug = models.SlugField("Slug", max_length=140, unique=True, blank=True)
 
@@ -17,6 +45,7 @@ class Species(models.Model):
 
     min_length_cm = models.DecimalField("Comprimento mínimo (cm)", max_digits=6, decimal_places=2, default=0)
     points_per_cm = models.DecimalField("Pontos por centímetro", max_digits=6, decimal_places=2, default=0)
+    category = models.CharField("Categoria", max_length=1, choices=CATEGORY_CHOICES, blank=True, default="")
 
     behavior = models.TextField("Comportamento", blank=True, null=True)
     habitats = models.TextField("Locais / Habitat", blank=True, null=True)
@@ -24,8 +53,13 @@ class Species(models.Model):
     
     best_times = models.CharField("Melhor horário/condição", max_length=180, blank=True, null=True)
 
+    # capa já resolvida (1ª foto ou image_url); mantida pelo save e pelos signals de SpeciesPhoto
+    cover_url = models.CharField("Capa (URL)", max_length=500, blank=True, default="", editable=False)
+
     updated_at = models.DateTimeField("Atualizado em", auto_now=True)
 
+    objects = SpeciesQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Espécie"
         verbose_name_plural = "Espécies"
@@ -40,21 +74,34 @@ class Species(models.Model):
                 slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = slug
+
+        self.cover_url = self.resolve_cover_url()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "image_url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "cover_url"}
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
-    
-    @property
-    def cover_image(self):
+
+    def resolve_cover_url(self) -> str:
         # 1) primeira foto cadastrada
-        photo = self.photos.first()
-        if photo and photo.image:
-            return photo.image.url
+        if self.pk:
+            photo = self.photos.exclude(image="").first()
+            if photo:
+                # derivado do tamanho do card, quando já foi gerado
+                return card_image_url(photo.image)
         # 2) fallback URL
-        if self.image_url:
-            return self.image_url
-        return None
+        return self.image_url or ""
+
+    def refresh_cover_url(self) -> None:
+        """Recalcula a capa sem passar pelo save (não mexe em updated_at nem dispara signals)."""
+        self.cover_url = self.resolve_cover_url()
+        Species.objects.filter(pk=self.pk).update(cover_url=self.cover_url)
+
+    @property
+    def cover_image(self):
+        return self.cover_url or None
 
 
 
@@ -77,6 +124,13 @@ class Catch(models.Model):
         verbose_name = "Captura"
         verbose_name_plural = "Capturas"
         ordering = ["-caught_at"]
+        indexes = [
+            # recordes por espécie (catches.services.records)
+            models.Index(fields=["species", "-length_cm"], name="catch_species_length_idx"),
+            models.Index(fields=["species", "-weight_kg"], name="catch_species_weight_idx"),
+            # histórico do membro, paginado por cursor em (caught_at, id)
+            models.Index(fields=["member", "-caught_at", "-id"], name="catch_member_history_idx"),
+        ]
 
     def __str__(self):
         return f"{self.member} - {self.species} ({self.caught_at:%d/%m/%Y})"
@@ -87,18 +141,15 @@ class Catch(models.Model):
         - Só pontua se length_cm >= species.min_length_cm
         - Pontos = length_cm * species.points_per_cm
         - Retorna inteiro (arredondando para baixo)
+        Cálculo em catches.services.scoring (inteiros, sem Decimal).
         """
         if self.length_cm is None or self.species_id is None:
             return 0
 
-        min_len = self.species.min_length_cm or Decimal("0")
-        mult = self.species.points_per_cm or Decimal("0")
-
-        if self.length_cm < min_len:
-            return 0
-
-        pts = self.length_cm * mult
-        return int(pts)
+        units = getattr(self, "points_units", None)
+        if units is None:
+            units = SpeciesRule.from_species(self.species).score(self.length_cm)
+        return units_to_int(units)
 
     @property
     def points_int(self) -> int:
@@ -133,3 +184,88 @@ class SpeciesBaitIdea(models.Model):
 
     def __str__(self):
         return f"{self.species} - {self.bait_name}"
+
+
+class SpeciesRecord(models.Model):
+    """
+    Recordes por espécie (pré-calculados no save/delete de Catch).
+    season = ano da captura; 0 = recorde de todos os tempos.
+    """
+    LENGTH = "length"
+    WEIGHT = "weight"
+    POINTS = "points"
+    KIND_CHOICES = [
+        (LENGTH, "Maior tamanho"),
+        (WEIGHT, "Mais pesado"),
+        (POINTS, "Maior pontuação"),
+    ]
+    ALL_TIME = 0
+
+    species = models.ForeignKey(Species, on_delete=models.CASCADE, related_name="records", verbose_name="Espécie")
+    kind = models.CharField("Tipo", max_length=10, choices=KIND_CHOICES)
+    season = models.PositiveSmallIntegerField("Temporada", default=ALL_TIME)
+
+    catch = models.ForeignKey(Catch, on_delete=models.CASCADE, related_name="+", verbose_name="Captura")
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="+", verbose_name="Membro")
+    value = models.DecimalField("Valor", max_digits=14, decimal_places=4)
+    caught_at = models.DateTimeField("Data da captura")
+
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Recorde da espécie"
+        verbose_name_plural = "Recordes das espécies"
+        ordering = ["species", "-season", "kind"]
+        constraints = [
+            models.UniqueConstraint(fields=["species", "kind", "season"], name="species_record_unique"),
+        ]
+
+    def __str__(self):
+        scope = "geral" if self.season == self.ALL_TIME else self.season
+        return f"{self.species} • {self.get_kind_display()} ({scope})"
+
+
+class SpeciesEnrichmentJob(models.Model):
+    """
+    Fila de enriquecimento via Wikipedia (1 linha por espécie = sem duplicatas).
+    Processada pelo comando enrichment_worker (catches.services.enrichment).
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Na fila"),
+        (RUNNING, "Processando"),
+        (DONE, "Concluído"),
+        (FAILED, "Falhou"),
+    ]
+
+    species = models.OneToOneField(
+        Species,
+        on_delete=models.CASCADE,
+        related_name="enrichment_job",
+        verbose_name="Espécie",
+    )
+    status = models.CharField("Status", max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    force = models.BooleanField("Sobrescrever dados", default=False)
+    attempts = models.PositiveSmallIntegerField("Tentativas", default=0)
+
+    requested_at = models.DateTimeField("Pedido em")
+    available_at = models.DateTimeField("Disponível a partir de")
+    started_at = models.DateTimeField("Iniciado em", blank=True, null=True)
+    finished_at = models.DateTimeField("Finalizado em", blank=True, null=True)
+
+    worker = models.CharField("Worker", max_length=80, blank=True, default="")
+    last_error = models.TextField("Último erro", blank=True, default="")
+
+    class Meta:
+        verbose_name = "Enriquecimento (Wikipedia)"
+        verbose_name_plural = "Fila de enriquecimento (Wikipedia)"
+        ordering = ["status", "available_at"]
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="enrich_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.species} • {self.get_status_display()}"
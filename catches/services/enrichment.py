@@ -0,0 +1,174 @@
+# catches/services/enrichment.py
+"""
+Enriquecimento das espécies via Wikipedia (resumo, imagem, nome científico).
+
+A página da espécie não chama mais a Wikipedia: só enfileira um
+SpeciesEnrichmentJob (1 por espécie, então visitas simultâneas não
+duplicam o trabalho) e renderiza com o que já tem. O comando
+enrichment_worker processa a fila; cada job é reservado com um UPDATE
+condicional (status=pending -> running), então vários workers podem
+rodar juntos sem pegar o mesmo job.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from catches.models import Species, SpeciesEnrichmentJob as Job
+from catches.services.wikipedia import fetch_wikipedia_summary_pt, try_extract_scientific_name_from_summary
+
+logger = logging.getLogger(__name__)
+
+COOLDOWN = timedelta(hours=6)      # não refaz uma espécie processada há pouco
+STALE_AFTER = timedelta(minutes=5)  # job "running" abandonado (worker morreu)
+MAX_ATTEMPTS = 5
+RETRY_BASE = timedelta(minutes=1)  # 1, 2, 4, 8... minutos
+
+
+# -------------------------
+# ENRIQUECIMENTO
+# -------------------------
+def needs_enrichment(species: Species) -> bool:
+    return bool(species.wikipedia_title) and (not species.summary or not species.image_url)
+
+
+def apply_wikipedia_data(species: Species, data: dict, force: bool = False) -> bool:
+    """Copia resumo/imagem (só o que está vazio, ou tudo com force). True se mudou algo."""
+    changed = False
+
+    summary = data.get("summary")
+    if summary and (force or not (species.summary or "").strip()):
+        species.summary = summary
+        changed = True
+
+    image_url = data.get("image_url")
+    if image_url and (force or not (species.image_url or "").strip()):
+        species.image_url = image_url
+        changed = True
+
+    if not species.scientific_name and species.summary:
+        sci = try_extract_scientific_name_from_summary(species.summary)
+        if sci:
+            species.scientific_name = sci
+            changed = True
+
+    return changed
+
+
+def enrich_species(species: Species, force: bool = False) -> bool | None:
+    """
+    Busca na Wikipedia e salva. True = atualizou, False = nada a mudar,
+    None = sem título ou a Wikipedia não respondeu.
+    """
+    if not species.wikipedia_title:
+        return None
+
+    data = fetch_wikipedia_summary_pt(species.wikipedia_title)
+    if not data:
+        return None
+
+    changed = apply_wikipedia_data(species, data, force=force)
+    if changed:
+        species.save()
+    return changed
+
+
+# -------------------------
+# FILA
+# -------------------------
+def enqueue_enrichment(species: Species, force: bool = False) -> bool:
+    """
+    Coloca a espécie na fila (idempotente). Retorna True se criou/reativou
+    o job; False se já está na fila, rodando ou em cooldown.
+    """
+    now = timezone.now()
+    job, created = Job.objects.get_or_create(
+        species=species,
+        defaults={"force": force, "requested_at": now, "available_at": now},
+    )
+    if created:
+        return True
+
+    if job.status in (Job.PENDING, Job.RUNNING):
+        return False
+    if not force and job.finished_at and job.finished_at > now - COOLDOWN:
+        return False
+
+    # reativa só se ninguém mexeu no job nesse meio tempo
+    return bool(
+        Job.objects
+        .filter(pk=job.pk, status=job.status)
+        .update(status=Job.PENDING, force=force, attempts=0, requested_at=now, available_at=now, last_error="")
+    )
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker: str) -> Job | None:
+    """Reserva o próximo job disponível (UPDATE condicional; seguro com vários workers)."""
+    now = timezone.now()
+
+    # jobs presos em "running" (worker caiu) voltam para a fila
+    Job.objects.filter(status=Job.RUNNING, started_at__lt=now - STALE_AFTER).update(status=Job.PENDING)
+
+    candidates = (
+        Job.objects
+        .filter(status=Job.PENDING, available_at__lte=now)
+        .order_by("available_at", "id")
+        .values_list("id", flat=True)[:10]
+    )
+    for job_id in candidates:
+        claimed = (
+            Job.objects
+            .filter(pk=job_id, status=Job.PENDING)
+            .update(status=Job.RUNNING, started_at=now, worker=worker, attempts=F("attempts") + 1)
+        )
+        if claimed:
+            return Job.objects.select_related("species").get(pk=job_id)
+    return None
+
+
+def run_job(job: Job) -> bool:
+    """Processa um job já reservado. Retorna True se terminou (ok ou sem mudanças)."""
+    now = timezone.now()
+    try:
+        result = enrich_species(job.species, force=job.force)
+        error = "" if result is not None else "Wikipedia não respondeu (ou sem título)."
+    except Exception as exc:  # worker não pode morrer por causa de uma espécie
+        logger.exception("Falha ao enriquecer %s", job.species)
+        result, error = None, f"{type(exc).__name__}: {exc}"
+
+    if result is not None or not job.species.wikipedia_title:
+        Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=now, last_error=error)
+        return True
+
+    if job.attempts >= MAX_ATTEMPTS:
+        Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error=error)
+        return False
+
+    # tenta de novo mais tarde (backoff exponencial)
+    retry_at = now + RETRY_BASE * (2 ** (job.attempts - 1))
+    Job.objects.filter(pk=job.pk).update(status=Job.PENDING, available_at=retry_at, last_error=error)
+    return False
+
+
+def process_queue(limit: int | None = None, worker: str | None = None) -> tuple[int, int]:
+    """Processa jobs até a fila esvaziar (ou `limit`). Retorna (ok, falhas)."""
+    worker = worker or worker_name()
+    ok = fail = 0
+    while limit is None or ok + fail < limit:
+        job = claim_next_job(worker)
+        if job is None:
+            break
+        if run_job(job):
+            ok += 1
+        else:
+            fail += 1
+    return ok, fail
@@ -0,0 +1,125 @@
+# catches/services/records.py
+"""
+Recordes por espécie (catches.SpeciesRecord).
+
+Cada captura salva/apagada recalcula só os recordes da sua espécie, no
+escopo geral (season=0) e na temporada da captura: poucas consultas
+LIMIT 1 pelos índices (species, -length_cm) / (species, -weight_kg).
+As páginas só leem a tabela pronta.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from catches.models import Catch, Species, SpeciesRecord
+from catches.services.scoring import SpeciesRule, units_to_decimal
+
+ALL_KINDS = (SpeciesRecord.LENGTH, SpeciesRecord.WEIGHT, SpeciesRecord.POINTS)
+
+
+def season_for(dt: datetime) -> int:
+    """Temporada = ano (no fuso do projeto) da captura."""
+    return timezone.localtime(dt).year
+
+
+def current_season() -> int:
+    return season_for(timezone.now())
+
+
+def _season_range(season: int):
+    tz = timezone.get_current_timezone()
+    return datetime(season, 1, 1, tzinfo=tz), datetime(season + 1, 1, 1, tzinfo=tz)
+
+
+def _best_catch(species: Species, kind: str, season: int):
+    qs = Catch.objects.filter(species=species)
+    if season != SpeciesRecord.ALL_TIME:
+        start, end = _season_range(season)
+        qs = qs.filter(caught_at__gte=start, caught_at__lt=end)
+
+    if kind == SpeciesRecord.WEIGHT:
+        return qs.order_by("-weight_kg", "caught_at", "id").first()
+
+    if kind == SpeciesRecord.POINTS:
+        # pontos/cm é fixo na espécie: maior pontuação = maior captura válida
+        if species.points_per_cm <= 0:
+            return None
+        qs = qs.filter(length_cm__gte=species.min_length_cm)
+
+    return qs.order_by("-length_cm", "caught_at", "id").first()
+
+
+def _record_value(species: Species, kind: str, catch: Catch):
+    if kind == SpeciesRecord.LENGTH:
+        return catch.length_cm
+    if kind == SpeciesRecord.WEIGHT:
+        return catch.weight_kg
+    return units_to_decimal(SpeciesRule.from_species(species).score(catch.length_cm))
+
+
+@transaction.atomic
+def refresh_species_records(species_id: int, seasons=(), kinds=ALL_KINDS) -> None:
+    """Recalcula os recordes da espécie (geral + temporadas informadas)."""
+    species = Species.objects.filter(pk=species_id).first()
+    if species is None:
+        return
+
+    for season in {SpeciesRecord.ALL_TIME, *seasons}:
+        for kind in kinds:
+            best = _best_catch(species, kind, season)
+            if best is None:
+                SpeciesRecord.objects.filter(species=species, kind=kind, season=season).delete()
+                continue
+
+            SpeciesRecord.objects.update_or_create(
+                species=species,
+                kind=kind,
+                season=season,
+                defaults={
+                    "catch": best,
+                    "member_id": best.member_id,
+                    "value": _record_value(species, kind, best),
+                    "caught_at": best.caught_at,
+                },
+            )
+
+
+def species_seasons(species_id: int) -> list[int]:
+    return sorted({season_for(dt) for dt in Catch.objects.filter(species_id=species_id).datetimes("caught_at", "year")})
+
+
+def rebuild_all_records() -> int:
+    """Recalcula tudo (comando rebuild_species_records). Retorna nº de espécies."""
+    total = 0
+    for species_id in Species.objects.values_list("id", flat=True):
+        SpeciesRecord.objects.filter(species_id=species_id).delete()
+        refresh_species_records(species_id, seasons=species_seasons(species_id))
+        total += 1
+    return total
+
+
+def records_board(records) -> dict:
+    """
+    Organiza recordes para o template:
+    {"all": {"length": rec, ...}, "season": {...}}
+    """
+    season = current_season()
+    board = {"all": {}, "season": {}}
+    for rec in records:
+        if rec.season == SpeciesRecord.ALL_TIME:
+            board["all"][rec.kind] = rec
+        elif rec.season == season:
+            board["season"][rec.kind] = rec
+    return board
+
+
+def records_for_species(species: Species) -> dict:
+    records = (
+        SpeciesRecord.objects
+        .filter(species=species, season__in=[SpeciesRecord.ALL_TIME, current_season()])
+        .select_related("member")
+    )
+    return records_board(records)
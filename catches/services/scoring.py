@@ -0,0 +1,137 @@
+# catches/services/scoring.py
+"""
+Motor único de pontuação.
+
+Tudo em inteiros: comprimento e pontos/cm viram centésimos (x100), então
+pontos = cm_centi * ppc_centi em "unidades" de 0,0001 ponto. Sem Decimal
+por linha; o Decimal só aparece na borda (units_to_decimal).
+
+As regras das espécies (mínimo, pontos/cm e categoria A/B/C) são
+compiladas em uma ScoringTable com arrays paralelos, e score_batch
+pontua um lote inteiro de capturas de uma vez.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_EVEN
+
+SCALE = 100                     # centésimos
+UNITS_PER_POINT = SCALE * SCALE  # 1 ponto = 10.000 unidades
+POINTS_EXPONENT = -4
+
+
+def to_centi(value) -> int:
+    """Decimal/int/str -> centésimos inteiros (None/vazio = 0)."""
+    if value is None or value == "":
+        return 0
+    d = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(d.scaleb(2).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def units_to_decimal(units: int) -> Decimal:
+    """Unidades -> pontos em Decimal (mesmo valor do cálculo Decimal antigo)."""
+    if not units:
+        return Decimal("0")
+    return Decimal(units).scaleb(POINTS_EXPONENT)
+
+
+def units_to_int(units: int) -> int:
+    """Unidades -> pontos inteiros, truncando (igual a int(Decimal))."""
+    if units < 0:
+        return -(-units // UNITS_PER_POINT)
+    return units // UNITS_PER_POINT
+
+
+@dataclass(frozen=True)
+class SpeciesRule:
+    min_centi: int
+    ppc_centi: int
+    category: str = ""
+
+    @classmethod
+    def from_values(cls, min_length_cm, points_per_cm, category="") -> "SpeciesRule":
+        return cls(to_centi(min_length_cm), to_centi(points_per_cm), category or "")
+
+    @classmethod
+    def from_species(cls, species) -> "SpeciesRule":
+        return cls.from_values(species.min_length_cm, species.points_per_cm, getattr(species, "category", ""))
+
+    def score_centi(self, length_centi: int) -> int:
+        if length_centi < self.min_centi:
+            return 0
+        return length_centi * self.ppc_centi
+
+    def score(self, length_cm) -> int:
+        if length_cm is None:
+            return 0
+        return self.score_centi(to_centi(length_cm))
+
+
+class ScoringTable:
+    """
+    Regras compiladas: species_id -> posição nos arrays min/ppc/categoria.
+    """
+
+    def __init__(self, rules: dict[int, SpeciesRule]):
+        self._index = {}
+        self.min_centi = array("q")
+        self.ppc_centi = array("q")
+        self.categories = []
+        for species_id, rule in rules.items():
+            self._index[species_id] = len(self.min_centi)
+            self.min_centi.append(rule.min_centi)
+            self.ppc_centi.append(rule.ppc_centi)
+            self.categories.append(rule.category)
+
+    @classmethod
+    def from_species(cls, species_iter) -> "ScoringTable":
+        return cls({s.pk: SpeciesRule.from_species(s) for s in species_iter})
+
+    @classmethod
+    def load(cls, queryset=None) -> "ScoringTable":
+        """Uma query: compila a tabela de todas as espécies (ou do queryset)."""
+        from catches.models import Species
+
+        qs = queryset if queryset is not None else Species.objects.all()
+        rows = qs.values_list("id", "min_length_cm", "points_per_cm", "category")
+        return cls({pk: SpeciesRule.from_values(mn, ppc, cat) for pk, mn, ppc, cat in rows})
+
+    def __contains__(self, species_id) -> bool:
+        return species_id in self._index
+
+    def rule(self, species_id: int) -> SpeciesRule:
+        i = self._index[species_id]
+        return SpeciesRule(self.min_centi[i], self.ppc_centi[i], self.categories[i])
+
+    def category(self, species_id: int) -> str:
+        return self.categories[self._index[species_id]]
+
+    def score_batch(self, lengths_centi, species_ids) -> array:
+        """
+        Pontua um lote: lengths_centi[i] (centésimos de cm) da espécie
+        species_ids[i]. Retorna array("q") com as unidades de cada captura.
+        """
+        index = self._index
+        mins = self.min_centi
+        ppcs = self.ppc_centi
+        out = array("q", bytes(8 * len(lengths_centi)))
+
+        for i, (length, species_id) in enumerate(zip(lengths_centi, species_ids)):
+            j = index.get(species_id)
+            if j is None or length < mins[j]:
+                continue
+            out[i] = length * ppcs[j]
+        return out
+
+
+def score_catches(catches) -> array:
+    """
+    Pontua uma lista de Catch (com species já carregada, ex: select_related)
+    sem nenhuma query extra. Retorna as unidades na mesma ordem.
+    """
+    catches = list(catches)
+    table = ScoringTable.from_species({c.species.pk: c.species for c in catches if c.species_id}.values())
+    lengths = array("q", (to_centi(c.length_cm) for c in catches))
+    species_ids = array("q", (c.species_id or 0 for c in catches))
+    return table.score_batch(lengths, species_ids)
@@ -1,11 +1,45 @@
 # catches/services/wikipedia.py
+"""
+Cliente da Wikipedia PT usado no enriquecimento das espécies.
+
+- uma requests.Session compartilhada (keep-alive + pool de conexões)
+  com retry/backoff em 429/5xx (respeita Retry-After);
+- limite de requisições por segundo, seguro entre threads (os comandos
+  buscam várias espécies em paralelo com ThreadPoolExecutor);
+- existência de páginas checada em lote (a API aceita 50 títulos/chamada);
+- cache em disco das respostas: dentro de WIKIPEDIA_CACHE_FRESH nem vai à
+  rede; depois disso revalida com If-None-Match/If-Modified-Since (304 =
+  usa o corpo guardado).
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import quote
+
 import requests
-from typing import Optional, Dict, Any
+from django.conf import settings
+from urllib3.util.retry import Retry
+
+from core.services.http_transport import mount_transport
 
 WIKI_SUMMARY_PT = "https://pt.wikipedia.org/api/rest_v1/page/summary/"
+WIKI_API_PT = "https://pt.wikipedia.org/w/api.php"
+
+USER_AGENT = "NabosSystem/1.0 (Species Enrichment)"
+TITLES_PER_QUERY = 50
+
+RATE_LIMIT = getattr(settings, "WIKIPEDIA_RATE_LIMIT", 10.0)     # req/s (0 = sem limite)
+MAX_WORKERS = getattr(settings, "WIKIPEDIA_MAX_WORKERS", 4)
+CACHE_DIR = getattr(settings, "WIKIPEDIA_CACHE_DIR", None)         # None = sem cache em disco
+CACHE_FRESH = getattr(settings, "WIKIPEDIA_CACHE_FRESH", 24 * 3600)
 
 
 def _clean_title(title: str) -> str:
@@ -14,38 +48,281 @@ def _clean_title(title: str) -> str:
     return title
 
 
-def fetch_wikipedia_summary_pt(title: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
-    """
-    Busca dados básicos da Wikipedia PT via REST summary:
-    - title
-    - extract (summary)
-    - thumbnail.source (image_url)
-    - content_urls.desktop.page (url)
-    """
-    if not title:
-        return None
+def normalize_title(s: str) -> str:
+    s = (s or "").strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+# -------------------------
+# INFRA (sessão, rate limit, cache)
+# -------------------------
+class RateLimiter:
+    """Espaça as chamadas em 1/rate segundos, entre todas as threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
 
-    safe_title = _clean_title(title)
-    url = f"{WIKI_SUMMARY_PT}{safe_title}"
+def build_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    # live / record / replay / server (ver core.services.http_transport)
+    return mount_transport(session, pool_connections=2, pool_maxsize=max(pool_size, 1), max_retries=retry)
 
-    try:
-        r = requests.get(
-            url,
-            timeout=timeout,
-            headers={"User-Agent": "NabosSystem/1.0 (Species Enrichment)"},
-        )
+
+class ResponseCache:
+    """Cache em disco (1 JSON por URL) com os validadores da resposta."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, entry: dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+# -------------------------
+# CLIENTE
+# -------------------------
+class WikipediaClient:
+    def __init__(self, session=None, rate=RATE_LIMIT, cache_dir=CACHE_DIR, fresh_for=CACHE_FRESH, timeout=10):
+        self.session = session or build_session()
+        self.limiter = RateLimiter(rate)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.fresh_for = fresh_for
+        self.timeout = timeout
+        self.stats = {"network": 0, "cached": 0, "revalidated": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get_json(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Optional[Any]:
+        """GET com cache/revalidação. None se não deu 200 (ou falha de rede). timeout padrão: o do cliente."""
+        key = url + ("?" + json.dumps(params, sort_keys=True) if params else "")
+        entry = self.cache.get(key) if self.cache else None
+
+        if entry and time.time() - entry.get("stored_at", 0) < self.fresh_for:
+            self._count("cached")
+            return entry["body"]
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        self.limiter.wait()
+        try:
+            r = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+        except requests.RequestException:
+            # sem rede: um corpo antigo ainda é melhor que nada
+            return entry["body"] if entry else None
+
+        if r.status_code == 304 and entry:
+            self._count("revalidated")
+            entry["stored_at"] = time.time()
+            self.cache.set(key, entry)
+            return entry["body"]
+
+        self._count("network")
         if r.status_code != 200:
             return None
 
-        data = r.json() or {}
+        try:
+            body = r.json()
+        except ValueError:
+            return None
+
+        if self.cache:
+            self.cache.set(key, {
+                "stored_at": time.time(),
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "body": body,
+            })
+        return body
+
+    # ---- endpoints ----
+    def summary(self, title: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Dados básicos via REST summary:
+        - title
+        - extract (summary)
+        - thumbnail.source (image_url)
+        - content_urls.desktop.page (url)
+        """
+        if not title:
+            return None
+        data = self.get_json(f"{WIKI_SUMMARY_PT}{quote(_clean_title(title), safe='')}", timeout=timeout)
+        if not isinstance(data, dict):
+            return None
         return {
             "title": data.get("title"),
             "summary": data.get("extract"),
             "image_url": (data.get("thumbnail") or {}).get("source"),
             "page_url": ((data.get("content_urls") or {}).get("desktop") or {}).get("page"),
         }
-    except requests.RequestException:
-        return None
+
+    def opensearch(self, query: str) -> Optional[str]:
+        """Melhor título sugerido para uma busca (ou None)."""
+        if not query:
+            return None
+        data = self.get_json(WIKI_API_PT, {
+            "action": "opensearch",
+            "format": "json",
+            "search": query,
+            "limit": 1,
+            "namespace": 0,
+            "redirects": "resolve",
+        })
+        # formato: [search, [titles], [descriptions], [urls]]
+        titles = data[1] if isinstance(data, list) and len(data) > 1 else []
+        return normalize_title(titles[0]) if titles else None
+
+    def existing_titles(self, titles: Iterable[str]) -> set[str]:
+        """Dos `titles` informados, quais existem (em lotes de 50 por chamada)."""
+        titles = sorted({normalize_title(t) for t in titles if t})
+        existing = set()
+
+        for start in range(0, len(titles), TITLES_PER_QUERY):
+            batch = titles[start:start + TITLES_PER_QUERY]
+            data = self.get_json(WIKI_API_PT, {
+                "action": "query",
+                "format": "json",
+                "titles": "|".join(batch),
+                "redirects": 1,
+            })
+            query = (data or {}).get("query") or {}
+
+            # título enviado -> título final (normalização + redirects)
+            final = {t: t for t in batch}
+            for step in ("normalized", "redirects"):
+                mapping = {m["from"]: m["to"] for m in query.get(step) or []}
+                final = {t: mapping.get(f, f) for t, f in final.items()}
+
+            present = {
+                page.get("title")
+                for page in (query.get("pages") or {}).values()
+                if page.get("missing") is None and page.get("invalid") is None
+            }
+            existing.update(t for t, f in final.items() if f in present)
+
+        return existing
+
+
+def map_concurrent(fn, items, workers: int = MAX_WORKERS):
+    """
+    Aplica fn em paralelo (no máximo `workers` ao mesmo tempo) e devolve
+    (item, resultado, erro) na ordem em que terminam.
+    """
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as exc:
+                yield item, None, exc
+
+
+class Checkpoint:
+    """
+    Arquivo com as chaves já processadas, para retomar uma rodada longa
+    (--resume) sem refazer o que já foi feito.
+    """
+
+    def __init__(self, path, resume: bool = True):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.done = set()
+        if resume:
+            try:
+                self.done = set(json.loads(self.path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                self.done = set()
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self.done
+
+    def mark(self, key) -> None:
+        with self._lock:
+            self.done.add(str(key))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(sorted(self.done)), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        self.done = set()
+        self.path.unlink(missing_ok=True)
+
+
+def checkpoint_path(name: str) -> Path:
+    """Checkpoint padrão de um comando: ao lado do cache (ou no diretório atual)."""
+    base = Path(CACHE_DIR).parent if CACHE_DIR else Path(".")
+    return base / f"{name}.checkpoint.json"
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> WikipediaClient:
+    """Cliente compartilhado pelo processo (uma sessão/pool só)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WikipediaClient()
+        return _client
+
+
+def fetch_wikipedia_summary_pt(title: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Busca dados básicos da Wikipedia PT via REST summary:
+    - title
+    - extract (summary)
+    - thumbnail.source (image_url)
+    - content_urls.desktop.page (url)
+    """
+    return get_client().summary(title, timeout=timeout)
 
 
 def try_extract_scientific_name_from_summary(summary: str) -> Optional[str]:
@@ -0,0 +1,70 @@
+# catches/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Catch, Species, SpeciesPhoto
+from .services.records import refresh_species_records, season_for, species_seasons
+
+
+# -------------------------
+# RECORDES POR ESPÉCIE
+# -------------------------
+@receiver(pre_save, sender=Catch, dispatch_uid="catches_records_catch_pre_save")
+def catch_pre_save(sender, instance, **kwargs):
+    # espécie/data antigas: a captura pode ter mudado de espécie ou temporada
+    instance._previous_record_scope = None
+    if instance.pk:
+        instance._previous_record_scope = (
+            Catch.objects.filter(pk=instance.pk).values_list("species_id", "caught_at").first()
+        )
+
+
+@receiver(post_save, sender=Catch, dispatch_uid="catches_records_catch_saved")
+def catch_saved(sender, instance, **kwargs):
+    seasons = {season_for(instance.caught_at)}
+
+    previous = getattr(instance, "_previous_record_scope", None)
+    if previous:
+        old_species_id, old_caught_at = previous
+        if old_species_id != instance.species_id:
+            refresh_species_records(old_species_id, seasons=[season_for(old_caught_at)])
+        else:
+            seasons.add(season_for(old_caught_at))
+
+    refresh_species_records(instance.species_id, seasons=seasons)
+
+
+@receiver(post_delete, sender=Catch, dispatch_uid="catches_records_catch_deleted")
+def catch_deleted(sender, instance, **kwargs):
+    species_id = instance.species_id
+    season = season_for(instance.caught_at)
+    transaction.on_commit(lambda: refresh_species_records(species_id, seasons=[season]))
+
+
+@receiver(pre_save, sender=Species, dispatch_uid="catches_records_species_pre_save")
+def species_pre_save(sender, instance, **kwargs):
+    instance._points_rule = None
+    if instance.pk:
+        instance._points_rule = (
+            Species.objects.filter(pk=instance.pk).values_list("min_length_cm", "points_per_cm").first()
+        )
+
+
+@receiver(post_save, sender=Species, dispatch_uid="catches_records_species_saved")
+def species_saved(sender, instance, created, **kwargs):
+    # regra mudou: só o recorde de pontos depende dela
+    previous = getattr(instance, "_points_rule", None)
+    if previous and previous != (instance.min_length_cm, instance.points_per_cm):
+        refresh_species_records(instance.pk, seasons=species_seasons(instance.pk), kinds=["points"])
+
+
+# -------------------------
+# CAPA DA ESPÉCIE (Species.cover_url)
+# -------------------------
+@receiver(post_save, sender=SpeciesPhoto, dispatch_uid="catches_cover_photo_saved")
+@receiver(post_delete, sender=SpeciesPhoto, dispatch_uid="catches_cover_photo_deleted")
+def species_photo_changed(sender, instance, **kwargs):
+    species = Species.objects.filter(pk=instance.species_id).first()
+    if species is not None:
+        species.refresh_cover_url()
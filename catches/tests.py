@@ -1,3 +1,183 @@
-from django.test import TestCase
+import random
+from array import array
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catches.management.commands.seed_species_rules import RULES
+from catches.models import Catch, Species, SpeciesBaitIdea
+from catches.services.scoring import (
+    ScoringTable,
+    SpeciesRule,
+    score_catches,
+    to_centi,
+    units_to_decimal,
+    units_to_int,
+)
+from core.services.ranking import build_ranking, build_ranking_python, calc_catch_points, member_scores
+from members.models import Member
+
+
+def reference_points(length_cm, min_length_cm, points_per_cm) -> Decimal:
+    """Regra antiga (Decimal), usada só para conferir paridade."""
+    if length_cm is None:
+        return Decimal("0")
+    if Decimal(length_cm) < Decimal(min_length_cm or 0):
+        return Decimal("0")
+    return Decimal(length_cm) * Decimal(points_per_cm or 0)
+
+
+def random_cm(rnd) -> Decimal:
+    return Decimal(rnd.randint(0, 999999)) / 100
+
+
+class ScoringParityTests(SimpleTestCase):
+    def setUp(self):
+        self.rnd = random.Random(20260117)
+        self.species = [
+            Species(pk=i, name=name, min_length_cm=Decimal(mn), points_per_cm=Decimal(ppc), category=cat)
+            for i, (name, mn, ppc, cat) in enumerate(RULES, start=1)
+        ]
+        # regras "quebradas" também precisam bater
+        self.species += [
+            Species(pk=100, name="ZERO", min_length_cm=Decimal("0"), points_per_cm=Decimal("0")),
+            Species(pk=101, name="FRAC", min_length_cm=Decimal("12.35"), points_per_cm=Decimal("0.15")),
+        ]
+
+    def test_single_rule_matches_decimal(self):
+        for s in self.species:
+            rule = SpeciesRule.from_species(s)
+            lengths = [random_cm(self.rnd) for _ in range(300)]
+            lengths += [s.min_length_cm, s.min_length_cm - Decimal("0.01"), Decimal("0"), None]
+            for length in lengths:
+                expected = reference_points(length, s.min_length_cm, s.points_per_cm)
+                got = rule.score(length)
+                self.assertEqual(units_to_decimal(got), expected)
+                self.assertEqual(units_to_int(got), int(expected))
+
+    def test_batch_matches_decimal(self):
+        table = ScoringTable.from_species(self.species)
+        by_id = {s.pk: s for s in self.species}
+        species_ids = array("q", (self.rnd.choice(list(by_id)) for _ in range(5000)))
+        lengths = [random_cm(self.rnd) for _ in species_ids]
+
+        units = table.score_batch(array("q", map(to_centi, lengths)), species_ids)
+
+        for length, species_id, u in zip(lengths, species_ids, units):
+            s = by_id[species_id]
+            self.assertEqual(units_to_decimal(u), reference_points(length, s.min_length_cm, s.points_per_cm))
+
+    def test_unknown_species_scores_zero(self):
+        table = ScoringTable.from_species(self.species[:1])
+        self.assertEqual(list(table.score_batch(array("q", [10000]), array("q", [999]))), [0])
+
+    def test_category_compiled(self):
+        table = ScoringTable.from_species(self.species)
+        for s in self.species[: len(RULES)]:
+            self.assertEqual(table.category(s.pk), s.category)
+
+    def test_catch_call_sites_match_decimal(self):
+        catches = []
+        for _ in range(500):
+            s = self.rnd.choice(self.species)
+            catches.append(Catch(species=s, length_cm=random_cm(self.rnd)))
+
+        batch = score_catches(catches)
+        for c, u in zip(catches, batch):
+            expected = reference_points(c.length_cm, c.species.min_length_cm, c.species.points_per_cm)
+            self.assertEqual(units_to_decimal(u), expected)
+            self.assertEqual(calc_catch_points(c), expected)
+            self.assertEqual(c.calc_points(), int(expected))
+            self.assertEqual(c.points_int, int(expected))
+
+            c.points_units = u  # caminho do admin (pontuação em lote)
+            self.assertEqual(c.calc_points(), int(expected))
+
+
+class RankingParityTests(TestCase):
+    def test_db_ranking_matches_python(self):
+        rnd = random.Random(7)
+        species = [
+            Species.objects.create(name=name, min_length_cm=mn, points_per_cm=ppc, category=cat)
+            for name, mn, ppc, cat in RULES
+        ]
+        names = ["Ana", "ana", "Álvaro", "Bruno", "zé", "Zé", "Carla"]
+        members = [
+            Member.objects.create(user=User.objects.create(username=f"u{i}"), name=rnd.choice(names))
+            for i in range(25)
+        ]
+        for _ in range(200):
+            Catch.objects.create(
+                member=rnd.choice(members),
+                species=rnd.choice(species),
+                length_cm=Decimal(rnd.randint(1000, 9000)) / 100,
+                weight_kg=Decimal("1.00"),
+                location="Teste",
+                caught_at=timezone.now(),
+            )
+
+        for top_n in (1, 3, 10, None):
+            expected = [(r["member"].pk, r["points"], r["pos"]) for r in build_ranking_python(top_n)]
+            got = [(r["member"].pk, r["points"], r["pos"]) for r in build_ranking(top_n)]
+            self.assertEqual(got, expected)
+
+    def test_cut_returns_exactly_top_n_on_ties(self):
+        species = Species.objects.create(name="Robalo", min_length_cm=Decimal("30"), points_per_cm=Decimal("1"))
+        names = ["Zé", "álvaro", "Álvaro", "bruno", "Ana", "ana", "Édson", "eduardo", "Carla", "zeca"]
+        for i, name in enumerate(names * 2):
+            member = Member.objects.create(user=User.objects.create(username=f"u{i}"), name=name)
+            if i < 3:
+                Catch.objects.create(
+                    member=member,
+                    species=species,
+                    length_cm=Decimal("40.00"),
+                    weight_kg=Decimal("1.00"),
+                    location="Teste",
+                    caught_at=timezone.now(),
+                )
+
+        # 17 membros empatados em zero: o corte não pode trazer todos
+        for top_n in (1, 3, 5, 10):
+            self.assertEqual(len(member_scores(top_n)), top_n)
+            expected = [(r["member"].pk, r["points"], r["pos"]) for r in build_ranking_python(top_n)]
+            got = [(r["member"].pk, r["points"], r["pos"]) for r in build_ranking(top_n)]
+            self.assertEqual(got, expected)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class SpeciesCardQueryTests(TestCase):
+    # count + espécies + iscas (fatiado) + recordes
+    LIST_QUERIES = 4
+
+    def make_species(self, count):
+        for i in range(count):
+            s = Species.objects.create(name=f"Espécie {len(Species.objects.all()):03d}", image_url="https://example.com/x.jpg")
+            SpeciesBaitIdea.objects.bulk_create(
+                [SpeciesBaitIdea(species=s, bait_name=f"Isca {j}") for j in range(5)]
+            )
+
+    def render_list(self):
+        response = self.client.get(reverse("competition_species_list"))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_cards_load_at_most_three_bait_ideas(self):
+        self.make_species(2)
+        for s in Species.objects.cards():
+            self.assertEqual([b.bait_name for b in s.card_bait_ideas], ["Isca 0", "Isca 1", "Isca 2"])
+            self.assertEqual(s.catches_count, 0)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        self.make_species(2)
+        self.render_list()  # aquece as versões de dados no cache
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.render_list()
+
+        self.make_species(30)
+        self.render_list()
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.render_list()
+        self.assertEqual(len(response.context["species_list"]), 24)
@@ -1,16 +1,24 @@
 # catches/views.py
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.generic import DetailView, CreateView, ListView
 from django.shortcuts import redirect
-from django.db.models import Count
-from .models import Catch, Species
+from django.db.models import Count, Prefetch
+from .models import Catch, Species, SpeciesRecord
 from .forms import CatchCreateForm
+from core.services.conditional import CATCHES_SCOPE, MEMBERS_SCOPE, SPECIES_SCOPE, versioned_view
+from core.services.uploads import MAX_BYTES, CappedUploadHandler, human_size, request_too_large
 
 # opcional
-from .services.wikipedia import fetch_wikipedia_summary_pt, try_extract_scientific_name_from_summary
+from .services.records import records_for_species
+from .services.enrichment import enqueue_enrichment, needs_enrichment
 
 
+# o CSRF é checado em _protected_dispatch: o middleware leria o corpo
+# (request.POST) antes de trocarmos o upload handler
+@method_decorator(csrf_exempt, name="dispatch")
 class CatchCreateView(LoginRequiredMixin, CreateView):
     model = Catch
     form_class = CatchCreateForm
@@ -18,15 +26,47 @@ class CatchCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy("my_profile")
 
     def dispatch(self, request, *args, **kwargs):
+        # recusa pelo Content-Length, antes de ler qualquer byte do upload
+        if request.method == "POST" and request.user.is_authenticated and request_too_large(request):
+            return self._upload_rejected(f"Foto maior que {human_size(MAX_BYTES)}.")
+
+        # foto vai direto para disco, com limite de tamanho (core.services.uploads)
+        request.upload_handlers = [CappedUploadHandler(request, MAX_BYTES)]
+        return self._protected_dispatch(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def _protected_dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated and not hasattr(request.user, "member"):
             return redirect("my_profile")
         return super().dispatch(request, *args, **kwargs)
 
+    def post(self, request, *args, **kwargs):
+        # o handler cortou o upload no meio (sem Content-Length confiável)
+        if request.FILES is not None and getattr(request, "upload_rejected", None):
+            return self._upload_rejected(request.upload_rejected)
+        return super().post(request, *args, **kwargs)
+
     def form_valid(self, form):
         form.instance.member = self.request.user.member
         return super().form_valid(form)
 
+    def _upload_rejected(self, message):
+        self.object = None
+        response = self.render_to_response(self.get_context_data(form=self.form_class(), upload_error=message))
+        response.status_code = 413
+        return response
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["photo_max_bytes"] = MAX_BYTES
+        return ctx
+
+
+def _species_updated_at(request, slug):
+    return Species.objects.filter(slug=slug).values_list("updated_at", flat=True).first()
+
+
+@versioned_view(SPECIES_SCOPE, CATCHES_SCOPE, MEMBERS_SCOPE, object_version=_species_updated_at)
 class SpeciesDetailView(DetailView):
     model = Species
     template_name = "catches/species_detail.html"
@@ -44,24 +84,10 @@ class SpeciesDetailView(DetailView):
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
 
-        # ✅ OPCIONAL: auto-enrich se estiver vazio
-        if obj.wikipedia_title and (not obj.summary or not obj.image_url):
-            data = fetch_wikipedia_summary_pt(obj.wikipedia_title)
-            if data:
-                changed = False
-                if (not obj.summary) and data.get("summary"):
-                    obj.summary = data["summary"]
-                    changed = True
-                if (not obj.image_url) and data.get("image_url"):
-                    obj.image_url = data["image_url"]
-                    changed = True
-                if not obj.scientific_name and obj.summary:
-                    sci = try_extract_scientific_name_from_summary(obj.summary)
-                    if sci:
-                        obj.scientific_name = sci
-                        changed = True
-                if changed:
-                    obj.save()
+        # resumo/imagem vazios: enfileira o enriquecimento (enrichment_worker)
+        # e a página sai na hora com o que já tem
+        if needs_enrichment(obj):
+            enqueue_enrichment(obj)
 
         return obj
 
@@ -74,6 +100,7 @@ class SpeciesDetailView(DetailView):
             .order_by("-caught_at")[:12]
         )
         ctx["recent_catches"] = recent
+        ctx["records"] = records_for_species(s)
         return ctx
 
 
@@ -97,8 +124,16 @@ class CompetitionSpeciesListView(ListView):
         qs = (
             Species.objects
             .filter(is_competition_allowed=True)
-            .annotate(catches_count=Count("catches"))
-            .prefetch_related("photos")
+            .cards()
+            .prefetch_related(
+                Prefetch(
+                    "records",
+                    queryset=SpeciesRecord.objects.filter(
+                        season=SpeciesRecord.ALL_TIME, kind=SpeciesRecord.LENGTH
+                    ).select_related("member"),
+                    to_attr="length_records",
+                ),
+            )
             .order_by("name")
         )
         if q:
@@ -5,6 +5,7 @@ Generated by 'django-admin startproject' using Django 5.2.10.
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
@@ -112,6 +113,53 @@ else:
         }
     }
 
+# ----------------------------------------------------
+# CACHE
+# ----------------------------------------------------
+# Compartilhado entre os workers do gunicorn (o ranking usa versões de
+# dados no cache, então LocMem por processo serviria dado antigo).
+# A tabela é criada com: python manage.py createcachetable
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "nabos_cache"),
+    }
+}
+
+# segundos que o ranking/pódio fica no cache (a versão de dados invalida antes)
+RANKING_CACHE_TIMEOUT = int(os.getenv("RANKING_CACHE_TIMEOUT", "300"))
+# contadores de hit/miss do ranking (manage.py ranking_cache_stats): escrevem no cache a cada request
+RANKING_CACHE_STATS = os.getenv("RANKING_CACHE_STATS", "1" if DEBUG else "0") == "1"
+
+# checkpoint do ledger só cobre eventos com mais de N segundos (transações ainda abertas)
+LEDGER_CHECKPOINT_MARGIN_SECONDS = int(os.getenv("LEDGER_CHECKPOINT_MARGIN_SECONDS", "300"))
+
+# fragmentos da home (a chave já muda a cada escrita, o timeout só limpa lixo)
+HOME_FRAGMENT_CACHE_TIMEOUT = int(os.getenv("HOME_FRAGMENT_CACHE_TIMEOUT", "3600"))
+
+# entra no ETag das páginas: deploy novo (templates novos) invalida os 304
+ETAG_SALT = os.getenv("ETAG_SALT", os.getenv("RENDER_GIT_COMMIT", ""))
+
+# ----------------------------------------------------
+# WIKIPEDIA (enriquecimento das espécies)
+# ----------------------------------------------------
+WIKIPEDIA_RATE_LIMIT = float(os.getenv("WIKIPEDIA_RATE_LIMIT", "10"))   # req/s
+WIKIPEDIA_MAX_WORKERS = int(os.getenv("WIKIPEDIA_MAX_WORKERS", "4"))
+WIKIPEDIA_CACHE_DIR = os.getenv("WIKIPEDIA_CACHE_DIR", str(Path(tempfile.gettempdir()) / "nabos" / "wikipedia"))
+WIKIPEDIA_CACHE_FRESH = int(os.getenv("WIKIPEDIA_CACHE_FRESH", str(24 * 3600)))  # segundos
+
+# ----------------------------------------------------
+# APIS EXTERNAS (transporte: live | record | replay | server)
+# ----------------------------------------------------
+HTTP_TRANSPORT_MODE = os.getenv("HTTP_TRANSPORT_MODE", "live")
+HTTP_FIXTURES_DIR = os.getenv("HTTP_FIXTURES_DIR", str(BASE_DIR / "fixtures" / "http"))
+HTTP_REPLAY_LATENCY_MS = os.getenv("HTTP_REPLAY_LATENCY_MS", "0")          # "120" ou "50-200"
+HTTP_REPLAY_ERROR_RATE = float(os.getenv("HTTP_REPLAY_ERROR_RATE", "0"))   # 0.05 = 5%
+HTTP_REPLAY_ERRORS = os.getenv("HTTP_REPLAY_ERRORS", "503,429,timeout").split(",")
+# mudam a cada rodada (janela do dia do Stormglass): fora da chave da fixture
+HTTP_REPLAY_IGNORE_PARAMS = os.getenv("HTTP_REPLAY_IGNORE_PARAMS", "start,end").split(",")
+HTTP_FIXTURE_SERVER_URL = os.getenv("HTTP_FIXTURE_SERVER_URL", "http://127.0.0.1:8765")
+
 # ----------------------------------------------------
 # PASSWORD VALIDATION
 # ----------------------------------------------------
@@ -144,6 +192,34 @@ MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
 # Permite servir media via Django quando necessário (ex: ambiente sem proxy)
 SERVE_MEDIA = os.getenv("SERVE_MEDIA", "0") == "1"
 
+# thumbnails/WebP dos uploads (core.services.images): 0 = gera na hora, no próprio request
+IMAGE_DERIVATIVES_ASYNC = os.getenv("IMAGE_DERIVATIVES_ASYNC", "1") == "1"
+IMAGE_DERIVATIVES_WORKERS = int(os.getenv("IMAGE_DERIVATIVES_WORKERS", "2"))
+
+# fotos enviadas (core.services.uploads): acima disso o upload é recusado / reduzido
+UPLOAD_PHOTO_MAX_BYTES = int(os.getenv("UPLOAD_PHOTO_MAX_BYTES", str(15 * 1024 * 1024)))
+UPLOAD_PHOTO_MAX_SIDE = int(os.getenv("UPLOAD_PHOTO_MAX_SIDE", "2560"))
+
+# Stormglass (weather.services.quota / refresh_scheduler): cota por dia (UTC),
+# intervalo mínimo entre atualizações do mesmo spot e chamadas simultâneas
+STORMGLASS_DAILY_QUOTA = int(os.getenv("STORMGLASS_DAILY_QUOTA", "10"))
+STORMGLASS_MIN_REFRESH_HOURS = float(os.getenv("STORMGLASS_MIN_REFRESH_HOURS", "3"))
+STORMGLASS_WORKERS = int(os.getenv("STORMGLASS_WORKERS", "4"))
+# spots na mesma célula da grade (graus) dividem uma chamada (weather.services.forecast_cells)
+STORMGLASS_CELL_DEGREES = float(os.getenv("STORMGLASS_CELL_DEGREES", "0.02"))
+# dias buscados por chamada; previsão gravada acabando antes disso (horas) passa na frente
+STORMGLASS_HORIZON_DAYS = int(os.getenv("STORMGLASS_HORIZON_DAYS", "5"))
+STORMGLASS_NEAR_TERM_HOURS = int(os.getenv("STORMGLASS_NEAR_TERM_HOURS", "24"))
+# visitas da página do spot ficam em memória e vão para Spot.view_count a cada N segundos
+SPOT_VIEWS_FLUSH_SECONDS = int(os.getenv("SPOT_VIEWS_FLUSH_SECONDS", "60"))
+
+# horas passadas do ForecastHour (weather.services.retention / prune_forecasts):
+# horárias por FORECAST_HOURLY_DAYS, depois 1 a cada FORECAST_COMPACT_STEP_HOURS,
+# apagadas depois de FORECAST_RETENTION_DAYS
+FORECAST_HOURLY_DAYS = int(os.getenv("FORECAST_HOURLY_DAYS", "2"))
+FORECAST_COMPACT_STEP_HOURS = int(os.getenv("FORECAST_COMPACT_STEP_HOURS", "3"))
+FORECAST_RETENTION_DAYS = int(os.getenv("FORECAST_RETENTION_DAYS", "30"))
+
 # ----------------------------------------------------
 # DEFAULT PRIMARY KEY
 # ----------------------------------------------------
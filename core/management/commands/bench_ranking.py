@@ -0,0 +1,243 @@
+# core/management/commands/bench_ranking.py
+"""
+Benchmark do ranking com dados sintéticos.
+
+Roda num banco de teste descartável (nunca toca no banco real):
+para cada tamanho (membros x capturas) gera o dataset com as regras
+oficiais do seed_species_rules, mede tempo, pico de memória e nº de
+queries de cada etapa e grava tudo em JSON para comparar entre commits.
+
+Ex:
+  python manage.py bench_ranking --sizes 1000x10000 100000x5000000 --output bench.json
+"""
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from catches.management.commands.seed_species_rules import RULES
+from catches.models import Catch, Species, SpeciesRecord
+from core.models import MemberScore, ScoreCheckpoint, ScoreEvent
+from core.services.counters import reconcile_counters
+from core.services.leaderboard import rebuild_leaderboard, top_ranking
+from core.services.ranking import build_ranking, build_ranking_python
+from core.services.ranking_cache import cached_top_ranking
+from members.models import Member
+
+BATCH = 5000
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    try:
+        members, catches = (int(p) for p in value.lower().split("x", 1))
+    except ValueError:
+        raise CommandError(f"Tamanho inválido '{value}' (use MEMBROSxCAPTURAS, ex: 1000x10000)")
+    return members, catches
+
+
+# -------------------------
+# DATASET
+# -------------------------
+def wipe() -> None:
+    """Limpa o dataset anterior com DELETE direto (sem signals por linha)."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model in (ScoreEvent, ScoreCheckpoint, MemberScore, SpeciesRecord, Catch, Member, User):
+            cursor.execute(f"DELETE FROM {qn(model._meta.db_table)}")
+
+
+def generate_dataset(n_members: int, n_catches: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    wipe()
+
+    species = []
+    for name, min_cm, ppc, cat in RULES:
+        obj, _ = Species.objects.update_or_create(
+            name=name,
+            defaults={"min_length_cm": min_cm, "points_per_cm": ppc, "category": cat},
+        )
+        species.append(obj)
+
+    # bulk_create não dispara signals: o placar é reconstruído depois
+    first_names = ["Ana", "Bruno", "Carla", "Diego", "Érica", "Fábio", "Gabi", "Hugo", "Íris", "João"]
+    for start in range(0, n_members, BATCH):
+        size = min(BATCH, n_members - start)
+        users = User.objects.bulk_create(
+            [User(username=f"bench-{start + i}") for i in range(size)]
+        )
+        Member.objects.bulk_create(
+            [
+                Member(user=u, name=f"{rnd.choice(first_names)} {start + i:07d}")
+                for i, u in enumerate(users)
+            ]
+        )
+
+    member_ids = list(Member.objects.values_list("id", flat=True))
+    now = timezone.now()
+    for start in range(0, n_catches, BATCH):
+        size = min(BATCH, n_catches - start)
+        rows = []
+        for _ in range(size):
+            sp = rnd.choice(species)
+            # ~70% acima do mínimo, como num torneio de verdade
+            length = Decimal(sp.min_length_cm) * Decimal(rnd.uniform(0.6, 1.8))
+            rows.append(Catch(
+                member_id=rnd.choice(member_ids),
+                species=sp,
+                length_cm=length.quantize(Decimal("0.01")),
+                weight_kg=Decimal(rnd.randint(10, 900)) / 100,
+                location="Benchmark",
+                caught_at=now - timedelta(minutes=rnd.randint(0, 60 * 24 * 90)),
+            ))
+        Catch.objects.bulk_create(rows)
+
+    reconcile_counters()
+
+
+# -------------------------
+# MEDIÇÃO
+# -------------------------
+def measure(fn, repeat: int, with_memory: bool = True) -> dict:
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        gc.collect()
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        queries = len(ctx.captured_queries)
+
+    result = {
+        "wall_ms_median": round(statistics.median(timings) * 1000, 3),
+        "wall_ms_min": round(min(timings) * 1000, 3),
+        "queries": queries,
+    }
+
+    if with_memory:
+        # rodada separada: tracemalloc distorce o tempo
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_kib"] = round(peak / 1024, 1)
+
+    return result
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+class Command(BaseCommand):
+    help = "Benchmark do ranking (build_ranking, placar, cache e views) com dados sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", default=["100x1000", "1000x10000"],
+            help="Tamanhos MEMBROSxCAPTURAS (ex: 1000x10000 100000x5000000).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Repetições por medição (usa a mediana).")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do gerador (dataset reproduzível).")
+        parser.add_argument("--top", type=int, default=10, help="top_n usado nas medições.")
+        parser.add_argument(
+            "--python-limit", type=int, default=200_000,
+            help="Só mede build_ranking_python (tudo em memória) até esse nº de capturas.",
+        )
+        parser.add_argument("--output", default="", help="Arquivo JSON de saída (padrão: só imprime).")
+
+    def handle(self, *args, **opts):
+        sizes = [parse_size(s) for s in opts["sizes"]]
+        repeat = max(1, opts["repeat"])
+        top_n = opts["top"]
+
+        report = {
+            "commit": git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": repeat,
+            "seed": opts["seed"],
+            "results": [],
+        }
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+        try:
+            for n_members, n_catches in sizes:
+                self.stdout.write(f"== {n_members} membros x {n_catches} capturas")
+                report["results"].append(self._run_size(n_members, n_catches, opts["seed"], repeat, top_n, opts))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        payload = json.dumps(report, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Resultado salvo em {opts['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    def _run_size(self, n_members, n_catches, seed, repeat, top_n, opts) -> dict:
+        t0 = time.perf_counter()
+        generate_dataset(n_members, n_catches, seed)
+        gen_s = time.perf_counter() - t0
+
+        client = Client()
+
+        def get(url):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"{url} respondeu {response.status_code}")
+
+        steps = {
+            "rebuild_leaderboard": (lambda: rebuild_leaderboard(), 1),
+            "build_ranking": (lambda: build_ranking(top_n=top_n), repeat),
+            "top_ranking": (lambda: top_ranking(top_n=top_n), repeat),
+            "cached_top_ranking_cold": (lambda: (cache.clear(), cached_top_ranking(top_n=top_n)), repeat),
+            "cached_top_ranking_warm": (lambda: cached_top_ranking(top_n=top_n), repeat),
+            "view_home": (lambda: get("/"), repeat),
+            "view_ranking": (lambda: get("/ranking/"), repeat),
+        }
+        if n_catches <= opts["python_limit"]:
+            steps["build_ranking_python"] = (lambda: build_ranking_python(top_n=top_n), repeat)
+
+        result = {
+            "members": n_members,
+            "catches": n_catches,
+            "generate_s": round(gen_s, 2),
+            "steps": {},
+        }
+        for name, (fn, times) in steps.items():
+            result["steps"][name] = measure(fn, times)
+            self.stdout.write(f"  {name}: {result['steps'][name]}")
+        return result
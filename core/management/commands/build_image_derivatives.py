@@ -0,0 +1,65 @@
+# core/management/commands/build_image_derivatives.py
+"""
+Backfill dos derivados (thumbnails + WebP) das imagens já enviadas.
+Uploads novos são gerados sozinhos (core.signals); este comando cobre os
+arquivos antigos ou algo que falhou em segundo plano.
+
+Ex:
+  python manage.py build_image_derivatives
+  python manage.py build_image_derivatives --only catches.Catch.photo --force
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from catches.models import Species
+from core.services.conditional import CATCHES_SCOPE, MEMBERS_SCOPE, SPECIES_SCOPE
+from core.services.home_cache import FEED_SCOPE, SUPPORTERS_SCOPE
+from core.services.images import WIDTHS, generate_derivatives
+from core.services.ranking_cache import SCOPE as RANKING_SCOPE
+from core.services.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = "Gera thumbnails/WebP das imagens existentes (capturas, espécies, membros, apoiadores)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", action="append", default=[], help=f"Só estes campos ({', '.join(WIDTHS)}).")
+        parser.add_argument("--force", action="store_true", help="Refaz mesmo se já existem derivados.")
+        parser.add_argument("--workers", type=int, default=2, help="Imagens processadas em paralelo.")
+
+    def handle(self, *args, **opts):
+        keys = opts["only"] or list(WIDTHS)
+        unknown = set(keys) - set(WIDTHS)
+        if unknown:
+            raise CommandError(f"Campo desconhecido: {', '.join(sorted(unknown))}")
+
+        files = []
+        for key in keys:
+            label, field = key.rsplit(".", 1)
+            model = apps.get_model(label)
+            qs = model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""}).only("pk", field)
+            files += [getattr(obj, field) for obj in qs.iterator()]
+
+        generated = skipped = 0
+        with ThreadPoolExecutor(max_workers=max(opts["workers"], 1)) as pool:
+            for field_file, written in zip(files, pool.map(lambda f: generate_derivatives(f, force=opts["force"]), files)):
+                if written:
+                    generated += 1
+                    self.stdout.write(f"[OK] {field_file.name} ({written} arquivos)")
+                else:
+                    skipped += 1
+
+        if generated:
+            # capas das espécies passam a usar os derivados
+            for species in Species.objects.all():
+                species.refresh_cover_url()
+            # páginas em cache ainda apontam para os originais
+            bump_version(RANKING_SCOPE, FEED_SCOPE, SUPPORTERS_SCOPE, MEMBERS_SCOPE, CATCHES_SCOPE, SPECIES_SCOPE)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imagens: {len(files)} | Geradas: {generated} | Já prontas/ilegíveis: {skipped}"
+        ))
@@ -0,0 +1,106 @@
+# core/management/commands/http_fixture_server.py
+"""
+Servidor HTTP local que serve as fixtures gravadas (HTTP_TRANSPORT_MODE=record)
+no lugar da Wikipedia/Stormglass, com latência e erros injetados.
+
+Use com HTTP_TRANSPORT_MODE=server nos processos que vão ser testados:
+as URLs https://host/path?q viram http://127.0.0.1:8765/host/path?q.
+
+Ex:
+  python manage.py http_fixture_server --latency 50-200 --error-rate 0.05
+"""
+from __future__ import annotations
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.http_transport import FaultInjector, FixtureStore, TransportConfig, parse_latency
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    store: FixtureStore
+    faults: FaultInjector
+    quiet = False
+
+    def do_GET(self):
+        self.faults.delay()
+
+        error = self.faults.pick_error()
+        if error in ("timeout", "connection"):
+            # derruba a conexão sem responder: o cliente vê erro de rede/timeout
+            self.close_connection = True
+            return
+        if error:
+            self._reply(int(error), {"Retry-After": "1"}, "")
+            return
+
+        host, _, rest = self.path.lstrip("/").partition("/")
+        entry = self.store.load(self.command, f"https://{host}/{rest}")
+        if entry is None:
+            self._reply(404, {"Content-Type": "application/json"}, json.dumps({"detail": "sem fixture gravada"}))
+            return
+        self._reply(entry["status"], entry.get("headers") or {}, entry.get("body") or "")
+
+    def _reply(self, status: int, headers: dict, body: str):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class Command(BaseCommand):
+    help = "Serve as fixtures HTTP gravadas (Wikipedia/Stormglass) com latência e erros injetados."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--fixtures", default="", help="Diretório das fixtures (padrão: HTTP_FIXTURES_DIR).")
+        parser.add_argument("--latency", default=None, help="Latência em ms: '120' ou '50-200' (padrão: settings).")
+        parser.add_argument("--error-rate", type=float, default=None, help="Fração de respostas com erro (0.05 = 5%%).")
+        parser.add_argument("--errors", default=None, help="Erros sorteados, ex: 503,429,timeout.")
+        parser.add_argument("--seed", type=int, default=None, help="Semente do sorteio (rodadas reproduzíveis).")
+        parser.add_argument("--quiet", action="store_true", help="Não loga cada requisição.")
+
+    def handle(self, *args, **opts):
+        config = TransportConfig.from_settings()
+        if opts["fixtures"]:
+            config.fixtures_dir = Path(opts["fixtures"])
+        if opts["latency"] is not None:
+            config.latency = parse_latency(opts["latency"])
+        if opts["error_rate"] is not None:
+            config.error_rate = opts["error_rate"]
+        if opts["errors"]:
+            config.errors = tuple(opts["errors"].split(","))
+
+        if not config.fixtures_dir.is_dir():
+            raise CommandError(f"Sem fixtures em {config.fixtures_dir} (grave antes com HTTP_TRANSPORT_MODE=record).")
+
+        handler = type("Handler", (FixtureHandler,), {
+            "store": FixtureStore(config.fixtures_dir, config.ignore_params),
+            "faults": FaultInjector(config, seed=opts["seed"]),
+            "quiet": opts["quiet"],
+        })
+        server = ThreadingHTTPServer((opts["host"], opts["port"]), handler)
+        server.daemon_threads = True
+
+        low, high = config.latency
+        self.stdout.write(self.style.SUCCESS(
+            f"Servindo {config.fixtures_dir} em http://{opts['host']}:{opts['port']} "
+            f"(latência {low * 1000:.0f}-{high * 1000:.0f} ms, erros {config.error_rate:.0%})"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,29 @@
+# core/management/commands/ranking_cache_stats.py
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.services.ranking_cache import SCOPE, STATS_ENABLED, cache_stats, reset_cache_stats
+from core.services.versions import get_version
+
+
+class Command(BaseCommand):
+    help = "Mostra os contadores de hit/miss do cache do ranking (JSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zera os contadores depois de mostrar.")
+
+    def handle(self, *args, **opts):
+        if not STATS_ENABLED:
+            self.stderr.write("Contadores desligados (RANKING_CACHE_STATS=1 para ligar); valores abaixo podem ser antigos.")
+        stats = cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["data_version"] = get_version(SCOPE)
+
+        self.stdout.write(json.dumps(stats, indent=2))
+
+        if opts["reset"]:
+            reset_cache_stats()
@@ -0,0 +1,37 @@
+# core/management/commands/rebuild_leaderboard.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.leaderboard import rebuild_leaderboard, top_ranking
+from core.services.ranking import build_ranking_python
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o placar (core.MemberScore) do zero e confere com o build_ranking_python."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Só confere o placar atual com o build_ranking_python, sem reconstruir.",
+        )
+
+    def handle(self, *args, **opts):
+        if not opts["check"]:
+            total = rebuild_leaderboard()
+            self.stdout.write(f"Placar reconstruído: {total} membro(s).")
+
+        expected = [(row["member"].pk, row["points"]) for row in build_ranking_python(top_n=None)]
+        current = [(row["member"].pk, row["points"]) for row in top_ranking(top_n=None)]
+
+        if expected != current:
+            for pos, (exp, cur) in enumerate(zip(expected, current), start=1):
+                if exp != cur:
+                    self.stdout.write(self.style.ERROR(f"[DIFF] #{pos}: esperado {exp}, placar {cur}"))
+                    break
+            raise CommandError(
+                f"Placar diverge do build_ranking_python ({len(current)} linhas vs {len(expected)})."
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Placar confere com o build_ranking_python ({len(current)} linhas)."))
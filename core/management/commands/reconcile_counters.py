@@ -0,0 +1,23 @@
+# core/management/commands/reconcile_counters.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from core.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconta membros, capturas, espécies e apoiadores e corrige os contadores da home "
+        "(rodar periodicamente, ex: 1x por hora)."
+    )
+
+    def handle(self, *args, **opts):
+        drift = reconcile_counters()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Contadores em dia."))
+            return
+
+        for field, diff in drift.items():
+            self.stdout.write(f"{field}: desvio de {diff:+d} corrigido.")
+        self.stdout.write(self.style.SUCCESS("Contadores reconciliados."))
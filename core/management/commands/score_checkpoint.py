@@ -0,0 +1,23 @@
+# core/management/commands/score_checkpoint.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from core.services.ledger import create_checkpoint, seed_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        "Grava um checkpoint do ledger de pontuação (rodar periodicamente, ex: 1x por dia). "
+        "Antes, inclui no ledger as capturas que ainda não estão nele."
+    )
+
+    def handle(self, *args, **opts):
+        seeded = seed_ledger()
+        if seeded:
+            self.stdout.write(f"{seeded} captura(s) incluída(s) no ledger.")
+
+        cp = create_checkpoint()
+        self.stdout.write(self.style.SUCCESS(
+            f"Checkpoint {cp.taken_at:%d/%m/%Y %H:%M}: {len(cp.state)} captura(s) válidas até o evento #{cp.last_event_id}."
+        ))
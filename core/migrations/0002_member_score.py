@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('members', '0003_alter_member_options_member_gender_alter_member_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('best_points', models.DecimalField(decimal_places=4, default=0, max_digits=14, verbose_name='Melhor captura')),
+                ('second_points', models.DecimalField(decimal_places=4, default=0, max_digits=14, verbose_name='Segunda melhor')),
+                ('total_points', models.DecimalField(decimal_places=4, default=0, max_digits=14, verbose_name='Total')),
+                ('name_key', models.CharField(default='', max_length=120)),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score', to='members.member', verbose_name='Membro')),
+            ],
+            options={
+                'verbose_name': 'Pontuação do membro',
+                'verbose_name_plural': 'Pontuações dos membros',
+                'ordering': ['-total_points', 'name_key', 'member_id'],
+                'indexes': [models.Index(fields=['-total_points', 'name_key', 'member'], name='core_score_rank_idx')],
+            },
+        ),
+    ]
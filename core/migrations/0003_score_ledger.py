@@ -0,0 +1,48 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0007_species_is_competition_allowed'),
+        ('core', '0002_member_score'),
+        ('members', '0003_alter_member_options_member_gender_alter_member_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(db_index=True, verbose_name='Tirado em')),
+                ('last_event_id', models.BigIntegerField(verbose_name='Último evento')),
+                ('state', models.JSONField(default=dict)),
+            ],
+            options={
+                'verbose_name': 'Checkpoint do ranking',
+                'verbose_name_plural': 'Checkpoints do ranking',
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScoreEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Quando')),
+                ('kind', models.CharField(choices=[('added', 'Captura adicionada'), ('removed', 'Captura removida'), ('rescored', 'Pontuação recalculada')], max_length=10, verbose_name='Tipo')),
+                ('points', models.DecimalField(decimal_places=4, default=0, max_digits=14, verbose_name='Pontos')),
+                ('catch', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='catches.catch', verbose_name='Captura')),
+                ('member', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='members.member', verbose_name='Membro')),
+            ],
+            options={
+                'verbose_name': 'Evento de pontuação',
+                'verbose_name_plural': 'Eventos de pontuação',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['catch', '-id'], name='core_event_catch_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:30
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    counts = {
+        "members": apps.get_model("members", "Member").objects.count(),
+        "catches": apps.get_model("catches", "Catch").objects.count(),
+        "species": apps.get_model("catches", "Species").objects.count(),
+        "supporters": apps.get_model("supporters", "Supporter").objects.count(),
+    }
+    apps.get_model("core", "SiteCounters").objects.update_or_create(pk=1, defaults=counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catches', '0009_species_records'),
+        ('core', '0003_score_ledger'),
+        ('members', '0003_alter_member_options_member_gender_alter_member_bio_and_more'),
+        ('supporters', '0002_alter_supporter_options_supporter_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('members', models.PositiveIntegerField(default=0, verbose_name='Membros')),
+                ('catches', models.PositiveIntegerField(default=0, verbose_name='Capturas')),
+                ('species', models.PositiveIntegerField(default=0, verbose_name='Espécies')),
+                ('supporters', models.PositiveIntegerField(default=0, verbose_name='Apoiadores')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Contadores do site',
+                'verbose_name_plural': 'Contadores do site',
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
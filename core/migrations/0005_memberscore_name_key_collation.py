@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-17 21:10
+
+from django.db import migrations
+
+TABLE = "core_memberscore"
+
+
+def set_c_collation(apps, schema_editor):
+    # No PostgreSQL a collation do locale ordena "álvaro" antes de "bruno";
+    # o build_ranking_python usa a ordem dos code points de name.lower(), que
+    # põe depois. COLLATE "C" (bytes UTF-8) dá a mesma ordem do Python. O
+    # SQLite já compara em BINARY (mesma ordem): nada a fazer lá.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # ALTER ... TYPE reconstrói o índice core_score_rank_idx com a nova collation
+    schema_editor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN name_key TYPE varchar(120) COLLATE "C"')
+
+
+def unset_c_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN name_key TYPE varchar(120) COLLATE "default"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_site_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(set_c_collation, unset_c_collation),
+    ]
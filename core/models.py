@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class Member(models.Model):
     photo = models.ImageField(upload_to="members/photos/", blank=True, null=True)
@@ -14,3 +15,131 @@ class Member(models.Model):
 
     def __str__(self):
         return self.nickname or self.name
+
+
+class MemberScore(models.Model):
+    """
+    Placar materializado do ranking (1 linha = 1 membro).
+    Guarda as 2 melhores pontuações válidas e o total usado no ranking.
+    Mantido pelos signals em core/signals.py.
+    """
+    member = models.OneToOneField(
+        "members.Member",
+        on_delete=models.CASCADE,
+        related_name="score",
+        verbose_name="Membro",
+    )
+
+    best_points = models.DecimalField("Melhor captura", max_digits=14, decimal_places=4, default=0)
+    second_points = models.DecimalField("Segunda melhor", max_digits=14, decimal_places=4, default=0)
+    total_points = models.DecimalField("Total", max_digits=14, decimal_places=4, default=0)
+
+    # nome em minúsculas (desempate igual ao build_ranking). No PostgreSQL a
+    # coluna é COLLATE "C" (migração 0005): ordem dos code points, como no Python
+    name_key = models.CharField(max_length=120, default="")
+
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Pontuação do membro"
+        verbose_name_plural = "Pontuações dos membros"
+        ordering = ["-total_points", "name_key", "member_id"]
+        indexes = [
+            models.Index(
+                fields=["-total_points", "name_key", "member"],
+                name="core_score_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.member_id} • {self.total_points}"
+
+
+class ScoreEvent(models.Model):
+    """
+    Ledger append-only dos pontos de cada captura (nunca é editado).
+    Usado para reconstruir o ranking em qualquer instante do passado.
+    """
+    ADDED = "added"
+    REMOVED = "removed"
+    RESCORED = "rescored"
+    KIND_CHOICES = [
+        (ADDED, "Captura adicionada"),
+        (REMOVED, "Captura removida"),
+        (RESCORED, "Pontuação recalculada"),
+    ]
+
+    occurred_at = models.DateTimeField("Quando", default=timezone.now, db_index=True)
+    kind = models.CharField("Tipo", max_length=10, choices=KIND_CHOICES)
+
+    # sem constraint: o histórico continua válido depois que a captura/membro some
+    catch = models.ForeignKey(
+        "catches.Catch",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Captura",
+    )
+    member = models.ForeignKey(
+        "members.Member",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Membro",
+    )
+
+    # pontos válidos da captura DEPOIS do evento (0 em "removed")
+    points = models.DecimalField("Pontos", max_digits=14, decimal_places=4, default=0)
+
+    class Meta:
+        verbose_name = "Evento de pontuação"
+        verbose_name_plural = "Eventos de pontuação"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["catch", "-id"], name="core_event_catch_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.occurred_at:%d/%m %H:%M} • {self.kind} • {self.catch_id}"
+
+
+class ScoreCheckpoint(models.Model):
+    """
+    Foto do ledger: pontos de cada captura válida com os eventos até
+    taken_at (marca d'água de tempo); last_event_id é o maior id incluído.
+    state = {"<catch_id>": [member_id, "pontos"]}
+    """
+    taken_at = models.DateTimeField("Tirado em", db_index=True)
+    last_event_id = models.BigIntegerField("Último evento")
+    state = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = "Checkpoint do ranking"
+        verbose_name_plural = "Checkpoints do ranking"
+        ordering = ["-taken_at"]
+
+    def __str__(self):
+        return f"{self.taken_at:%d/%m/%Y %H:%M} • até #{self.last_event_id}"
+
+
+class SiteCounters(models.Model):
+    """
+    Contadores globais da home (linha única, pk=1).
+    Os signals somam/subtraem com F(); o comando reconcile_counters
+    corrige qualquer desvio recontando as tabelas.
+    """
+    SINGLETON_PK = 1
+
+    members = models.PositiveIntegerField("Membros", default=0)
+    catches = models.PositiveIntegerField("Capturas", default=0)
+    species = models.PositiveIntegerField("Espécies", default=0)
+    supporters = models.PositiveIntegerField("Apoiadores", default=0)
+
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Contadores do site"
+        verbose_name_plural = "Contadores do site"
+
+    def __str__(self):
+        return f"{self.members} membros • {self.catches} capturas"
@@ -0,0 +1,100 @@
+# core/services/conditional.py
+"""
+GET condicional (ETag / Last-Modified) das páginas públicas.
+
+Cada página declara de quais escopos de versão depende (ver
+core.services.versions). A versão da página é a maior delas (mais, se
+houver, um timestamp do próprio objeto, ex: Species.updated_at), então
+descobrir se o cliente já tem a página atual custa um get_many no cache,
+sem renderizar nada. Se o If-None-Match bate, o Django responde 304.
+
+O ETag também leva o usuário (a página muda com login/logout), se é
+fragmento do "Carregar mais" e o ETAG_SALT do deploy (template novo com
+os mesmos dados não pode dar 304). Logado, a página tem {% csrf_token %}
+(form de logout): o ETag leva um hash do segredo CSRF, que troca a cada
+login, e não há Last-Modified (If-Modified-Since daria 304 com o token velho).
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.services.pagination import wants_fragment
+from core.services.versions import get_versions
+
+# escopos de dados (além dos da home em core.services.home_cache)
+MEMBERS_SCOPE = "members"
+CATCHES_SCOPE = "catches"
+SPECIES_SCOPE = "species"
+WEATHER_SCOPE = "weather"
+
+ETAG_SALT = getattr(settings, "ETAG_SALT", "")
+
+
+def _to_ms(value) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value or 0)
+
+
+def versioned_page(*scopes, object_version=None):
+    """
+    Decorator de view: ETag/Last-Modified a partir das versões de `scopes`.
+
+    object_version(request, *args, **kwargs) -> datetime/ms do objeto da
+    página (None = objeto não existe: sem GET condicional, a view dá 404).
+    """
+    def _page_version(request, *args, **kwargs):
+        if not hasattr(request, "_page_version"):
+            version = max(get_versions(*scopes).values(), default=0)
+            if object_version is not None:
+                obj = object_version(request, *args, **kwargs)
+                version = None if obj is None else max(version, _to_ms(obj))
+            request._page_version = version
+        return request._page_version
+
+    def etag(request, *args, **kwargs):
+        version = _page_version(request, *args, **kwargs)
+        if version is None:
+            return None
+        parts = [str(version), f"u{request.user.pk or 0}"]
+        if request.user.is_authenticated:
+            secret = request.META.get("CSRF_COOKIE") or ""
+            parts.append("c" + hashlib.sha1(secret.encode()).hexdigest()[:8])
+        if wants_fragment(request):
+            parts.append("frag")
+        if ETAG_SALT:
+            parts.append(ETAG_SALT[:12])
+        return "-".join(parts)
+
+    def last_modified(request, *args, **kwargs):
+        version = _page_version(request, *args, **kwargs)
+        if version is None or request.user.is_authenticated:
+            return None
+        return datetime.fromtimestamp(version / 1000, tz=dt_timezone.utc)
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view_func)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # o navegador guarda, mas sempre revalida (senão usaria a heurística do Last-Modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ["X-Requested-With"])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def versioned_view(*scopes, **options):
+    """Mesmo que versioned_page, para class-based views (no dispatch)."""
+    return method_decorator(versioned_page(*scopes, **options), name="dispatch")
@@ -0,0 +1,71 @@
+# core/services/counters.py
+"""
+Contadores globais da home (core.SiteCounters).
+
+A home lê tudo com um único SELECT pela PK, em vez de 4 COUNT(*).
+Os signals ajustam os campos com F() (sem corrida entre requests) e
+reconcile_counters reconta as tabelas para corrigir desvios (ex:
+bulk_create/queryset.update, que não disparam signals).
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from catches.models import Catch, Species
+from core.models import SiteCounters
+from members.models import Member
+from supporters.models import Supporter
+
+COUNTED_MODELS = {
+    "members": Member,
+    "catches": Catch,
+    "species": Species,
+    "supporters": Supporter,
+}
+
+
+def _counters_qs():
+    return SiteCounters.objects.filter(pk=SiteCounters.SINGLETON_PK)
+
+
+def adjust_counter(field: str, delta: int) -> None:
+    """Soma `delta` em um contador (nunca abaixo de zero)."""
+    updated = _counters_qs().update(**{field: Greatest(F(field) + delta, 0)})
+    if not updated:
+        # linha ainda não existe: cria já com a contagem real
+        reconcile_counters()
+
+
+def get_counters() -> dict:
+    """Stats da home: {"members": .., "catches": .., "species": .., "supporters": ..}."""
+    row = _counters_qs().values(*COUNTED_MODELS).first()
+    if row is None:
+        reconcile_counters()
+        row = _counters_qs().values(*COUNTED_MODELS).first()
+    return row
+
+
+@transaction.atomic
+def reconcile_counters() -> dict:
+    """
+    Reconta as tabelas e grava os valores certos.
+    Retorna o desvio encontrado por campo ({} se estava tudo certo).
+    """
+    actual = {field: model.objects.count() for field, model in COUNTED_MODELS.items()}
+
+    row, created = SiteCounters.objects.select_for_update().get_or_create(
+        pk=SiteCounters.SINGLETON_PK, defaults=actual,
+    )
+    if created:
+        return {}
+
+    drift = {
+        field: getattr(row, field) - value
+        for field, value in actual.items()
+        if getattr(row, field) != value
+    }
+    if drift:
+        _counters_qs().update(**actual)
+    return drift
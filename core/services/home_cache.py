@@ -0,0 +1,35 @@
+# core/services/home_cache.py
+"""
+Cache por seção da home ({% cache %} em core/home.html).
+
+Cada fragmento (feed, stats, pódio, apoiadores) tem sua própria versão
+de dados na chave, então uma escrita só invalida o que mudou: uma
+captura nova troca feed/stats/pódio, mas a faixa de apoiadores continua
+vindo do cache.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+
+from core.services.ranking_cache import SCOPE as RANKING_SCOPE
+from core.services.versions import get_versions
+
+FEED_SCOPE = "home_feed"
+STATS_SCOPE = "home_stats"
+SUPPORTERS_SCOPE = "home_supporters"
+PODIUM_SCOPE = RANKING_SCOPE  # pódio = topo do ranking
+
+FRAGMENT_TIMEOUT = getattr(settings, "HOME_FRAGMENT_CACHE_TIMEOUT", 3600)
+
+SECTIONS = {
+    "feed": FEED_SCOPE,
+    "stats": STATS_SCOPE,
+    "podium": PODIUM_SCOPE,
+    "supporters": SUPPORTERS_SCOPE,
+}
+
+
+def home_versions() -> dict:
+    """Versão de cada seção: {"feed": .., "stats": .., "podium": .., "supporters": ..}."""
+    versions = get_versions(*SECTIONS.values())
+    return {section: versions[scope] for section, scope in SECTIONS.items()}
@@ -0,0 +1,248 @@
+# core/services/http_transport.py
+"""
+Transporte HTTP plugável para as APIs externas (Wikipedia, Stormglass).
+
+Os serviços montam a sessão com transport_adapter(); o modo vem de
+HTTP_TRANSPORT_MODE:
+
+- live:   rede de verdade (padrão);
+- record: rede de verdade + grava cada resposta em HTTP_FIXTURES_DIR;
+- replay: não abre socket: devolve as respostas gravadas, com latência
+          e erros injetados (HTTP_REPLAY_LATENCY_MS / HTTP_REPLAY_ERROR_RATE);
+- server: manda tudo para o servidor local de fixtures
+          (manage.py http_fixture_server), que faz o mesmo que o replay
+          mas por HTTP de verdade (pool, retries e timeouts entram no teste).
+
+Assim dá para medir o enriquecimento e a atualização de previsão numa
+máquina isolada.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+SERVER = "server"
+MODES = (LIVE, RECORD, REPLAY, SERVER)
+
+# headers da resposta que vale a pena guardar (o resto é ruído de CDN)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After", "Cache-Control")
+
+
+def parse_latency(value) -> tuple[float, float]:
+    """'120' -> (0.12, 0.12); '50-200' -> (0.05, 0.2) em segundos."""
+    value = str(value or "0").strip()
+    low, _, high = value.partition("-")
+    low_ms = float(low or 0)
+    high_ms = float(high) if high else low_ms
+    return low_ms / 1000, max(low_ms, high_ms) / 1000
+
+
+@dataclass
+class TransportConfig:
+    mode: str = LIVE
+    fixtures_dir: Path = Path("fixtures/http")
+    latency: tuple[float, float] = (0.0, 0.0)
+    error_rate: float = 0.0
+    errors: tuple[str, ...] = ("503", "429", "timeout")
+    ignore_params: frozenset = field(default_factory=frozenset)
+    server_url: str = "http://127.0.0.1:8765"
+
+    @classmethod
+    def from_settings(cls) -> "TransportConfig":
+        mode = getattr(settings, "HTTP_TRANSPORT_MODE", LIVE) or LIVE
+        if mode not in MODES:
+            raise ValueError(f"HTTP_TRANSPORT_MODE inválido: {mode!r} (use {', '.join(MODES)})")
+        return cls(
+            mode=mode,
+            fixtures_dir=Path(getattr(settings, "HTTP_FIXTURES_DIR", "fixtures/http")),
+            latency=parse_latency(getattr(settings, "HTTP_REPLAY_LATENCY_MS", "0")),
+            error_rate=float(getattr(settings, "HTTP_REPLAY_ERROR_RATE", 0.0)),
+            errors=tuple(getattr(settings, "HTTP_REPLAY_ERRORS", cls.errors)),
+            ignore_params=frozenset(getattr(settings, "HTTP_REPLAY_IGNORE_PARAMS", ())),
+            server_url=getattr(settings, "HTTP_FIXTURE_SERVER_URL", cls.server_url),
+        )
+
+
+# -------------------------
+# FIXTURES
+# -------------------------
+class FixtureStore:
+    """
+    Um JSON por requisição em <dir>/<host>/<sha1>.json. A chave é
+    método + host + path + query ordenada (sem os parâmetros ignorados,
+    ex: start/end do Stormglass, que mudam a cada rodada).
+    """
+
+    def __init__(self, directory, ignore_params=()):
+        self.directory = Path(directory)
+        self.ignore_params = frozenset(ignore_params)
+
+    def key(self, method: str, url: str) -> tuple[str, str]:
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in self.ignore_params)
+        raw = f"{method.upper()} {parts.netloc}{parts.path}?{urlencode(query)}"
+        return parts.netloc, hashlib.sha1(raw.encode()).hexdigest()
+
+    def path(self, method: str, url: str) -> Path:
+        host, digest = self.key(method, url)
+        return self.directory / host / f"{digest}.json"
+
+    def load(self, method: str, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self.path(method, url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, method: str, url: str, response: requests.Response) -> None:
+        path = self.path(method, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            "body": response.content.decode(response.encoding or "utf-8", errors="replace"),
+        }
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class FaultInjector:
+    """Latência e erros sorteados, iguais no replay e no servidor local."""
+
+    def __init__(self, config: TransportConfig, seed=None):
+        self.latency = config.latency
+        self.error_rate = config.error_rate
+        self.errors = config.errors or ("503",)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        low, high = self.latency
+        if high > 0:
+            with self._lock:
+                seconds = self._random.uniform(low, high)
+            time.sleep(seconds)
+
+    def pick_error(self) -> Optional[str]:
+        """None = responde normal; senão um de errors ('503', '429', 'timeout'...)."""
+        if self.error_rate <= 0:
+            return None
+        with self._lock:
+            if self._random.random() >= self.error_rate:
+                return None
+            return self._random.choice(self.errors)
+
+
+# -------------------------
+# ADAPTERS
+# -------------------------
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter normal que grava toda resposta recebida."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        self.store = store
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # não grava 304: o corpo não vem junto
+        if response.status_code != 304:
+            self.store.save(request.method, request.url, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve as fixtures gravadas, sem rede. Sem fixture = 404."""
+
+    def __init__(self, store: FixtureStore, faults: FaultInjector):
+        super().__init__()
+        self.store = store
+        self.faults = faults
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self.faults.delay()
+
+        error = self.faults.pick_error()
+        if error == "timeout":
+            raise requests.exceptions.ReadTimeout(f"timeout injetado: {request.url}", request=request)
+        if error == "connection":
+            raise requests.exceptions.ConnectionError(f"falha de conexão injetada: {request.url}", request=request)
+        if error:
+            return build_response(request, int(error), {"Retry-After": "1"}, "")
+
+        entry = self.store.load(request.method, request.url)
+        if entry is None:
+            return build_response(request, 404, {}, json.dumps({"detail": "sem fixture gravada"}))
+        return build_response(request, entry["status"], entry.get("headers") or {}, entry.get("body") or "")
+
+    def close(self):
+        pass
+
+
+class LocalServerAdapter(HTTPAdapter):
+    """Reescreve https://host/path?q para <server>/host/path?q (ver http_fixture_server)."""
+
+    def __init__(self, server_url: str, **kwargs):
+        self.server_url = server_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request = request.copy()
+        request.url = f"{self.server_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        request.headers.pop("Host", None)
+        return super().send(request, **kwargs)
+
+
+def build_response(request, status: int, headers: dict, body: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.reason = {200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests"}.get(status, "")
+    return response
+
+
+def transport_adapter(config: Optional[TransportConfig] = None, **adapter_kwargs) -> BaseAdapter:
+    """
+    Adapter a montar na sessão (http:// e https://), conforme o modo.
+    adapter_kwargs (pool_maxsize, max_retries...) valem para os modos com rede.
+    """
+    config = config or TransportConfig.from_settings()
+    store = FixtureStore(config.fixtures_dir, config.ignore_params)
+
+    if config.mode == RECORD:
+        return RecordingAdapter(store, **adapter_kwargs)
+    if config.mode == REPLAY:
+        return ReplayAdapter(store, FaultInjector(config))
+    if config.mode == SERVER:
+        return LocalServerAdapter(config.server_url, **adapter_kwargs)
+    return HTTPAdapter(**adapter_kwargs)
+
+
+def mount_transport(session: requests.Session, **adapter_kwargs) -> requests.Session:
+    adapter = transport_adapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,269 @@
+# core/services/images.py
+"""
+Derivados das imagens enviadas (capturas, fotos de espécie, membros, logos).
+
+Para cada original são gerados, em larguras fixas por campo (WIDTHS):
+- um WebP por largura;
+- um fallback por largura (JPEG, ou PNG se a imagem tem transparência);
+- um manifesto <nome>.json, gravado por último, com as larguras prontas.
+
+Ficam em <pasta do original>/derivatives/. Nunca amplia: larguras maiores
+que o original são puladas.
+
+Os templates não sabem de nada disso: usam {% responsive_img %}
+(core/templatetags/images.py), que lê o manifesto e monta <picture> com
+srcset e loading="lazy". Sem manifesto (ainda não gerado) cai no original.
+
+A geração roda depois do commit numa thread em segundo plano
+(IMAGE_DERIVATIVES_ASYNC); o comando build_image_derivatives faz o
+backfill dos arquivos antigos.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+PHOTO_WIDTHS = (320, 640, 1280)
+AVATAR_WIDTHS = (96, 192, 480)
+LOGO_WIDTHS = (200, 400)
+
+# "app_label.Model.campo" -> larguras geradas
+WIDTHS = {
+    "catches.Catch.photo": PHOTO_WIDTHS,
+    "catches.SpeciesPhoto.image": PHOTO_WIDTHS,
+    "members.Member.photo": AVATAR_WIDTHS,
+    "supporters.Supporter.logo": LOGO_WIDTHS,
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+DERIVATIVES_DIR = "derivatives"
+
+ASYNC = getattr(settings, "IMAGE_DERIVATIVES_ASYNC", True)
+WORKERS = getattr(settings, "IMAGE_DERIVATIVES_WORKERS", 2)
+
+
+def field_key(field_file) -> str:
+    return f"{field_file.instance._meta.label}.{field_file.field.name}"
+
+
+def widths_for(field_file) -> tuple[int, ...]:
+    return WIDTHS.get(field_key(field_file), ())
+
+
+# -------------------------
+# NOMES
+# -------------------------
+def _base(name: str) -> PurePosixPath:
+    # nome inteiro (com extensão): foto.jpg e foto.png não colidem
+    path = PurePosixPath(name)
+    return path.parent / DERIVATIVES_DIR / path.name
+
+
+def manifest_name(name: str) -> str:
+    return f"{_base(name)}.json"
+
+
+def derivative_name(name: str, width: int, ext: str) -> str:
+    return f"{_base(name)}-{width}w.{ext}"
+
+
+# -------------------------
+# GERAÇÃO
+# -------------------------
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    buf = BytesIO()
+    if fmt == "WEBP":
+        img.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif fmt == "PNG":
+        img.save(buf, "PNG", optimize=True)
+    else:
+        img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def _save(storage, name: str, content: bytes) -> None:
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def generate_derivatives(field_file, widths=None, force: bool = False) -> int:
+    """
+    Gera os derivados de um arquivo (FieldFile). Retorna quantos arquivos
+    gravou (0 = já estava pronto, ou arquivo ausente/ilegível).
+    """
+    if not field_file:
+        return 0
+    widths = sorted(widths or widths_for(field_file))
+    storage = field_file.storage
+    name = field_file.name
+
+    if not widths or (not force and storage.exists(manifest_name(name))):
+        return 0
+
+    try:
+        with storage.open(name, "rb") as fh:
+            img = Image.open(fh)
+            img = ImageOps.exif_transpose(img)  # celular grava girado no EXIF
+            img.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        logger.warning("Imagem ilegível, sem derivados: %s (%s)", name, exc)
+        return 0
+
+    alpha = _has_alpha(img)
+    img = img.convert("RGBA" if alpha else "RGB")
+    fallback_ext, fallback_fmt = ("png", "PNG") if alpha else ("jpg", "JPEG")
+
+    # não amplia; imagem menor que a menor largura ganha um derivado do próprio tamanho
+    usable = [w for w in widths if w < img.width] or [img.width]
+    if img.width <= widths[-1] and img.width not in usable:
+        usable.append(img.width)
+
+    written = 0
+    done = []
+    for width in usable:
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        _save(storage, derivative_name(name, width, "webp"), _encode(resized, "WEBP"))
+        _save(storage, derivative_name(name, width, fallback_ext), _encode(resized, fallback_fmt))
+        written += 2
+        done.append(width)
+
+    # por último: manifesto presente = derivados completos
+    manifest = {"widths": done, "fallback": fallback_ext, "width": img.width, "height": img.height}
+    _save(storage, manifest_name(name), json.dumps(manifest).encode())
+    _manifests.pop(name, None)
+    _missing.pop(name, None)
+    return written + 1
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(WORKERS, 1), thread_name_prefix="image-derivatives")
+        return _executor
+
+
+def _run(field_file, on_done: Optional[Callable[[], None]], close_connections: bool = False) -> None:
+    try:
+        if generate_derivatives(field_file) and on_done:
+            on_done()
+    except Exception:  # thread de fundo: loga e segue
+        logger.exception("Falha ao gerar derivados de %s", field_file.name)
+    finally:
+        # thread do pool: a conexão que o on_done abriu não é fechada por
+        # nenhum request_finished, ficaria aberta até o processo morrer
+        if close_connections:
+            connections.close_all()
+
+
+def schedule_derivatives(field_file, on_done: Optional[Callable[[], None]] = None) -> None:
+    """
+    Agenda a geração para depois do commit. on_done roda se algo foi
+    gerado (ex: invalidar as páginas que já estavam em cache com o original).
+    """
+    if not field_file or not widths_for(field_file):
+        return
+
+    def start():
+        if ASYNC:
+            _get_executor().submit(_run, field_file, on_done, True)
+        else:
+            _run(field_file, on_done)
+
+    transaction.on_commit(start)
+
+
+# -------------------------
+# LEITURA (templates)
+# -------------------------
+_manifests: dict[str, dict] = {}
+MAX_CACHED_MANIFESTS = 4096
+
+# manifesto ausente: lembra por alguns segundos (name -> expira em, monotonic)
+# para a página com 24 cards sem derivados não abrir 24 arquivos a cada request
+_missing: dict[str, float] = {}
+MISSING_MANIFEST_TTL = 10
+
+
+def get_manifest(field_file) -> Optional[dict]:
+    """
+    Manifesto dos derivados (cacheado no processo quando existe; a ausência,
+    por MISSING_MANIFEST_TTL segundos).
+    """
+    name = field_file.name
+    manifest = _manifests.get(name)
+    if manifest is not None:
+        return manifest
+    if _missing.get(name, 0) > time.monotonic():
+        return None
+
+    try:
+        with field_file.storage.open(manifest_name(name), "rb") as fh:
+            manifest = json.loads(fh.read())
+    except (OSError, ValueError):
+        # ainda não gerado: pode aparecer a qualquer momento, guarda só por pouco tempo
+        if len(_missing) >= MAX_CACHED_MANIFESTS:
+            _missing.clear()
+        _missing[name] = time.monotonic() + MISSING_MANIFEST_TTL
+        return None
+
+    if len(_manifests) >= MAX_CACHED_MANIFESTS:
+        _manifests.clear()
+    _manifests[name] = manifest
+    return manifest
+
+
+def derivative_sources(field_file) -> Optional[dict]:
+    """
+    {"webp": [(url, largura)...], "fallback": [...], "src": url}
+    ou None se não há derivados (usa o original).
+    """
+    if not field_file:
+        return None
+    manifest = get_manifest(field_file)
+    if not manifest or not manifest.get("widths"):
+        return None
+
+    storage = field_file.storage
+    name = field_file.name
+    widths = manifest["widths"]
+    webp = [(storage.url(derivative_name(name, w, "webp")), w) for w in widths]
+    fallback = [(storage.url(derivative_name(name, w, manifest["fallback"])), w) for w in widths]
+    return {
+        "webp": webp,
+        "fallback": fallback,
+        "src": fallback[-1][0],
+    }
+
+
+def card_image_url(field_file, width: int = 640) -> str:
+    """Uma URL só (sem srcset), do derivado WebP mais próximo de `width`; senão o original."""
+    sources = derivative_sources(field_file)
+    if sources is None:
+        return field_file.url
+    fitting = [url for url, w in sources["webp"] if w <= width]
+    return fitting[-1] if fitting else sources["webp"][0][0]
@@ -0,0 +1,189 @@
+# core/services/leaderboard.py
+"""
+Placar materializado (core.MemberScore).
+
+Em vez de recalcular o ranking inteiro a cada request, cada membro tem
+uma linha com as 2 melhores pontuações válidas. Os signals chamam
+refresh_member_score / refresh_species_scores quando algo muda, e as
+páginas só leem o topo ordenado pelo índice core_score_rank_idx.
+"""
+from __future__ import annotations
+
+from array import array
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Q
+
+from catches.models import Catch, Species
+from catches.services.scoring import ScoringTable, to_centi, units_to_decimal
+from core.models import MemberScore
+from core.services.counters import get_counters
+from core.services.pagination import decode_cursor, encode_cursor, keyset_filter
+from core.services.ranking import member_scores
+from members.models import Member
+
+ZERO = Decimal("0")
+
+RANK_ORDERING = ["-total_points", "name_key", "member_id"]
+
+
+def _best_two(points: list[Decimal]) -> tuple[Decimal, Decimal]:
+    top = sorted((p for p in points if p > 0), reverse=True)[:2]
+    top += [ZERO] * (2 - len(top))
+    return top[0], top[1]
+
+
+def compute_member_points(member_id: int) -> tuple[Decimal, Decimal]:
+    """Retorna (melhor, segunda melhor) pontuação válida do membro."""
+    rows = list(Catch.objects.filter(member_id=member_id).values_list("length_cm", "species_id"))
+    table = ScoringTable.load(Species.objects.filter(pk__in={species_id for _, species_id in rows}))
+    units = table.score_batch(
+        array("q", (to_centi(length) for length, _ in rows)),
+        array("q", (species_id for _, species_id in rows)),
+    )
+    return _best_two([units_to_decimal(u) for u in units])
+
+
+def refresh_member_score(member_id: int | None) -> None:
+    """Recalcula a linha do placar de um único membro."""
+    if member_id is None:
+        return
+
+    member = Member.objects.filter(pk=member_id).only("id", "name").first()
+    if member is None:
+        # membro removido: a linha cai junto via CASCADE
+        return
+
+    best, second = compute_member_points(member_id)
+    MemberScore.objects.update_or_create(
+        member_id=member_id,
+        defaults={
+            "best_points": best,
+            "second_points": second,
+            "total_points": best + second,
+            "name_key": member.name.lower(),
+        },
+    )
+
+
+def refresh_species_scores(species_id: int) -> None:
+    """Regra da espécie mudou: recalcula só quem tem captura dela."""
+    member_ids = (
+        Catch.objects
+        .filter(species_id=species_id)
+        .values_list("member_id", flat=True)
+        .distinct()
+    )
+    for member_id in list(member_ids):
+        refresh_member_score(member_id)
+
+
+@transaction.atomic
+def rebuild_leaderboard() -> int:
+    """Reconstrói o placar do zero (ranking calculado no banco). Retorna o número de linhas."""
+    scores = member_scores()
+    names = dict(Member.objects.values_list("id", "name"))
+
+    MemberScore.objects.all().delete()
+    MemberScore.objects.bulk_create(
+        [
+            MemberScore(
+                member_id=member_id,
+                best_points=best,
+                second_points=second,
+                total_points=best + second,
+                name_key=names[member_id].lower(),
+            )
+            for member_id, (best, second) in scores.items()
+        ],
+        batch_size=1000,
+    )
+    return len(scores)
+
+
+def top_ranking(top_n=10):
+    """Mesmo formato do build_ranking, lido direto do placar."""
+    rows = (
+        MemberScore.objects
+        .select_related("member")
+        .order_by(*RANK_ORDERING)[:top_n]
+    )
+    return [
+        {"member": row.member, "points": row.total_points, "pos": i + 1}
+        for i, row in enumerate(rows)
+    ]
+
+
+def _ahead_of(score: MemberScore) -> Q:
+    """Quem fica na frente de `score` na ordem do ranking."""
+    values = [score.total_points, score.name_key, score.member_id]
+    return keyset_filter(RANK_ORDERING, values, before=True)
+
+
+def member_rank(member_id: int):
+    """
+    Posição de um membro sem montar o ranking inteiro:
+    {"pos": 47, "total": 312, "points": Decimal}. None se não tem placar.
+    """
+    score = MemberScore.objects.filter(member_id=member_id).first()
+    if score is None:
+        return None
+
+    # COUNT só de quem está na frente (faixa do core_score_rank_idx); o total
+    # vem do SiteCounters (um placar por membro), sem varrer a tabela
+    pos = MemberScore.objects.filter(_ahead_of(score)).count() + 1
+    total = max(get_counters()["members"], pos)
+    return {"pos": pos, "total": total, "points": score.total_points}
+
+
+def cursor_after(row) -> str:
+    """Cursor para continuar o ranking depois de uma linha (dict do top_ranking)."""
+    m = row["member"]
+    return encode_cursor([row["points"], m.name.lower(), m.pk, row["pos"]])
+
+
+def _clean_cursor(values):
+    """
+    [pontos, name_key, member_id, pos] com os tipos certos, ou None
+    (cursor adulterado = volta para a página 1). pos vem do cliente:
+    só serve para numerar a página, nunca negativo.
+    """
+    if not isinstance(values, list) or len(values) != 4:
+        return None
+    points, name_key, member_id, pos = values
+    if not isinstance(name_key, str):
+        return None
+    if isinstance(member_id, bool) or isinstance(pos, bool):
+        return None
+    try:
+        points = Decimal(str(points))
+        member_id = int(member_id)
+        pos = int(pos)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    if not points.is_finite():
+        return None
+    return [points, name_key, member_id, max(0, pos)]
+
+
+def leaderboard_page(cursor=None, size=20):
+    """
+    Página do ranking completo, por cursor (keyset no índice core_score_rank_idx).
+    Retorna (linhas, próximo_cursor); as linhas têm o mesmo formato do top_ranking.
+    """
+    values = _clean_cursor(decode_cursor(cursor))
+    qs = MemberScore.objects.select_related("member").order_by(*RANK_ORDERING)
+
+    start = 0
+    if values:
+        qs = qs.filter(keyset_filter(RANK_ORDERING, values[:3]))
+        start = values[3]
+
+    scores = list(qs[: size + 1])
+    has_next = len(scores) > size
+    rows = [
+        {"member": s.member, "points": s.total_points, "pos": start + i + 1}
+        for i, s in enumerate(scores[:size])
+    ]
+    return rows, (cursor_after(rows[-1]) if has_next else None)
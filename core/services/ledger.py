@@ -0,0 +1,209 @@
+# core/services/ledger.py
+"""
+Ledger de pontuação (core.ScoreEvent) + ranking em qualquer instante.
+
+Cada mudança de pontos de uma captura vira um evento append-only.
+Para saber o ranking em uma data, pega o último ScoreCheckpoint antes
+dela e reaplica só os eventos seguintes, em vez de recalcular tudo.
+
+"Seguintes" é por tempo (occurred_at), não por id: um evento pode ter
+id menor e occurred_at maior que outro (transação que demorou a
+commitar, seed_ledger com data antiga). O checkpoint guarda as duas
+marcas (taken_at e last_event_id) e nunca cobre os últimos
+LEDGER_CHECKPOINT_MARGIN_SECONDS, onde ainda pode chegar evento atrasado.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from catches.models import Catch, Species
+from catches.services.scoring import ScoringTable, to_centi, units_to_decimal
+from core.models import ScoreCheckpoint, ScoreEvent
+from core.services.ranking import calc_catch_points
+from members.models import Member
+
+ZERO = Decimal("0")
+
+CHECKPOINT_MARGIN = timedelta(seconds=getattr(settings, "LEDGER_CHECKPOINT_MARGIN_SECONDS", 300))
+
+
+# -------------------------
+# GRAVAÇÃO
+# -------------------------
+def _last_event(catch_id: int) -> ScoreEvent | None:
+    return ScoreEvent.objects.filter(catch_id=catch_id).order_by("-id").first()
+
+
+def record_catch_saved(catch: Catch) -> ScoreEvent | None:
+    """Grava added/rescored se os pontos (ou o dono) da captura mudaram."""
+    points = max(calc_catch_points(catch), ZERO)
+
+    last = _last_event(catch.pk)
+    if last is None or last.kind == ScoreEvent.REMOVED:
+        kind = ScoreEvent.ADDED
+    elif last.points == points and last.member_id == catch.member_id:
+        return None
+    else:
+        kind = ScoreEvent.RESCORED
+
+    return ScoreEvent.objects.create(kind=kind, catch_id=catch.pk, member_id=catch.member_id, points=points)
+
+
+def record_catch_removed(catch_id: int, member_id: int) -> ScoreEvent | None:
+    last = _last_event(catch_id)
+    if last is not None and last.kind == ScoreEvent.REMOVED:
+        return None
+    return ScoreEvent.objects.create(kind=ScoreEvent.REMOVED, catch_id=catch_id, member_id=member_id, points=ZERO)
+
+
+def record_species_rescored(species_id: int) -> int:
+    """Regra da espécie mudou: um evento rescored por captura afetada."""
+    rows = list(
+        Catch.objects
+        .filter(species_id=species_id)
+        .values_list("id", "member_id", "length_cm")
+    )
+    table = ScoringTable.load(Species.objects.filter(pk=species_id))
+    units = table.score_batch(
+        array("q", (to_centi(length) for _, _, length in rows)),
+        array("q", [species_id] * len(rows)),
+    )
+
+    last_points = {}
+    for catch_id, points in (
+        ScoreEvent.objects
+        .filter(catch_id__in=[r[0] for r in rows])
+        .order_by("catch_id", "id")
+        .values_list("catch_id", "points")
+    ):
+        last_points[catch_id] = points  # fica o mais recente
+
+    events = []
+    for (catch_id, member_id, _), u in zip(rows, units):
+        points = max(units_to_decimal(u), ZERO)
+        if last_points.get(catch_id) == points:
+            continue
+        kind = ScoreEvent.RESCORED if catch_id in last_points else ScoreEvent.ADDED
+        events.append(ScoreEvent(kind=kind, catch_id=catch_id, member_id=member_id, points=points))
+
+    ScoreEvent.objects.bulk_create(events, batch_size=1000)
+    return len(events)
+
+
+@transaction.atomic
+def seed_ledger() -> int:
+    """
+    Cria um "added" para cada captura que ainda não está no ledger (ex:
+    capturas anteriores ao ledger), com a data de registro da captura, para
+    que o histórico antigo também seja consultável.
+    """
+    rows = list(
+        Catch.objects
+        .filter(~Exists(ScoreEvent.objects.filter(catch_id=OuterRef("pk"))))
+        .order_by("created_at", "id")
+        .values_list("id", "member_id", "created_at", "length_cm", "species_id")
+    )
+    units = ScoringTable.load().score_batch(
+        array("q", (to_centi(r[3]) for r in rows)),
+        array("q", (r[4] for r in rows)),
+    )
+    events = [
+        ScoreEvent(
+            kind=ScoreEvent.ADDED,
+            catch_id=catch_id,
+            member_id=member_id,
+            occurred_at=created_at,
+            points=max(units_to_decimal(u), ZERO),
+        )
+        for (catch_id, member_id, created_at, _, _), u in zip(rows, units)
+    ]
+    ScoreEvent.objects.bulk_create(events, batch_size=1000)
+    return len(events)
+
+
+# -------------------------
+# REPLAY
+# -------------------------
+def _replay(state: dict, events) -> int | None:
+    last_id = None
+    for event_id, kind, catch_id, member_id, points in events:
+        key = str(catch_id)
+        if kind == ScoreEvent.REMOVED or points <= 0:
+            state.pop(key, None)
+        else:
+            state[key] = [member_id, str(points)]
+        last_id = max(event_id, last_id or 0)
+    return last_id
+
+
+def state_as_of(when: datetime) -> tuple[dict, int]:
+    """
+    Pontos de cada captura válida no instante `when`.
+    Retorna (state, maior id de evento considerado).
+    """
+    checkpoint = (
+        ScoreCheckpoint.objects
+        .filter(taken_at__lte=when)
+        .order_by("-taken_at", "-id")
+        .first()
+    )
+    state = dict(checkpoint.state) if checkpoint else {}
+    last_id = checkpoint.last_event_id if checkpoint else 0
+
+    events = ScoreEvent.objects.filter(occurred_at__lte=when)
+    if checkpoint:
+        # depois da marca de tempo, ou gravado depois do checkpoint com data antiga
+        events = events.filter(Q(occurred_at__gt=checkpoint.taken_at) | Q(id__gt=last_id))
+    events = (
+        events
+        .order_by("occurred_at", "id")
+        .values_list("id", "kind", "catch_id", "member_id", "points")
+    )
+    replayed = _replay(state, events.iterator())
+    return state, max(replayed or 0, last_id)
+
+
+def create_checkpoint(when: datetime | None = None) -> ScoreCheckpoint:
+    """Checkpoint em `when`, recuado para fora da margem de eventos ainda chegando."""
+    when = min(when or timezone.now(), timezone.now() - CHECKPOINT_MARGIN)
+    state, last_id = state_as_of(when)
+    return ScoreCheckpoint.objects.create(taken_at=when, last_event_id=last_id, state=state)
+
+
+def ranking_as_of(when: datetime, top_n=10):
+    """Ranking (mesmo formato do build_ranking) como estava em `when`."""
+    state, _ = state_as_of(when)
+
+    points_by_member = {}
+    for member_id, points in state.values():
+        points_by_member.setdefault(member_id, []).append(Decimal(points))
+
+    member_points = []
+    for m in Member.objects.filter(created_at__lte=when):
+        best = sorted(points_by_member.get(m.id, []), reverse=True)[:2]
+        member_points.append((m, sum(best, ZERO)))
+
+    member_points.sort(key=lambda x: (-x[1], x[0].name.lower(), x[0].pk))
+
+    return [
+        {"member": m, "points": pts, "pos": i + 1}
+        for i, (m, pts) in enumerate(member_points[:top_n])
+    ]
+
+
+def end_of_day(day) -> datetime:
+    """Último instante do dia (fuso do projeto)."""
+    return timezone.make_aware(datetime.combine(day, time.max))
+
+
+def end_of_month(year: int, month: int) -> datetime:
+    first_next = datetime(year + month // 12, month % 12 + 1, 1)
+    return end_of_day((first_next - timedelta(days=1)).date())
+
@@ -0,0 +1,124 @@
+# core/services/pagination.py
+"""
+Paginação por cursor (keyset).
+
+Em vez de OFFSET, o cursor guarda os valores de ordenação do último item
+da página; a próxima página é um WHERE (a, b, c) > (...) que usa o índice,
+então a página N custa o mesmo que a página 1.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não suportado no cursor: {type(value)!r}")
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> list | None:
+    """Cursor inválido/adulterado = começa do início (None)."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _field_name(order: str) -> str:
+    return order.lstrip("-")
+
+
+def _output_field(qs, name):
+    annotation = qs.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return qs.model._meta.get_field(name)
+
+
+def clean_cursor(qs, ordering, values) -> list | None:
+    """
+    Converte os valores do cursor para os tipos dos campos de ordenação
+    (campo do model ou anotação). Valor que não converte, ou null,
+    = cursor adulterado: None (começa do início).
+    """
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    cleaned = []
+    try:
+        for order, value in zip(ordering, values):
+            if value is None:
+                return None
+            cleaned.append(_output_field(qs, _field_name(order)).to_python(value))
+    except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+        return None
+    return cleaned
+
+
+def keyset_filter(ordering, values, before=False) -> Q:
+    """
+    Q dos itens DEPOIS de `values` na ordem `ordering` (ou ANTES, com before=True).
+    Ex: ["-points", "name", "id"] -> points < p OR (points = p AND name > n) OR ...
+    """
+    q = Q()
+    equal = {}
+    for order, value in zip(ordering, values):
+        field = _field_name(order)
+        op = "lt" if order.startswith("-") != before else "gt"
+        q |= Q(**equal, **{f"{field}__{op}": value})
+        equal[field] = value
+    return q
+
+
+def keyset_page(qs, cursor=None, size=20, ordering=None):
+    """
+    Uma página de `qs` por cursor. `ordering` padrão = order_by do queryset
+    (precisa terminar num campo único, ex: "id").
+    Retorna (itens, próximo_cursor ou None).
+    """
+    ordering = list(ordering or qs.query.order_by)
+    values = clean_cursor(qs, ordering, decode_cursor(cursor))
+    if values:
+        qs = qs.filter(keyset_filter(ordering, values))
+
+    items = list(qs.order_by(*ordering)[: size + 1])
+    if len(items) <= size:
+        return items, None
+
+    items = items[:size]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, _field_name(o)) for o in ordering)
+
+
+# -------------------------
+# "CARREGAR MAIS"
+# -------------------------
+def wants_fragment(request) -> bool:
+    """Pedido do botão "Carregar mais" (fetch): responde só os itens."""
+    return request.headers.get("X-Requested-With") == "fetch"
+
+
+def next_page_url(request, cursor: str | None) -> str | None:
+    """Mesma URL (mantendo filtros/busca) apontando para o próximo cursor."""
+    if not cursor:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return f"{request.path}?{params.urlencode()}"
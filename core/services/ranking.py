@@ -1,18 +1,132 @@
 from decimal import Decimal
 from collections import defaultdict
-from catches.models import Catch
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from catches.models import Catch, Species
+from catches.services.scoring import SpeciesRule, units_to_decimal
 from members.models import Member
 
 def calc_catch_points(c: Catch) -> Decimal:
     # se abaixo do mínimo, não conta
     if c.length_cm is None or c.species is None:
         return Decimal("0")
-    if Decimal(c.length_cm) < Decimal(c.species.min_length_cm or 0):
-        return Decimal("0")
+    return units_to_decimal(SpeciesRule.from_species(c.species).score(c.length_cm))
+
+
+# Pontos calculados no banco nas mesmas "unidades" inteiras do
+# catches.services.scoring (cm*100 x pts/cm*100 = 0,0001 ponto). Assim
+# SQLite (REAL) e PostgreSQL (numeric) dão exatamente o mesmo resultado.
+RANKING_SQL = """
+WITH scored AS (
+    SELECT c.member_id AS member_id,
+           CAST(ROUND(c.length_cm * 100) AS BIGINT)
+             * CAST(ROUND(s.points_per_cm * 100) AS BIGINT) AS units
+    FROM {catch} c
+    JOIN {species} s ON s.id = c.species_id
+    WHERE ROUND(c.length_cm * 100) >= ROUND(s.min_length_cm * 100)
+),
+best AS (
+    SELECT member_id, units,
+           ROW_NUMBER() OVER (PARTITION BY member_id ORDER BY units DESC) AS rn
+    FROM scored
+    WHERE units > 0
+),
+totals AS (
+    SELECT member_id,
+           SUM(CASE WHEN rn = 1 THEN units ELSE 0 END) AS best_units,
+           SUM(CASE WHEN rn = 2 THEN units ELSE 0 END) AS second_units
+    FROM best
+    WHERE rn <= 2
+    GROUP BY member_id
+),
+board AS (
+    SELECT m.id AS member_id,
+           COALESCE(t.best_units, 0) AS best_units,
+           COALESCE(t.second_units, 0) AS second_units,
+           ROW_NUMBER() OVER (
+               ORDER BY COALESCE(t.best_units, 0) + COALESCE(t.second_units, 0) DESC,
+                        {name_key}, m.id
+           ) AS pos
+    FROM {member} m
+    LEFT JOIN totals t ON t.member_id = m.id
+)
+SELECT member_id, best_units, second_units
+FROM board
+{where}
+"""
+
+
+def _py_lower(value):
+    return value.lower() if value is not None else None
+
+
+@receiver(connection_created)
+def _register_py_lower(sender, connection, **kwargs):
+    # LOWER do SQLite só troca A-Z; PY_LOWER é o str.lower do Python
+    if connection.vendor == "sqlite":
+        connection.connection.create_function("PY_LOWER", 1, _py_lower, deterministic=True)
+
+
+def _name_key_sql(alias="m") -> str:
+    """
+    Desempate por nome igual ao do Python (ordem dos code points de
+    name.lower()): "C" no PostgreSQL, PY_LOWER (BINARY) no SQLite.
+    """
+    if connection.vendor == "postgresql":
+        return f'LOWER({alias}.name) COLLATE "C"'
+    if connection.vendor == "sqlite":
+        return f"PY_LOWER({alias}.name)"
+    return f"LOWER({alias}.name)"
+
+
+def member_scores(top_n=None) -> dict:
+    """
+    Roda o ranking no banco (ROW_NUMBER por membro + ROW_NUMBER geral na
+    ordem do ranking: pontos, nome, id). Retorna {member_id: (melhor, segunda)}
+    dos top_n primeiros, exatamente top_n linhas (top_n=None traz todos).
+    """
+    qn = connection.ops.quote_name
+    sql = RANKING_SQL.format(
+        catch=qn(Catch._meta.db_table),
+        species=qn(Species._meta.db_table),
+        member=qn(Member._meta.db_table),
+        name_key=_name_key_sql(),
+        where="WHERE pos <= %s" if top_n is not None else "",
+    )
+    params = [top_n] if top_n is not None else []
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {
+            member_id: (units_to_decimal(int(best)), units_to_decimal(int(second)))
+            for member_id, best, second in cursor.fetchall()
+        }
 
-    return Decimal(c.length_cm) * Decimal(c.species.points_per_cm or 0)
 
 def build_ranking(top_n=10):
+    # só o top N volta do banco (já cortado na ordem do ranking)
+    scores = member_scores(top_n)
+    members = Member.objects.in_bulk(list(scores))
+
+    member_points = [
+        (members[member_id], best + second)
+        for member_id, (best, second) in scores.items()
+        if member_id in members
+    ]
+
+    # ordena: maior pontuação, depois nome (o desempate fica no Python
+    # para ser igual em qualquer collation do banco)
+    member_points.sort(key=lambda x: (-x[1], x[0].name.lower(), x[0].pk))
+
+    return [
+        {"member": m, "points": pts, "pos": i + 1}
+        for i, (m, pts) in enumerate(member_points[:top_n])
+    ]
+
+
+def build_ranking_python(top_n=10):
+    """Implementação original, em memória. Fica como referência de paridade."""
     # carrega capturas com espécie e membro
     catches = (
         Catch.objects
@@ -0,0 +1,92 @@
+# core/services/ranking_cache.py
+"""
+Cache do ranking/pódio com versão de dados.
+
+A chave inclui a versão do escopo "ranking" (ver core.services.versions),
+que muda em qualquer escrita de Catch/Species/Member. Quando a chave
+expira, só um worker recalcula (lock via cache.add); os outros usam o
+último valor da MESMA versão ou esperam o recálculo.
+"""
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.services.leaderboard import top_ranking
+from core.services.versions import get_version
+
+SCOPE = "ranking"
+
+CACHE_TIMEOUT = getattr(settings, "RANKING_CACHE_TIMEOUT", 300)
+LOCK_TIMEOUT = 30
+WAIT_SECONDS = 3
+WAIT_STEP = 0.05
+
+# contadores de hit/miss só para diagnóstico: cada contagem é uma escrita
+# no cache (no DatabaseCache, SELECT + INSERT/UPDATE por página vista), então
+# ficam desligados fora do DEBUG. incr não é atômico em todo backend: aproximados.
+STATS_ENABLED = getattr(settings, "RANKING_CACHE_STATS", False)
+STATS = ("hits", "misses", "stale", "waits")
+STATS_KEY = "ranking:stats:{name}"
+
+
+def _count(name: str) -> None:
+    if not STATS_ENABLED:
+        return
+    key = STATS_KEY.format(name=name)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def cache_stats() -> dict:
+    values = cache.get_many([STATS_KEY.format(name=n) for n in STATS])
+    return {n: values.get(STATS_KEY.format(name=n), 0) for n in STATS}
+
+
+def reset_cache_stats() -> None:
+    cache.delete_many([STATS_KEY.format(name=n) for n in STATS])
+
+
+def cached_top_ranking(top_n=10):
+    version = get_version(SCOPE)
+    key = f"ranking:top:{top_n}:v{version}"
+
+    result = cache.get(key)
+    if result is not None:
+        _count("hits")
+        return result
+
+    _count("misses")
+    last_key = f"ranking:top:{top_n}:last"
+    lock_key = f"{key}:lock"
+
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            result = top_ranking(top_n)
+            cache.set(key, result, CACHE_TIMEOUT)
+            cache.set(last_key, (version, result), None)
+        finally:
+            cache.delete(lock_key)
+        return result
+
+    # outro worker está recalculando: serve o último valor se for da mesma versão
+    last = cache.get(last_key)
+    if last is not None and last[0] == version:
+        _count("stale")
+        return last[1]
+
+    # dado mudou: espera o recálculo (nunca devolve ranking antigo)
+    _count("waits")
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_STEP)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    return top_ranking(top_n)
@@ -0,0 +1,100 @@
+# core/services/uploads.py
+"""
+Ingestão de fotos enviadas (hoje: foto da captura).
+
+1) Antes de ler o corpo: Content-Length acima do limite já é recusado
+   pela view (request_too_large), sem consumir o upload.
+2) Durante a leitura: CappedUploadHandler grava direto em arquivo
+   temporário (nada de 12 MB em memória) e corta a conexão se o arquivo
+   passar do limite (cliente que mente/omite o Content-Length).
+3) Depois: ingest_image abre com Pillow, aplica a orientação do EXIF,
+   reduz acima de max_side e regrava sem metadados (EXIF/GPS saem).
+"""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import PurePath
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+MAX_BYTES = getattr(settings, "UPLOAD_PHOTO_MAX_BYTES", 15 * 1024 * 1024)
+MAX_SIDE = getattr(settings, "UPLOAD_PHOTO_MAX_SIDE", 2560)
+# folga para os outros campos do formulário (multipart)
+FORM_OVERHEAD = 256 * 1024
+# pixels decodificados no máximo (~50 MP); acima disso é bomba de descompressão
+MAX_PIXELS = 50_000_000
+JPEG_QUALITY = 85
+
+
+class UploadRejected(Exception):
+    pass
+
+
+def human_size(n: int) -> str:
+    return f"{n / (1024 * 1024):.0f} MB"
+
+
+def request_too_large(request, max_bytes: int = MAX_BYTES) -> bool:
+    """Pelo Content-Length, sem ler o corpo."""
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return False
+    return length > max_bytes + FORM_OVERHEAD
+
+
+class CappedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Sempre em disco, com limite por arquivo. Estourou: para de ler o
+    corpo (StopUpload com connection_reset) e marca request.upload_rejected.
+    """
+
+    def __init__(self, request=None, max_bytes: int = MAX_BYTES):
+        super().__init__(request)
+        self.max_bytes = max_bytes
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            self.file.close()
+            if self.request is not None:
+                self.request.upload_rejected = f"Foto maior que {human_size(self.max_bytes)}."
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+
+def ingest_image(uploaded, max_side: int = MAX_SIDE):
+    """
+    Normaliza uma imagem enviada e devolve um novo arquivo pronto para o
+    ImageField (JPEG; PNG se tem transparência). UploadRejected se não
+    for imagem válida.
+    """
+    try:
+        uploaded.seek(0)
+        img = Image.open(uploaded)
+        if img.width * img.height > MAX_PIXELS:
+            raise UploadRejected("Imagem com resolução grande demais.")
+        # JPEG: o decoder já reduz em potências de 2 (bem menos memória/CPU)
+        img.draft("RGB", (max_side, max_side))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        raise UploadRejected("Arquivo não é uma imagem válida.")
+
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    buf = BytesIO()
+    if alpha:
+        img.convert("RGBA").save(buf, "PNG", optimize=True)
+        ext, content_type = "png", "image/png"
+    else:
+        # sem exif=...: os metadados (GPS inclusive) não são copiados
+        img.convert("RGB").save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        ext, content_type = "jpg", "image/jpeg"
+
+    name = f"{PurePath(uploaded.name or 'foto').stem}.{ext}"
+    return SimpleUploadedFile(name, buf.getvalue(), content_type=content_type)
@@ -0,0 +1,47 @@
+# core/services/versions.py
+"""
+Versões de dados por "escopo" (ranking, catches, ...), guardadas no cache.
+
+Cada escrita relevante chama bump_version(escopo); quem guarda resultados
+no cache usa a versão atual na chave, então um dado antigo nunca é lido
+depois de uma escrita. A versão é um timestamp em milissegundos, sempre
+crescente.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+
+KEY = "dv:{scope}"
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def get_version(scope: str) -> int:
+    key = KEY.format(scope=scope)
+    version = cache.get(key)
+    if version is None:
+        # chave fria (cache novo ou evicção): começa uma versão nova
+        cache.add(key, _now_ms(), None)
+        version = cache.get(key) or _now_ms()
+    return version
+
+
+def bump_version(*scopes: str) -> None:
+    for scope in scopes:
+        key = KEY.format(scope=scope)
+        current = cache.get(key) or 0
+        cache.set(key, max(current + 1, _now_ms()), None)
+
+
+def get_versions(*scopes: str) -> dict:
+    """Várias versões com um único get_many: {escopo: versão}."""
+    keys = {KEY.format(scope=scope): scope for scope in scopes}
+    found = cache.get_many(list(keys))
+    return {
+        scope: found[key] if key in found else get_version(scope)
+        for key, scope in keys.items()
+    }
@@ -0,0 +1,187 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from catches.models import Catch, Species, SpeciesBaitIdea, SpeciesPhoto
+from core.services.conditional import CATCHES_SCOPE, MEMBERS_SCOPE, SPECIES_SCOPE, WEATHER_SCOPE
+from core.services.counters import adjust_counter
+from core.services.home_cache import FEED_SCOPE, STATS_SCOPE, SUPPORTERS_SCOPE
+from core.services.images import schedule_derivatives
+from core.services.leaderboard import refresh_member_score, refresh_species_scores
+from core.services.ledger import record_catch_removed, record_catch_saved, record_species_rescored
+from core.services.ranking_cache import SCOPE as RANKING_SCOPE
+from core.services.versions import bump_version
+from members.models import Member
+from supporters.models import Supporter
+from weather.models import Spot
+
+RULE_FIELDS = ("min_length_cm", "points_per_cm")
+
+
+def _bump_on_commit(*scopes):
+    # depois do commit: o placar já está atualizado quando a versão muda
+    transaction.on_commit(lambda: bump_version(*scopes))
+
+
+def _bump_ranking_on_commit(*scopes):
+    # nomes de membro/espécie e capturas também aparecem no feed da home
+    _bump_on_commit(RANKING_SCOPE, FEED_SCOPE, *scopes)
+
+
+# -------------------------
+# MEMBER
+# -------------------------
+@receiver(post_save, sender=Member, dispatch_uid="core_score_member_saved")
+def member_saved(sender, instance, **kwargs):
+    refresh_member_score(instance.pk)
+    _bump_ranking_on_commit(MEMBERS_SCOPE)
+
+
+@receiver(post_delete, sender=Member, dispatch_uid="core_score_member_deleted")
+def member_deleted(sender, instance, **kwargs):
+    _bump_ranking_on_commit(MEMBERS_SCOPE)
+
+
+# -------------------------
+# CATCH
+# -------------------------
+@receiver(pre_save, sender=Catch, dispatch_uid="core_score_catch_pre_save")
+def catch_pre_save(sender, instance, **kwargs):
+    # guarda o membro antigo (captura pode ter trocado de dono no admin)
+    instance._previous_member_id = None
+    if instance.pk:
+        instance._previous_member_id = (
+            Catch.objects.filter(pk=instance.pk).values_list("member_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Catch, dispatch_uid="core_score_catch_saved")
+def catch_saved(sender, instance, **kwargs):
+    record_catch_saved(instance)
+    refresh_member_score(instance.member_id)
+
+    previous = getattr(instance, "_previous_member_id", None)
+    if previous and previous != instance.member_id:
+        refresh_member_score(previous)
+
+    _bump_ranking_on_commit(CATCHES_SCOPE)
+
+
+@receiver(post_delete, sender=Catch, dispatch_uid="core_score_catch_deleted")
+def catch_deleted(sender, instance, **kwargs):
+    # no commit: se o membro inteiro está sendo apagado, não recria a linha
+    member_id = instance.member_id
+    record_catch_removed(instance.pk, member_id)
+    transaction.on_commit(lambda: refresh_member_score(member_id))
+    _bump_ranking_on_commit(CATCHES_SCOPE)
+
+
+# -------------------------
+# SPECIES (regra de pontuação)
+# -------------------------
+@receiver(pre_save, sender=Species, dispatch_uid="core_score_species_pre_save")
+def species_pre_save(sender, instance, **kwargs):
+    instance._rules_changed = False
+    if instance.pk:
+        old = Species.objects.filter(pk=instance.pk).values(*RULE_FIELDS).first()
+        instance._rules_changed = bool(old) and any(
+            old[f] != getattr(instance, f) for f in RULE_FIELDS
+        )
+
+
+@receiver(post_save, sender=Species, dispatch_uid="core_score_species_saved")
+def species_saved(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_rules_changed", False):
+        record_species_rescored(instance.pk)
+        refresh_species_scores(instance.pk)
+    _bump_ranking_on_commit(SPECIES_SCOPE)
+
+
+@receiver(post_delete, sender=Species, dispatch_uid="core_score_species_deleted")
+def species_deleted(sender, instance, **kwargs):
+    _bump_ranking_on_commit(SPECIES_SCOPE)
+
+
+# -------------------------
+# CONTADORES DA HOME
+# -------------------------
+COUNTER_FIELDS = {
+    Member: "members",
+    Catch: "catches",
+    Species: "species",
+    Supporter: "supporters",
+}
+
+
+def _count_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(COUNTER_FIELDS[sender], 1)
+        _bump_on_commit(STATS_SCOPE)
+
+
+def _count_deleted(sender, instance, **kwargs):
+    adjust_counter(COUNTER_FIELDS[sender], -1)
+    _bump_on_commit(STATS_SCOPE)
+
+
+for _model, _field in COUNTER_FIELDS.items():
+    post_save.connect(_count_created, sender=_model, dispatch_uid=f"core_counter_{_field}_created")
+    post_delete.connect(_count_deleted, sender=_model, dispatch_uid=f"core_counter_{_field}_deleted")
+
+
+# -------------------------
+# APOIADORES (faixa da home)
+# -------------------------
+@receiver(post_save, sender=Supporter, dispatch_uid="core_home_supporter_saved")
+@receiver(post_delete, sender=Supporter, dispatch_uid="core_home_supporter_deleted")
+def supporter_changed(sender, instance, **kwargs):
+    _bump_on_commit(SUPPORTERS_SCOPE)
+
+
+# -------------------------
+# VERSÕES DAS PÁGINAS (GET condicional)
+# -------------------------
+@receiver(post_save, sender=SpeciesPhoto, dispatch_uid="core_pages_species_photo_saved")
+@receiver(post_delete, sender=SpeciesPhoto, dispatch_uid="core_pages_species_photo_deleted")
+@receiver(post_save, sender=SpeciesBaitIdea, dispatch_uid="core_pages_species_bait_saved")
+@receiver(post_delete, sender=SpeciesBaitIdea, dispatch_uid="core_pages_species_bait_deleted")
+def species_content_changed(sender, instance, **kwargs):
+    _bump_on_commit(SPECIES_SCOPE)
+
+
+@receiver(post_save, sender=Spot, dispatch_uid="core_pages_spot_saved")
+@receiver(post_delete, sender=Spot, dispatch_uid="core_pages_spot_deleted")
+def spot_changed(sender, instance, **kwargs):
+    _bump_on_commit(WEATHER_SCOPE)
+
+
+# -------------------------
+# DERIVADOS DAS IMAGENS (thumbnails / WebP)
+# -------------------------
+# campo -> páginas que mostram a imagem (renderizam de novo com o srcset quando fica pronto)
+IMAGE_FIELDS = {
+    (Catch, "photo"): (FEED_SCOPE, CATCHES_SCOPE),
+    (SpeciesPhoto, "image"): (SPECIES_SCOPE,),
+    (Member, "photo"): (RANKING_SCOPE, FEED_SCOPE, MEMBERS_SCOPE),
+    (Supporter, "logo"): (SUPPORTERS_SCOPE,),
+}
+
+
+def _derivatives_ready(instance, scopes):
+    if isinstance(instance, SpeciesPhoto):
+        # a capa guardada na espécie passa a apontar para o derivado
+        species = Species.objects.filter(pk=instance.species_id).first()
+        if species is not None:
+            species.refresh_cover_url()
+    bump_version(*scopes)
+
+
+def _image_saved(sender, instance, **kwargs):
+    for (model, field), scopes in IMAGE_FIELDS.items():
+        if model is sender:
+            schedule_derivatives(getattr(instance, field), on_done=lambda scopes=scopes: _derivatives_ready(instance, scopes))
+
+
+for (_model, _field) in IMAGE_FIELDS:
+    post_save.connect(_image_saved, sender=_model, dispatch_uid=f"core_images_{_model._meta.model_name}_{_field}")
@@ -0,0 +1,52 @@
+# core/templatetags/images.py
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core.services.images import derivative_sources
+
+register = template.Library()
+
+
+def _srcset(sources) -> str:
+    return ", ".join(f"{url} {width}w" for url, width in sources)
+
+
+@register.simple_tag
+def responsive_img(field_file, sizes="100vw", eager=False, **attrs):
+    """
+    <picture> com WebP + fallback em srcset (core.services.images).
+    Uso: {% responsive_img c.photo sizes="(min-width: 1024px) 25vw, 50vw" class="..." alt="..." %}
+    - sizes: largura exibida (o navegador escolhe o arquivo);
+    - eager: imagem do topo da página (sem lazy, prioridade alta);
+    - demais argumentos viram atributos do <img> (data_zoom_src -> data-zoom-src).
+    """
+    if not field_file:
+        return ""
+
+    img_attrs = {key.replace("_", "-"): value for key, value in attrs.items()}
+    img_attrs.setdefault("alt", "")
+    if eager:
+        img_attrs["fetchpriority"] = "high"
+    else:
+        img_attrs["loading"] = "lazy"
+    img_attrs["decoding"] = "async"
+
+    sources = derivative_sources(field_file)
+    if sources is None:
+        # derivados ainda não gerados: original
+        return format_html("<img src=\"{}\"{}>", field_file.url, _attrs(img_attrs))
+
+    return format_html(
+        "<picture><source type=\"image/webp\" srcset=\"{}\" sizes=\"{}\">"
+        "<img src=\"{}\" srcset=\"{}\" sizes=\"{}\"{}></picture>",
+        _srcset(sources["webp"]),
+        sizes,
+        sources["src"],
+        _srcset(sources["fallback"]),
+        sizes,
+        _attrs(img_attrs),
+    )
+
+
+def _attrs(attrs: dict) -> str:
+    return format_html_join("", " {}=\"{}\"", attrs.items())
@@ -1,3 +1,146 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catches.models import Catch, Species
+from core.models import ScoreEvent
+from core.services.leaderboard import leaderboard_page, rebuild_leaderboard, top_ranking
+from core.services.ledger import create_checkpoint, state_as_of
+from core.services.pagination import encode_cursor, keyset_page
+from core.services.ranking import build_ranking_python
+from members.models import Member
+
+
+def make_member(name, username=None):
+    user = User.objects.create(username=username or f"u{User.objects.count()}")
+    return Member.objects.create(user=user, name=name)
+
+
+def make_catch(member, species, length_cm):
+    return Catch.objects.create(
+        member=member,
+        species=species,
+        length_cm=Decimal(length_cm),
+        weight_kg=Decimal("1.00"),
+        location="Teste",
+        caught_at=timezone.now(),
+    )
+
+
+class LeaderboardParityTests(TestCase):
+    def setUp(self):
+        self.species = Species.objects.create(name="Robalo", min_length_cm=Decimal("30"), points_per_cm=Decimal("1"))
+
+    def test_accented_ties_match_python(self):
+        # nomes acentuados empatados: a ordem do placar tem que ser a dos
+        # code points de name.lower() (a do build_ranking_python)
+        names = ["bruno", "Álvaro", "alberto", "Ana", "ana", "Édson", "eduardo", "zé", "Zeca"]
+        for name in names:
+            make_catch(make_member(name), self.species, "40.00")
+        for name in names:
+            make_member(name)  # sem pontos: empate em zero
+
+        rebuild_leaderboard()
+
+        expected = [(r["member"].pk, r["points"]) for r in build_ranking_python(top_n=None)]
+        got = [(r["member"].pk, r["points"]) for r in top_ranking(top_n=None)]
+        self.assertEqual(got, expected)
+        call_command("rebuild_leaderboard", "--check", stdout=StringIO())
+
+
+class LedgerCheckpointTests(TestCase):
+    def event(self, catch_id, points, occurred_at):
+        return ScoreEvent.objects.create(
+            kind=ScoreEvent.ADDED, catch_id=catch_id, member_id=1, points=Decimal(points), occurred_at=occurred_at
+        )
+
+    def test_events_out_of_id_order_are_replayed(self):
+        t0 = timezone.now() - timedelta(days=1)
+        late = self.event(1, "10", t0 + timedelta(hours=2))  # id menor, occurred_at maior
+        early = self.event(2, "20", t0)
+        self.assertLess(late.pk, early.pk)
+
+        checkpoint = create_checkpoint(t0 + timedelta(hours=1))
+        self.assertEqual(checkpoint.last_event_id, early.pk)
+        self.assertEqual(set(checkpoint.state), {"2"})
+
+        # commit atrasado: occurred_at antes do checkpoint, id depois dele
+        self.event(3, "30", t0 + timedelta(minutes=30))
+
+        state, _ = state_as_of(t0 + timedelta(hours=3))
+        self.assertEqual(state, {"1": [1, "10.0000"], "2": [1, "20.0000"], "3": [1, "30.0000"]})
+
+    def test_checkpoint_stays_out_of_the_margin(self):
+        now = timezone.now()
+        checkpoint = create_checkpoint(now)
+        self.assertLess(checkpoint.taken_at, now - timedelta(seconds=60))
+
+
+FORGED_CURSORS = [
+    "lixo",
+    "!!!",
+    "e30",  # {}
+    encode_cursor(["x", "y", "z", "w"]),
+    encode_cursor([None, "ana", 1, 1]),
+    encode_cursor(["NaN", "ana", 1, 1]),
+    encode_cursor(["10", ["ana"], {"id": 1}, True]),
+    encode_cursor([1, 2]),
+]
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class PaginationTests(TestCase):
+    def setUp(self):
+        species = Species.objects.create(name="Robalo", min_length_cm=Decimal("30"), points_per_cm=Decimal("1"))
+        # empates em pontos e em nome, cruzando a borda das páginas
+        for name, length in [("Ana", "40"), ("ana", "40"), ("Bruno", "40"), ("Álvaro", "50"), ("Carla", None),
+                             ("Carla", None), ("Davi", None)]:
+            member = make_member(name)
+            if length:
+                make_catch(member, species, length)
+        rebuild_leaderboard()
+
+    def walk(self, page, size):
+        rows, cursor, seen = [], None, 0
+        while True:
+            page_rows, cursor = page(cursor, size)
+            rows += page_rows
+            seen += 1
+            if cursor is None or seen > 20:
+                return rows
+
+    def test_leaderboard_pages_cover_ties_once(self):
+        expected = [(r["member"].pk, r["pos"]) for r in top_ranking(top_n=None)]
+        for size in (1, 2, 3):
+            rows = self.walk(lambda c, n: leaderboard_page(c, size=n), size)
+            self.assertEqual([(r["member"].pk, r["pos"]) for r in rows], expected)
+
+    def test_keyset_pages_cover_ties_once(self):
+        qs = Member.objects.order_by("name", "id")
+        expected = list(qs.values_list("pk", flat=True))
+        for size in (1, 2, 3):
+            rows = self.walk(lambda c, n: keyset_page(qs, c, size=n), size)
+            self.assertEqual([m.pk for m in rows], expected)
+
+    def test_forged_cursor_is_first_page(self):
+        first_rows, first_cursor = leaderboard_page(None, size=2)
+        qs = Member.objects.order_by("name", "id")
+        first_members, _ = keyset_page(qs, None, size=2)
+        for cursor in FORGED_CURSORS:
+            with self.subTest(cursor=cursor):
+                rows, next_cursor = leaderboard_page(cursor, size=2)
+                self.assertEqual([r["member"].pk for r in rows], [r["member"].pk for r in first_rows])
+                self.assertEqual(next_cursor, first_cursor)
+                self.assertEqual(keyset_page(qs, cursor, size=2)[0], first_members)
+
+    def test_forged_cursor_views_do_not_fail(self):
+        for url in (reverse("ranking"), reverse("group"), reverse("member_detail", args=[Member.objects.first().pk])):
+            for cursor in FORGED_CURSORS:
+                with self.subTest(url=url, cursor=cursor):
+                    self.assertEqual(self.client.get(url, {"cursor": cursor}).status_code, 200)
@@ -1,14 +1,41 @@
 # core/views.py
-from django.shortcuts import get_object_or_404, render
-from django.db.models import Count, Q
+from datetime import date
 
-from core.services.ranking import build_ranking
+from django.shortcuts import get_object_or_404, render
+from django.db.models import Count
+from django.utils.functional import SimpleLazyObject
+
+from core.services.counters import get_counters
+from core.services.conditional import CATCHES_SCOPE, MEMBERS_SCOPE, versioned_page
+from core.services.home_cache import (
+    FEED_SCOPE,
+    FRAGMENT_TIMEOUT,
+    PODIUM_SCOPE,
+    STATS_SCOPE,
+    SUPPORTERS_SCOPE,
+    home_versions,
+)
+from core.services.leaderboard import cursor_after, leaderboard_page, member_rank
+from core.services.ledger import end_of_day, end_of_month, ranking_as_of
+from core.services.pagination import keyset_page, next_page_url, wants_fragment
+from core.services.ranking_cache import SCOPE as RANKING_SCOPE, cached_top_ranking
 from members.models import Member
-from catches.models import Catch, Species
+from members.search import search_members
+from catches.models import Catch
 from supporters.models import Supporter
 
 
+RANKING_PAGE_SIZE = 10
+GROUP_PAGE_SIZE = 24
+CATCH_PAGE_SIZE = 12
+
+
+@versioned_page(FEED_SCOPE, STATS_SCOPE, PODIUM_SCOPE, SUPPORTERS_SCOPE)
 def home(request):
+    # cada seção é um {% cache %} no template: as consultas são preguiçosas
+    # e só rodam quando o fragmento não está no cache
+    versions = home_versions()
+
     # últimos 9 registros (feed)
     recent_catches = (
         Catch.objects
@@ -16,42 +43,36 @@ def home(request):
         .order_by("-caught_at")[:9]
     )
 
-    # stats do topo
-    stats = {
-        "members": Member.objects.count(),
-        "catches": Catch.objects.count(),
-        "species": Species.objects.count(),
-        "supporters": Supporter.objects.count(),
-    }
+    # stats do topo (contadores denormalizados: 1 SELECT pela PK)
+    stats = SimpleLazyObject(get_counters)
 
     # apoiadores para a faixa da home (limita para não ficar gigante)
     supporters = Supporter.objects.all()[:16]
 
-    # podium (top 3) usando seu ranking oficial
-    podium = build_ranking(top_n=3)
+    # podium (top 3) lido do placar materializado (com cache)
+    podium = SimpleLazyObject(lambda: cached_top_ranking(top_n=3))
 
     return render(request, "core/home.html", {
         "recent_catches": recent_catches,
         "stats": stats,
         "supporters": supporters,
         "podium": podium,
+        "versions": versions,
+        "fragment_timeout": FRAGMENT_TIMEOUT,
     })
 
 
+@versioned_page(MEMBERS_SCOPE, CATCHES_SCOPE)
 def group(request):
     q = (request.GET.get("q") or "").strip()
     selected_gender = (request.GET.get("gender") or "").strip()   # "F" | "M" | "O" | ""
     selected_age = (request.GET.get("age") or "").strip()         # "lt18" | "18_29" | etc.
 
-    qs = (
-        Member.objects
-        .annotate(catches_count=Count("catches"))
-        .order_by("name")
-    )
+    qs = Member.objects.order_by("name", "id")
 
-    # busca por nome ou apelido
+    # busca por nome ou apelido (sem acento, ordenada por relevância)
     if q:
-        qs = qs.filter(Q(name__icontains=q) | Q(nickname__icontains=q))
+        qs = search_members(qs, q)
 
     # filtro gênero
     if selected_gender in ("F", "M", "O"):
@@ -70,8 +91,20 @@ def group(request):
         elif selected_age == "50_mais":
             qs = qs.filter(age__gte=50)
 
+    # página por cursor em (name, id) (ou relevância da busca, name, id)
+    members, next_cursor = keyset_page(
+        qs.annotate(catches_count=Count("catches")),
+        request.GET.get("cursor"),
+        size=GROUP_PAGE_SIZE,
+    )
+    context = {"members": members, "next_url": next_page_url(request, next_cursor)}
+    if wants_fragment(request):
+        return render(request, "core/_load_more_page.html", {**context, "items_template": "core/_member_cards.html"})
+
+    filtered = q or selected_gender in ("F", "M", "O") or selected_age
     return render(request, "core/group.html", {
-        "members": qs,
+        **context,
+        "total": qs.count() if filtered else get_counters()["members"],
         "q": q,
         "selected_gender": selected_gender,
         "selected_age": selected_age,
@@ -80,32 +113,76 @@ def group(request):
 
 def member_detail(request, pk: int):
     member = get_object_or_404(Member, pk=pk)
-    catches = (
-        member.catches
-        .select_related("species")
-        .order_by("-caught_at")
+    catches, next_cursor = keyset_page(
+        member.catches.select_related("species").order_by("-caught_at", "-id"),
+        request.GET.get("cursor"),
+        size=CATCH_PAGE_SIZE,
     )
+    context = {"catches": catches, "next_url": next_page_url(request, next_cursor)}
+    if wants_fragment(request):
+        return render(request, "core/_load_more_page.html", {**context, "items_template": "core/_member_catch_cards.html"})
+
+    rank = member_rank(member.pk)
     return render(request, "core/member_detail.html", {
+        **context,
         "member": member,
-        "catches": catches
+        "catches_total": member.catches.count(),
+        "rank": rank,
+        "points": rank["points"] if rank else 0,
     })
 
 
+@versioned_page(SUPPORTERS_SCOPE)
 def supporters(request):
     supporters_qs = Supporter.objects.all()
     return render(request, "core/supporters.html", {"supporters": supporters_qs})
 
 
-def ranking(request):
-    ranking_list = build_ranking(top_n=10)
+def _parse_as_of(request):
+    """?data=AAAA-MM-DD (fim do dia) ou ?mes=AAAA-MM (fim do mês)."""
+    day = (request.GET.get("data") or "").strip()
+    month = (request.GET.get("mes") or "").strip()
+    try:
+        if day:
+            return end_of_day(date.fromisoformat(day))
+        if month:
+            year, mon = (int(p) for p in month.split("-", 1))
+            if 1 <= mon <= 12:
+                return end_of_month(year, mon)
+    except ValueError:
+        return None
+    return None
+
 
-    podium_1 = ranking_list[0] if len(ranking_list) > 0 else None
-    podium_2 = ranking_list[1] if len(ranking_list) > 1 else None
-    podium_3 = ranking_list[2] if len(ranking_list) > 2 else None
+@versioned_page(RANKING_SCOPE)
+def ranking(request):
+    cursor = (request.GET.get("cursor") or "").strip()
+    next_cursor = None
+
+    # ranking histórico (ledger) ou atual (placar + cache)
+    as_of = _parse_as_of(request)
+    if as_of:
+        ranking_list = ranking_as_of(as_of, top_n=RANKING_PAGE_SIZE)
+        podium = ranking_list[:3]
+    elif cursor:
+        # páginas seguintes da lista completa (keyset no placar)
+        ranking_list, next_cursor = leaderboard_page(cursor, size=RANKING_PAGE_SIZE)
+        podium = cached_top_ranking(top_n=3)
+    else:
+        ranking_list = cached_top_ranking(top_n=RANKING_PAGE_SIZE)
+        podium = ranking_list[:3]
+        if len(ranking_list) == RANKING_PAGE_SIZE:
+            next_cursor = cursor_after(ranking_list[-1])
+
+    podium_1 = podium[0] if len(podium) > 0 else None
+    podium_2 = podium[1] if len(podium) > 1 else None
+    podium_3 = podium[2] if len(podium) > 2 else None
 
     return render(request, "core/ranking.html", {
         "podium_1": podium_1,
         "podium_2": podium_2,
         "podium_3": podium_3,
         "ranking_list": ranking_list,
+        "next_cursor": next_cursor,
+        "as_of": as_of,
     })
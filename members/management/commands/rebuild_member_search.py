@@ -0,0 +1,15 @@
+# members/management/commands/rebuild_member_search.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from members.search import has_fts, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recalcula o texto de busca dos membros e repopula o índice FTS5 (SQLite)."
+
+    def handle(self, *args, **opts):
+        total = rebuild_search_index()
+        where = "search_text + FTS5" if has_fts() else "search_text"
+        self.stdout.write(self.style.SUCCESS(f"{total} membro(s) reindexado(s) ({where})."))
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+from members.search import FTS_TABLE, build_search_text
+
+
+def fill_search_text(apps, schema_editor):
+    Member = apps.get_model("members", "Member")
+    members = list(Member.objects.only("id", "name", "nickname"))
+    for m in members:
+        m.search_text = build_search_text(m.name, m.nickname)
+    Member.objects.bulk_update(members, ["search_text"], batch_size=1000)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS members_search_trgm_idx "
+            "ON members_member USING gin (search_text gin_trgm_ops)"
+        )
+
+    elif vendor == "sqlite":
+        from django.db import DatabaseError
+
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(search_text, tokenize='trigram')"
+            )
+        except DatabaseError:
+            # SQLite sem FTS5/trigram (< 3.34): a busca usa LIKE em search_text
+            return
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_text) SELECT id, search_text FROM members_member"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS members_search_trgm_idx")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_alter_member_options_member_gender_alter_member_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .search import build_search_text
+
 
 class Member(models.Model):
     GENDER_CHOICES = [
@@ -25,5 +27,21 @@ class Member(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # "nome apelido" sem acento/minúsculo (busca do grupo, ver members/search.py)
+    search_text = models.CharField(max_length=200, blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            # lista do grupo, paginada por cursor em (name, id)
+            models.Index(fields=["name", "id"], name="member_name_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_text = build_search_text(self.name, self.nickname)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"name", "nickname"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
@@ -0,0 +1,150 @@
+# members/search.py
+"""
+Busca de membros (nome/apelido) da página do grupo.
+
+Member.search_text guarda "nome apelido" sem acento e em minúsculas,
+então "joao" acha "João" em qualquer banco. O índice depende do banco:
+
+- PostgreSQL: índice GIN pg_trgm em search_text (LIKE '%termo%' usa o
+  índice) e ordenação por TrigramWordSimilarity.
+- SQLite: tabela FTS5 (tokenizer trigram) members_member_fts, mantida
+  pelos signals de Member; ordenação pelo rank (bm25) do FTS5.
+
+Termos com menos de 3 letras (ou SQLite sem FTS5/trigram) caem no
+LIKE simples em search_text.
+"""
+from __future__ import annotations
+
+import unicodedata
+
+from django.db import connection
+from django.db.models import Case, FloatField, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "members_member_fts"
+MIN_TRIGRAM = 3
+
+_fts_available = {}
+
+
+def normalize(text: str | None) -> str:
+    """'  João  da Silva ' -> 'joao da silva'."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def build_search_text(name: str | None, nickname: str | None) -> str:
+    return normalize(f"{name or ''} {nickname or ''}")
+
+
+# -------------------------
+# ÍNDICE FTS5 (SQLite)
+# -------------------------
+def has_fts() -> bool:
+    if connection.vendor != "sqlite":
+        return False
+    name = str(connection.settings_dict["NAME"])
+    if name not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available[name] = cursor.fetchone() is not None
+    return _fts_available[name]
+
+
+def index_member(member_id: int, search_text: str) -> None:
+    if not has_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [member_id])
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, search_text) VALUES (%s, %s)", [member_id, search_text])
+
+
+def unindex_member(member_id: int) -> None:
+    if not has_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [member_id])
+
+
+def rebuild_search_index() -> int:
+    """Recalcula search_text de todos e repopula o FTS5. Retorna nº de membros."""
+    from members.models import Member
+
+    members = list(Member.objects.only("id", "name", "nickname", "search_text"))
+    changed = []
+    for m in members:
+        text = build_search_text(m.name, m.nickname)
+        if m.search_text != text:
+            m.search_text = text
+            changed.append(m)
+    Member.objects.bulk_update(changed, ["search_text"], batch_size=1000)
+
+    if has_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, search_text) VALUES (%s, %s)",
+                [(m.id, m.search_text) for m in members],
+            )
+    return len(members)
+
+
+# -------------------------
+# BUSCA
+# -------------------------
+def _fts_query(terms: list[str]) -> str:
+    # cada termo entre aspas = substring (trigram); vários termos = AND
+    return " ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+
+
+def _search_fts(qs, terms):
+    # sem LIMIT: o MATCH vira subquery e os outros filtros (gênero, idade,
+    # cursor) e o count() do total valem sobre todos os resultados
+    query = _fts_query(terms)
+    member_id = f'"{qs.model._meta.db_table}"."id"'
+    relevance = RawSQL(
+        f"SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {member_id}",
+        [query],
+        output_field=FloatField(),
+    )
+    return (
+        qs.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]))
+        .annotate(relevance=relevance)
+        .order_by("relevance", "name", "id")
+    )
+
+
+def _search_trigram(qs, terms):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    for term in terms:
+        qs = qs.filter(search_text__contains=term)
+    return (
+        qs.annotate(relevance=TrigramWordSimilarity(" ".join(terms), "search_text"))
+        .order_by("-relevance", "name", "id")
+    )
+
+
+def _search_like(qs, terms):
+    for term in terms:
+        qs = qs.filter(search_text__contains=term)
+    relevance = Case(
+        When(search_text__startswith=terms[0], then=Value(0)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    return qs.annotate(relevance=relevance).order_by("relevance", "name", "id")
+
+
+def search_members(qs, q: str):
+    """Filtra `qs` (Member) pela busca `q` e ordena por relevância."""
+    terms = normalize(q).split()
+    if not terms:
+        return qs
+
+    if connection.vendor == "postgresql":
+        return _search_trigram(qs, terms)
+    if all(len(t) >= MIN_TRIGRAM for t in terms) and has_fts():
+        return _search_fts(qs, terms)
+    return _search_like(qs, terms)
@@ -0,0 +1,19 @@
+# members/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Member
+from .search import index_member, unindex_member
+
+
+# -------------------------
+# ÍNDICE DE BUSCA (FTS5 no SQLite)
+# -------------------------
+@receiver(post_save, sender=Member, dispatch_uid="members_search_member_saved")
+def member_saved(sender, instance, **kwargs):
+    index_member(instance.pk, instance.search_text)
+
+
+@receiver(post_delete, sender=Member, dispatch_uid="members_search_member_deleted")
+def member_deleted(sender, instance, **kwargs):
+    unindex_member(instance.pk)
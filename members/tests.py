@@ -1,3 +1,40 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from members.models import Member
+from members.search import has_fts, rebuild_search_index, search_members
+
+# o FTS antigo parava em 500 resultados
+MATCHES = 520
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class MemberSearchFtsTests(TestCase):
+    def setUp(self):
+        if not has_fts():
+            self.skipTest("SQLite sem FTS5/trigram")
+        users = User.objects.bulk_create([User(username=f"u{i}") for i in range(MATCHES + 5)])
+        Member.objects.bulk_create(
+            [
+                Member(user=u, name=f"Pescador {i:03d}", gender="F" if i >= MATCHES - 20 else "M")
+                for i, u in enumerate(users[:MATCHES])
+            ]
+            + [Member(user=u, name="Outro Nome") for u in users[MATCHES:]]
+        )
+        rebuild_search_index()
+
+    def test_returns_matches_beyond_old_cap(self):
+        results = search_members(Member.objects.all(), "pescador")
+        self.assertEqual(results.count(), MATCHES)
+        # os filtros valem sobre todos os resultados, não só os primeiros 500
+        women = results.filter(gender="F")
+        self.assertEqual(women.count(), 20)
+        self.assertIn("Pescador 519", [m.name for m in women])
+
+    def test_query_syntax_in_input_does_not_raise(self):
+        for q in ['"', '"pescador', "pescador OR outro", "NEAR(pescador", "***", "pesc*", "(((", "name:pescador",
+                  "pescador AND", "NOT pescador", "'; DROP TABLE"]:
+            with self.subTest(q=q):
+                list(search_members(Member.objects.all(), q))
+                self.assertEqual(self.client.get(reverse("group"), {"q": q}).status_code, 200)
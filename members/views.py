@@ -5,9 +5,14 @@ from django.shortcuts import redirect, render
 from django.views import View
 from django.views.generic import UpdateView
 
+from core.services.leaderboard import member_rank
+from core.services.pagination import keyset_page, next_page_url, wants_fragment
+
 from .forms import SignupForm, MemberUpdateForm
 from .services import get_or_create_member_for_user
 
+CATCH_PAGE_SIZE = 12
+
 
 class SignupView(View):
     """
@@ -37,11 +42,30 @@ class MyProfileView(LoginRequiredMixin, View):
     """
     def get(self, request):
         member = get_or_create_member_for_user(request.user)
-        catches = member.catches.select_related("species").order_by("-caught_at")
+        catches, next_cursor = keyset_page(
+            member.catches.select_related("species").order_by("-caught_at", "-id"),
+            request.GET.get("cursor"),
+            size=CATCH_PAGE_SIZE,
+        )
+        context = {"catches": catches, "next_url": next_page_url(request, next_cursor)}
+        if wants_fragment(request):
+            return render(
+                request,
+                "core/_load_more_page.html",
+                {**context, "items_template": "members/_catch_cards.html"},
+            )
+
+        rank = member_rank(member.pk)
         return render(
             request,
             "members/my_profile.html",
-            {"member": member, "catches": catches},
+            {
+                **context,
+                "member": member,
+                "catches_total": member.catches.count(),
+                "rank": rank,
+                "total_points": rank["points"] if rank else 0,
+            },
         )
 
 
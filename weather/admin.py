@@ -8,8 +8,10 @@ from .models import (
     Spot,
     ForecastHour,
     StormglassRequestLog,
+    StormglassQuota,
 )
 
+from .services.quota import QuotaExceeded
 from .services.update_spot_forecast import update_spot_forecast
 
 class ForecastHourInline(admin.TabularInline):
@@ -46,10 +48,13 @@ class SpotAdmin(admin.ModelAdmin):
         "latitude",
         "longitude",
         "last_forecast_update",
+        "priority",
+        "view_count",
         "update_button",
     )
+    list_editable = ("priority",)
 
-    readonly_fields = ("last_forecast_update",)
+    readonly_fields = ("last_forecast_update", "view_count")
     inlines = [ForecastHourInline]
 
     # -------------------------
@@ -83,12 +88,15 @@ class SpotAdmin(admin.ModelAdmin):
         spot = Spot.objects.get(id=spot_id)
 
         try:
-            created = update_spot_forecast(spot)
+            created, updated, spots = update_spot_forecast(spot)
+            shared = f", {spots} spots da mesma célula" if spots > 1 else ""
             self.message_user(
                 request,
-                f"Previsão atualizada com sucesso ({created} horas novas).",
+                f"Previsão atualizada com sucesso ({created} horas novas, {updated} atualizadas{shared}).",
                 messages.SUCCESS,
             )
+        except QuotaExceeded as e:
+            self.message_user(request, str(e), messages.WARNING)
         except Exception as e:
             self.message_user(
                 request,
@@ -138,3 +146,13 @@ class StormglassRequestLogAdmin(admin.ModelAdmin):
     search_fields = ("spot__name",)
     ordering = ("-created_at",)
     list_select_related = ("spot",)
+
+
+# =========================
+# COTA DIÁRIA
+# =========================
+
+@admin.register(StormglassQuota)
+class StormglassQuotaAdmin(admin.ModelAdmin):
+    list_display = ("day", "used")
+    ordering = ("-day",)
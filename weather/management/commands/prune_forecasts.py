@@ -0,0 +1,25 @@
+# weather/management/commands/prune_forecasts.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from weather.services.retention import BATCH_SIZE, COMPACT_STEP_HOURS, HOURLY_DAYS, RETENTION_DAYS, prune_forecasts
+
+
+class Command(BaseCommand):
+    help = (
+        "Compacta e apaga horas passadas do ForecastHour "
+        f"(horárias por {HOURLY_DAYS} dia(s), 1 a cada {COMPACT_STEP_HOURS}h até {RETENTION_DAYS} dias). "
+        "Para rodar diariamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="Linhas apagadas por transação.")
+        parser.add_argument("--dry-run", action="store_true", help="Só conta o que seria apagado.")
+
+    def handle(self, *args, **opts):
+        expired, compacted = prune_forecasts(batch_size=opts["batch"], dry_run=opts["dry_run"])
+        verb = "seriam apagadas" if opts["dry_run"] else "apagadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"{expired} hora(s) antigas e {compacted} hora(s) compactadas {verb}."
+        ))
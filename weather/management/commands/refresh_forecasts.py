@@ -0,0 +1,79 @@
+# weather/management/commands/refresh_forecasts.py
+from __future__ import annotations
+
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from weather.services.quota import DAILY_QUOTA, used_today
+from weather.services.refresh_scheduler import WORKERS, plan_refresh, refresh_cells
+
+
+def _names(spots):
+    return ", ".join(s.name for s in spots)
+
+
+class Command(BaseCommand):
+    help = (
+        "Atualiza as previsões dos spots ativos dentro da cota diária do Stormglass "
+        "(mais desatualizados/populares primeiro). Roda em loop; use --once para uma rodada (ex: cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Uma rodada só e sai.")
+        parser.add_argument("--sleep", type=float, default=600.0, help="Segundos entre as rodadas.")
+        parser.add_argument("--workers", type=int, default=WORKERS, help="Chamadas simultâneas à API.")
+        parser.add_argument("--limit", type=int, default=None, help="No máximo N chamadas (células) por rodada.")
+        parser.add_argument(
+            "--no-pace",
+            action="store_true",
+            help="Gasta toda a cota restante do dia agora (sem distribuir ao longo do dia).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Só mostra quem seria atualizado.")
+
+    def handle(self, *args, **opts):
+        self._stop = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        while not self._stop:
+            close_old_connections()
+            plan = plan_refresh(pace=not opts["no_pace"], limit=opts["limit"])
+
+            if opts["dry_run"]:
+                self.stdout.write(f"Cota: {used_today()}/{DAILY_QUOTA} usada hoje.")
+                for c in plan:
+                    flag = " (previsão acabando)" if c.short_horizon else ""
+                    self.stdout.write(f"  [{c.cell}] {_names(c.spots)}: pontuação {c.score:.1f}{flag}")
+                if not plan:
+                    self.stdout.write("Nada a atualizar agora.")
+                break
+
+            if plan:
+                results = refresh_cells(plan, workers=opts["workers"])
+                for r in results:
+                    if r.error:
+                        self.stdout.write(self.style.ERROR(f"[{r.cell}] {_names(r.spots)}: {r.error}"))
+                    else:
+                        self.stdout.write(
+                            f"[{r.cell}] {_names(r.spots)}: {r.created} horas novas, {r.updated} atualizadas."
+                        )
+                self.stdout.write(f"Cota: {used_today()}/{DAILY_QUOTA} usada hoje.")
+
+            if opts["once"]:
+                break
+            self._wait(opts["sleep"])
+
+        self.stdout.write(self.style.SUCCESS("Agendador encerrado."))
+
+    def _wait(self, seconds):
+        # em pedaços: SIGTERM não espera o sleep inteiro
+        deadline = time.monotonic() + seconds
+        while not self._stop and time.monotonic() < deadline:
+            time.sleep(max(0.0, min(1.0, deadline - time.monotonic())))
+
+    def _request_stop(self, signum, frame):
+        # termina a rodada atual e sai
+        self._stop = True
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0003_alter_forecasthour_options_alter_spot_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StormglassQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='Dia (UTC)')),
+                ('used', models.PositiveIntegerField(default=0, verbose_name='Requests usados')),
+            ],
+            options={
+                'verbose_name': 'Cota Stormglass',
+                'verbose_name_plural': 'Cotas Stormglass',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddField(
+            model_name='spot',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Peso na atualização automática da previsão (0 = nunca atualiza sozinho).', verbose_name='Prioridade'),
+        ),
+        migrations.AddField(
+            model_name='spot',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Visualizações'),
+        ),
+    ]
@@ -15,6 +15,14 @@ class Spot(models.Model):
     last_forecast_update = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # popularidade: o agendador (refresh_forecasts) gasta a cota primeiro nos spots mais vistos/prioritários
+    priority = models.PositiveSmallIntegerField(
+        "Prioridade",
+        default=1,
+        help_text="Peso na atualização automática da previsão (0 = nunca atualiza sozinho).",
+    )
+    view_count = models.PositiveIntegerField("Visualizações", default=0, editable=False)
+
     class Meta:
         verbose_name = "Spot de pesca"
         verbose_name_plural = "Spots de pesca"
@@ -34,6 +42,21 @@ class Spot(models.Model):
     def __str__(self):
         return self.name
 
+class ForecastHourQuerySet(models.QuerySet):
+    def window(self, spot, start, end):
+        return self.filter(spot=spot, time__gte=start, time__lte=end).order_by("time")
+
+    def nearest(self, spot, when):
+        """
+        Hora mais próxima de `when`: uma antes e uma depois, cada uma
+        pelo índice (spot, time). Custo fixo, não importa o tamanho do histórico.
+        """
+        before = self.filter(spot=spot, time__lte=when).order_by("-time").first()
+        after = self.filter(spot=spot, time__gt=when).order_by("time").first()
+        if before is None or after is None:
+            return before or after
+        return before if when - before.time <= after.time - when else after
+
 class ForecastHour(models.Model):
     """
     Previsão HORÁRIA normalizada (1 linha = 1 hora)
@@ -71,6 +94,8 @@ class ForecastHour(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ForecastHourQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Previsão horária"
         verbose_name_plural = "Previsões horárias"
@@ -108,3 +133,20 @@ class StormglassRequestLog(models.Model):
 
     def __str__(self):
         return f"{self.created_at:%d/%m %H:%M} • {self.status_code}"
+
+class StormglassQuota(models.Model):
+    """
+    Contador de chamadas por dia (UTC, quando a cota do Stormglass zera).
+    A reserva é um UPDATE condicional (used < cota): dois processos
+    (admin e agendador) nunca passam da cota juntos.
+    """
+    day = models.DateField("Dia (UTC)", unique=True)
+    used = models.PositiveIntegerField("Requests usados", default=0)
+
+    class Meta:
+        verbose_name = "Cota Stormglass"
+        verbose_name_plural = "Cotas Stormglass"
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.day:%d/%m} • {self.used}"
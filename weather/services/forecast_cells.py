@@ -0,0 +1,71 @@
+# weather/services/forecast_cells.py
+"""
+Células de previsão: spots a poucas centenas de metros um do outro caem
+no mesmo ponto de grade dos modelos (previsões idênticas). O mundo é
+dividido numa grade de STORMGLASS_CELL_DEGREES graus; cada célula é
+buscada uma vez só e as horas vão para todos os spots dela. Mais spots
+atualizados com a mesma cota.
+
+O ponto pedido à API é o do próprio spot quando ele está sozinho na
+célula; com vários, o centroide deles, arredondado (mesma URL, e mesma
+fixture gravada, enquanto os spots da célula não mudam). Nunca o centro
+da grade, que pode cair longe da praia.
+"""
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from weather.models import Spot
+
+# 0.02° ≈ 2,2 km de latitude: bem abaixo da resolução dos modelos de onda/vento
+CELL_DEGREES = getattr(settings, "STORMGLASS_CELL_DEGREES", 0.02)
+
+
+@dataclass(frozen=True)
+class Cell:
+    row: int
+    col: int
+
+    def __str__(self):
+        # canto sudoeste da célula (só para identificar em logs/saída)
+        return f"{self.row * CELL_DEGREES:.4f},{self.col * CELL_DEGREES:.4f}"
+
+
+def cell_for(latitude, longitude) -> Cell:
+    return Cell(
+        row=math.floor(float(latitude) / CELL_DEGREES),
+        col=math.floor(float(longitude) / CELL_DEGREES),
+    )
+
+
+def group_by_cell(spots) -> dict[Cell, list]:
+    cells = defaultdict(list)
+    for spot in spots:
+        cells[cell_for(spot.latitude, spot.longitude)].append(spot)
+    return dict(cells)
+
+
+def fetch_point(spots) -> tuple:
+    """(lat, lng) a pedir para a célula desses spots."""
+    if len(spots) == 1:
+        return spots[0].latitude, spots[0].longitude
+    lat = sum(float(s.latitude) for s in spots) / len(spots)
+    lng = sum(float(s.longitude) for s in spots) / len(spots)
+    return round(lat, 4), round(lng, 4)
+
+
+def spots_in_cell(cell: Cell, queryset=None) -> list:
+    """Spots ativos da célula (caixa no banco, conferida pela mesma conta do cell_for)."""
+    queryset = queryset if queryset is not None else Spot.objects.filter(is_active=True)
+    margin = CELL_DEGREES / 10
+    candidates = queryset.filter(
+        latitude__gte=cell.row * CELL_DEGREES - margin,
+        latitude__lte=(cell.row + 1) * CELL_DEGREES + margin,
+        longitude__gte=cell.col * CELL_DEGREES - margin,
+        longitude__lte=(cell.col + 1) * CELL_DEGREES + margin,
+    )
+    return [s for s in candidates if cell_for(s.latitude, s.longitude) == cell]
@@ -0,0 +1,63 @@
+# weather/services/quota.py
+"""
+Cota diária do Stormglass (STORMGLASS_DAILY_QUOTA, padrão 10/dia, zera à
+meia-noite UTC).
+
+Toda chamada passa antes por reserve_request(): se a cota do dia já foi
+usada, nada sai para a API (QuotaExceeded). A resposta da API traz o
+contador real (meta.requestCount), que corrige o nosso se a mesma chave
+for usada em outro lugar.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from weather.models import StormglassQuota
+
+DAILY_QUOTA = getattr(settings, "STORMGLASS_DAILY_QUOTA", 10)
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+def quota_day():
+    # timezone.now() já é UTC (USE_TZ)
+    return timezone.now().date()
+
+
+def used_today() -> int:
+    return StormglassQuota.objects.filter(day=quota_day()).values_list("used", flat=True).first() or 0
+
+
+def remaining_today() -> int:
+    return max(0, DAILY_QUOTA - used_today())
+
+
+def reserve_request() -> int:
+    """Reserva uma chamada de hoje. Retorna quantas já foram usadas (com esta)."""
+    day = quota_day()
+    StormglassQuota.objects.get_or_create(day=day)
+    granted = (
+        StormglassQuota.objects
+        .filter(day=day, used__lt=DAILY_QUOTA)
+        .update(used=F("used") + 1)
+    )
+    if not granted:
+        raise QuotaExceeded(f"Cota diária do Stormglass esgotada ({DAILY_QUOTA} requests/dia).")
+    return used_today()
+
+
+def sync_used(request_count) -> None:
+    """Ajusta pelo contador que a API devolveu (só sobe, nunca desconta)."""
+    if not request_count:
+        return
+    StormglassQuota.objects.filter(day=quota_day()).update(used=Greatest(F("used"), int(request_count)))
+
+
+def mark_exhausted() -> None:
+    """A API respondeu 402/429: não adianta tentar de novo hoje."""
+    sync_used(DAILY_QUOTA)
@@ -0,0 +1,172 @@
+# weather/services/refresh_scheduler.py
+"""
+Atualização automática das previsões, dentro da cota diária do Stormglass.
+
+A unidade é a célula de previsão (forecast_cells): uma chamada atualiza
+todos os spots ativos da célula.
+
+Quem atualiza primeiro:
+1) células com algum spot cuja previsão gravada acaba em menos de
+   STORMGLASS_NEAR_TERM_HOURS (cada chamada traz HORIZON_DAYS dias, então
+   isso só acontece com spot novo ou muito tempo sem cota);
+2) depois, maior pontuação = soma, nos spots da célula, de
+   horas desde a última atualização × peso (as horas próximas são as que
+   mudam de uma rodada para outra: é por elas que vale buscar de novo),
+   com peso = prioridade × (1 + log10(1 + visualizações)).
+Spot com prioridade 0 ou atualizado há menos de STORMGLASS_MIN_REFRESH_HOURS
+não pesa (mas recebe a previsão se a célula for buscada por outro).
+
+Quanto gastar agora: com ritmo (padrão), a cota é liberada ao longo do dia
+(1 chamada a cada 24h/cota, acumulando o que não foi usado), para sobrar
+atualização para a tarde. Sem ritmo, gasta o que resta de uma vez.
+
+As chamadas HTTP de células diferentes rodam em paralelo; reserva de cota
+e gravação ficam na thread principal (uma conexão de banco só).
+"""
+from __future__ import annotations
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import Optional
+
+import requests
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from weather.models import ForecastHour, Spot
+from weather.services.forecast_cells import Cell, group_by_cell
+from weather.services.quota import DAILY_QUOTA, QuotaExceeded, reserve_request, used_today
+from weather.services.update_spot_forecast import fetch_cell_payload, log_failed_request, save_cell_forecast
+
+logger = logging.getLogger(__name__)
+
+MIN_REFRESH_HOURS = getattr(settings, "STORMGLASS_MIN_REFRESH_HOURS", 3)
+WORKERS = getattr(settings, "STORMGLASS_WORKERS", 4)
+NEAR_TERM_HOURS = getattr(settings, "STORMGLASS_NEAR_TERM_HOURS", 24)
+
+# sem previsão nenhuma: conta como "muito velho"
+NEVER_UPDATED_HOURS = 24 * 30
+
+
+@dataclass
+class Candidate:
+    cell: Cell
+    spots: list  # todos os spots ativos da célula (recebem a previsão)
+    score: float
+    short_horizon: bool
+
+
+@dataclass
+class RefreshResult:
+    cell: Cell
+    spots: list
+    created: int = 0
+    updated: int = 0
+    error: Optional[str] = None
+
+
+def _day_start(now: datetime) -> datetime:
+    return datetime.combine(now.astimezone(dt_timezone.utc).date(), time.min, tzinfo=dt_timezone.utc)
+
+
+def spot_weight(spot: Spot) -> float:
+    return spot.priority * (1 + math.log10(1 + spot.view_count))
+
+
+def rank_cells(now: Optional[datetime] = None) -> list[Candidate]:
+    """Células com algum spot elegível, da mais urgente para a menos."""
+    now = now or timezone.now()
+    recent = now - timedelta(hours=MIN_REFRESH_HOURS)
+    near_term = now + timedelta(hours=NEAR_TERM_HOURS)
+
+    spots = Spot.objects.filter(is_active=True).only(
+        "id", "name", "slug", "latitude", "longitude", "priority", "view_count", "last_forecast_update"
+    )
+    # última hora prevista de cada spot (índice (spot, time))
+    horizon = dict(
+        ForecastHour.objects
+        .filter(spot__is_active=True)
+        .order_by()
+        .values_list("spot")
+        .annotate(end=Max("time"))
+    )
+
+    candidates = []
+    for cell, cell_spots in group_by_cell(spots).items():
+        score = 0.0
+        short_horizon = False
+        for spot in cell_spots:
+            last = spot.last_forecast_update
+            if spot.priority <= 0 or (last is not None and last > recent):
+                continue
+            hours = NEVER_UPDATED_HOURS if last is None else (now - last).total_seconds() / 3600
+            score += hours * spot_weight(spot)
+            end = horizon.get(spot.pk)
+            short_horizon = short_horizon or end is None or end < near_term
+        if score > 0:
+            candidates.append(Candidate(cell, cell_spots, score, short_horizon))
+
+    candidates.sort(key=lambda c: (not c.short_horizon, -c.score))
+    return candidates
+
+
+def paced_budget(now: Optional[datetime] = None, pace: bool = True) -> int:
+    """Quantas chamadas podem sair agora."""
+    now = now or timezone.now()
+    used = used_today()
+    remaining = max(0, DAILY_QUOTA - used)
+    if not pace:
+        return remaining
+
+    elapsed = (now - _day_start(now)).total_seconds()
+    slot = 86400 / max(DAILY_QUOTA, 1)
+    released = min(DAILY_QUOTA, math.floor(elapsed / slot) + 1)
+    return min(remaining, max(0, released - used))
+
+
+def plan_refresh(now: Optional[datetime] = None, pace: bool = True, limit: Optional[int] = None) -> list[Candidate]:
+    budget = paced_budget(now, pace)
+    if limit is not None:
+        budget = min(budget, limit)
+    if budget <= 0:
+        return []
+    return rank_cells(now)[:budget]
+
+
+def refresh_cells(candidates, workers: int = WORKERS) -> list[RefreshResult]:
+    """
+    Reserva a cota de cada célula (para no primeiro QuotaExceeded), busca em
+    paralelo e grava conforme as respostas chegam. Erro numa célula (HTTP,
+    resposta inválida, gravação) fica no log e no resultado dela.
+    """
+    reserved = []
+    for candidate in candidates:
+        try:
+            reserved.append((candidate, reserve_request()))
+        except QuotaExceeded:
+            break
+
+    results = []
+    if not reserved:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(reserved)))) as pool:
+        futures = {pool.submit(fetch_cell_payload, c.spots): (c, used) for c, used in reserved}
+        for future in as_completed(futures):
+            candidate, used = futures[future]
+            try:
+                payload = future.result()
+                created, updated = save_cell_forecast(candidate.spots, payload, used)
+            except Exception as exc:  # uma célula com problema não derruba as outras
+                if not isinstance(exc, requests.RequestException):
+                    logger.exception("Falha ao atualizar a célula %s", candidate.cell)
+                log_failed_request(candidate.spots[0], exc, used)
+                results.append(RefreshResult(candidate.cell, candidate.spots, error=str(exc)))
+                continue
+            results.append(RefreshResult(candidate.cell, candidate.spots, created, updated))
+
+    return results
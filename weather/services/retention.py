@@ -0,0 +1,80 @@
+# weather/services/retention.py
+"""
+Retenção do ForecastHour (horas que já passaram):
+
+- até FORECAST_HOURLY_DAYS atrás: fica tudo (hora a hora);
+- até FORECAST_RETENTION_DAYS atrás: compacta, fica só 1 hora a cada
+  FORECAST_COMPACT_STEP_HOURS (00h, 03h, 06h... UTC);
+- antes disso: apaga.
+
+Os cortes são contados da hora UTC cheia de `now` (a hora que cai
+exatamente no corte fica na faixa mais nova): rodar às 14h05 ou às 14h55
+apaga as mesmas linhas.
+
+Sempre spot a spot (usa o índice (spot, time)) e em lotes de batch_size
+linhas, cada lote na sua transação: nada de DELETE gigante travando a
+tabela enquanto o agendador grava.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.db.models.functions import ExtractHour
+from django.utils import timezone
+
+from weather.models import ForecastHour, Spot
+
+HOURLY_DAYS = getattr(settings, "FORECAST_HOURLY_DAYS", 2)
+COMPACT_STEP_HOURS = getattr(settings, "FORECAST_COMPACT_STEP_HOURS", 3)
+RETENTION_DAYS = getattr(settings, "FORECAST_RETENTION_DAYS", 30)
+BATCH_SIZE = 1000
+
+
+def _delete_in_batches(queryset, batch_size: int) -> int:
+    total = 0
+    while True:
+        ids = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        ForecastHour.objects.filter(pk__in=ids).delete()
+        total += len(ids)
+
+
+def expired_hours(spot_id, now: datetime):
+    return ForecastHour.objects.filter(spot_id=spot_id, time__lt=now - timedelta(days=RETENTION_DAYS))
+
+
+def compactable_hours(spot_id, now: datetime):
+    keep = range(0, 24, max(COMPACT_STEP_HOURS, 1))
+    return (
+        ForecastHour.objects
+        .filter(
+            spot_id=spot_id,
+            time__gte=now - timedelta(days=RETENTION_DAYS),
+            time__lt=now - timedelta(days=HOURLY_DAYS),
+        )
+        .annotate(utc_hour=ExtractHour("time", tzinfo=dt_timezone.utc))
+        .exclude(utc_hour__in=keep)
+    )
+
+
+def _hour_floor(now: datetime) -> datetime:
+    return now.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def prune_forecasts(now: Optional[datetime] = None, batch_size: int = BATCH_SIZE, dry_run: bool = False):
+    """Retorna (apagadas por idade, apagadas na compactação)."""
+    now = _hour_floor(now or timezone.now())
+    expired = compacted = 0
+
+    for spot_id in Spot.objects.values_list("pk", flat=True):
+        if dry_run:
+            expired += expired_hours(spot_id, now).count()
+            compacted += compactable_hours(spot_id, now).count()
+            continue
+        expired += _delete_in_batches(expired_hours(spot_id, now), batch_size)
+        compacted += _delete_in_batches(compactable_hours(spot_id, now), batch_size)
+
+    return expired, compacted
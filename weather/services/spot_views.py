@@ -0,0 +1,60 @@
+# weather/services/spot_views.py
+"""
+Visualizações dos spots (popularidade para o agendador da previsão).
+
+Contar com um UPDATE por página vista transformaria a página do spot
+(leitura, quase sempre 304) em escrita. Aqui as visitas ficam num
+contador em memória do processo e vão para Spot.view_count no máximo
+uma vez a cada SPOT_VIEWS_FLUSH_SECONDS, um UPDATE por grupo de spots
+com a mesma contagem. Processo que morre perde só o último intervalo.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import F
+
+from weather.models import Spot
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SECONDS = getattr(settings, "SPOT_VIEWS_FLUSH_SECONDS", 60)
+
+_pending: Counter = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_view(slug: str) -> None:
+    with _lock:
+        _pending[slug] += 1
+        due = time.monotonic() - _last_flush >= FLUSH_SECONDS
+    if due:
+        flush_views()
+
+
+def flush_views() -> int:
+    """Grava as visitas acumuladas. Retorna quantas foram gravadas."""
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    by_count = defaultdict(list)
+    for slug, count in pending.items():
+        by_count[count].append(slug)
+    try:
+        for count, slugs in by_count.items():
+            # UPDATE direto: sem signal, não invalida as páginas
+            Spot.objects.filter(slug__in=slugs).update(view_count=F("view_count") + count)
+    except Exception:  # contador de popularidade não pode derrubar a página
+        logger.exception("Falha ao gravar visualizações dos spots")
+        return 0
+    return sum(pending.values())
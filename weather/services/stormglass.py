@@ -1,10 +1,18 @@
 # "48f18508-f04b-11f0-a8f4-0242ac130003-48f1856c-f04b-11f0-a8f4-0242ac130003"
 import os
+import threading
 import requests
-from datetime import datetime, timezone as dt_timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+
+from core.services.http_transport import mount_transport
 
 BASE_URL = "https://api.stormglass.io/v2/weather/point"
 
+# a API cobra por chamada, não por hora: cada chamada traz vários dias
+HORIZON_DAYS = getattr(settings, "STORMGLASS_HORIZON_DAYS", 5)
+
 DEFAULT_PARAMS = [
     "windSpeed", "windDirection", "gust",
     "waveHeight", "waveDirection", "wavePeriod",
@@ -13,6 +21,22 @@ DEFAULT_PARAMS = [
     "airTemperature",
 ]
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Sessão compartilhada (keep-alive). O transporte segue HTTP_TRANSPORT_MODE:
+    em record/replay/server dá para testar a atualização de previsão sem a API.
+    Sem retry automático: cada chamada conta na cota diária.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = mount_transport(requests.Session())
+        return _session
+
 
 def _pick_first_source(value_obj: dict):
     if not isinstance(value_obj, dict):
@@ -47,7 +71,7 @@ def fetch_point_weather(lat: float, lng: float, start_ts: int, end_ts: int, para
     if sources:
         query["source"] = ",".join(sources) if isinstance(sources, (list, tuple)) else str(sources)
 
-    response = requests.get(
+    response = get_session().get(
         BASE_URL,
         params=query,
         headers={"Authorization": api_key},
@@ -80,8 +104,8 @@ def normalize_hours(payload: dict):
     return out
 
 
-def utc_day_window_for_today():
-    now = datetime.now(dt_timezone.utc)
-    start = datetime(now.year, now.month, now.day, 0, 0, 0, tzinfo=dt_timezone.utc)
-    end = datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=dt_timezone.utc)
-    return start, end
+def forecast_window(days=None, now=None):
+    """Da hora atual (UTC, cheia) até `days` dias à frente (padrão: HORIZON_DAYS)."""
+    now = now or datetime.now(dt_timezone.utc)
+    start = now.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=days or HORIZON_DAYS)
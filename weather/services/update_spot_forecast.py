@@ -1,55 +1,160 @@
+import requests
+from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from weather.models import ForecastHour, StormglassRequestLog
 from weather.services.stormglass import (
     fetch_point_weather,
     normalize_hours,
-    utc_day_window_for_today,
+    forecast_window,
 )
+from weather.services.forecast_cells import cell_for, fetch_point, spots_in_cell
+from weather.services.quota import DAILY_QUOTA, mark_exhausted, reserve_request, sync_used
 
+# campo do ForecastHour <- chave do normalize_hours
+FIELD_MAP = {
+    "wave_height_m": "wave_h",
+    "wave_period_s": "wave_period",
+    "wave_direction_deg": "wave_dir",
+    "swell_height_m": "swell_h",
+    "swell_period_s": "swell_period",
+    "swell_direction_deg": "swell_dir",
+    "wind_speed_ms": "wind_speed",
+    "wind_direction_deg": "wind_dir",
+    "gust_ms": "gust",
+    "water_temp_c": "water_temp",
+    "air_temp_c": "air_temp",
+}
+UPDATE_FIELDS = [*FIELD_MAP, "source"]
 
-def update_spot_forecast(spot):
 
-    start, end = utc_day_window_for_today()
+def _int_or_none(value):
+    return None if value is None else int(round(value))
 
-    payload = fetch_point_weather(
-        lat=spot.latitude,
-        lng=spot.longitude,
+
+def build_forecast_rows(spot, hours):
+    """Horas normalizadas -> ForecastHour (sem salvar). Hora repetida: vale a última."""
+    rows = {}
+    for h in hours:
+        time = parse_datetime(h["time"]) if isinstance(h.get("time"), str) else h.get("time")
+        if time is None:
+            continue
+        values = {field: h.get(key) for field, key in FIELD_MAP.items()}
+        for field in ("wave_direction_deg", "swell_direction_deg", "wind_direction_deg"):
+            values[field] = _int_or_none(values[field])
+        rows[time] = ForecastHour(spot=spot, time=time, source="stormglass", **values)
+    return list(rows.values())
+
+
+@transaction.atomic
+def ingest_forecast(spot, hours):
+    """
+    Grava as horas de um spot num único INSERT ... ON CONFLICT (spot, time)
+    DO UPDATE. Retorna (criadas, atualizadas).
+    """
+    rows = build_forecast_rows(spot, hours)
+    if not rows:
+        return 0, 0
+
+    times = [r.time for r in rows]
+    existing = set(
+        ForecastHour.objects
+        .filter(spot=spot, time__gte=min(times), time__lte=max(times))
+        .order_by()
+        .values_list("time", flat=True)
+    )
+
+    ForecastHour.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["spot", "time"],
+        update_fields=UPDATE_FIELDS,
+    )
+
+    updated = sum(1 for t in times if t in existing)
+    return len(rows) - updated, updated
+
+
+def fetch_cell_payload(spots, start=None, end=None):
+    """
+    Só a chamada HTTP (nada de banco): roda em thread no agendador.
+    Uma chamada para todos os spots da célula (ponto: fetch_point).
+    A cota tem que ter sido reservada antes (reserve_request).
+    """
+    if start is None or end is None:
+        start, end = forecast_window()
+
+    lat, lng = fetch_point(spots)
+    return fetch_point_weather(
+        lat=lat,
+        lng=lng,
         start_ts=int(start.timestamp()),
         end_ts=int(end.timestamp()),
     )
 
+
+def save_cell_forecast(spots, payload, used=None):
+    """
+    Grava a resposta da API em todos os spots da célula + log (um por
+    chamada, no primeiro spot) + last_forecast_update. Retorna
+    (criadas, atualizadas) somando os spots.
+    """
+    meta = payload.get("meta") or {}
+    sync_used(meta.get("requestCount"))
     hours = normalize_hours(payload)
-    created_count = 0
+    now = timezone.now()
+    created_count = updated_count = 0
 
-    for h in hours:
-        obj, created = ForecastHour.objects.update_or_create(
-            spot=spot,
-            time=h["time"],
-            defaults={
-                "wave_height_m": h["wave_h"],
-                "wave_period_s": h["wave_period"],
-                "wave_direction_deg": h["wave_dir"],
-                "swell_height_m": h["swell_h"],
-                "swell_period_s": h["swell_period"],
-                "swell_direction_deg": h["swell_dir"],
-                "wind_speed_ms": h["wind_speed"],
-                "wind_direction_deg": h["wind_dir"],
-                "water_temp_c": h["water_temp"],
-                "air_temp_c": h["air_temp"],
-                "source": "stormglass",
-            },
+    with transaction.atomic():
+        for spot in spots:
+            created, updated = ingest_forecast(spot, hours)
+            created_count += created
+            updated_count += updated
+            spot.last_forecast_update = now
+            spot.save(update_fields=["last_forecast_update"])
+
+        StormglassRequestLog.objects.create(
+            spot=spots[0],
+            status_code=200,
+            request_count=meta.get("requestCount") or used,
+            daily_quota=meta.get("dailyQuota") or DAILY_QUOTA,
         )
-        if created:
-            created_count += 1
+
+    return created_count, updated_count
+
+
+def log_failed_request(spot, exc, used=None):
+    """Chamada que falhou também gasta cota: fica no log."""
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if status_code in (402, 429):
+        mark_exhausted()
 
     StormglassRequestLog.objects.create(
         spot=spot,
-        status_code=200,
-        request_count=1,
-        daily_quota=10,
+        status_code=status_code,
+        request_count=used,
+        daily_quota=DAILY_QUOTA,
+        error_message=str(exc)[:1000],
     )
 
-    spot.last_forecast_update = timezone.now()
-    spot.save(update_fields=["last_forecast_update"])
 
-    return created_count
+def update_spot_forecast(spot, start=None, end=None):
+    """
+    Busca a janela (padrão: próximos HORIZON_DAYS dias) da célula do spot e grava nele e
+    nos vizinhos da mesma célula. Retorna (criadas, atualizadas, spots).
+    QuotaExceeded se a cota do dia acabou (nenhuma chamada é feita).
+    """
+    cell = cell_for(spot.latitude, spot.longitude)
+    neighbours = [s for s in spots_in_cell(cell) if s.pk != spot.pk]
+    spots = [spot, *neighbours]
+
+    used = reserve_request()
+    try:
+        payload = fetch_cell_payload(spots, start, end)
+    except requests.RequestException as exc:
+        log_failed_request(spot, exc, used)
+        raise
+
+    created, updated = save_cell_forecast(spots, payload, used)
+    return created, updated, len(spots)
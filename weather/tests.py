@@ -1,3 +1,54 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 from django.test import TestCase
 
-# Create your tests here.
+from weather.models import ForecastHour, Spot
+from weather.services.retention import COMPACT_STEP_HOURS, HOURLY_DAYS, RETENTION_DAYS, prune_forecasts
+
+
+class ForecastRetentionTests(TestCase):
+    # fora da hora cheia: os cortes contam de 12:00 UTC
+    NOW = datetime(2026, 10, 17, 12, 40, tzinfo=dt_timezone.utc)
+    HOUR = datetime(2026, 10, 17, 12, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        self.spot = Spot.objects.create(name="Itaipu", slug="itaipu", latitude="-22.97", longitude="-43.04")
+        first = self.HOUR - timedelta(days=RETENTION_DAYS + 3)
+        hours = int((self.HOUR + timedelta(days=1) - first).total_seconds() // 3600)
+        ForecastHour.objects.bulk_create(
+            [ForecastHour(spot=self.spot, time=first + timedelta(hours=h)) for h in range(hours)]
+        )
+        self.before = set(ForecastHour.objects.values_list("time", flat=True))
+
+    def kept(self):
+        return set(ForecastHour.objects.filter(spot=self.spot).values_list("time", flat=True))
+
+    def test_prune_keeps_window_and_compacts(self):
+        hourly_from = self.HOUR - timedelta(days=HOURLY_DAYS)
+        retained_from = self.HOUR - timedelta(days=RETENTION_DAYS)
+
+        expired, compacted = prune_forecasts(now=self.NOW, batch_size=50)
+        kept = self.kept()
+
+        # janela horária (e o futuro): tudo fica, inclusive a hora do corte
+        self.assertEqual({t for t in self.before if t >= hourly_from}, {t for t in kept if t >= hourly_from})
+        # faixa compactada: só 1 a cada COMPACT_STEP_HOURS (UTC)
+        compact = {t for t in kept if retained_from <= t < hourly_from}
+        self.assertTrue(compact)
+        self.assertTrue(all(t.hour % COMPACT_STEP_HOURS == 0 for t in compact))
+        expected = {t for t in self.before if retained_from <= t < hourly_from and t.hour % COMPACT_STEP_HOURS == 0}
+        self.assertEqual(compact, expected)
+        # antes da retenção: nada
+        self.assertFalse({t for t in kept if t < retained_from})
+
+        self.assertEqual(expired, len({t for t in self.before if t < retained_from}))
+        self.assertEqual(expired + compacted, len(self.before) - len(kept))
+
+    def test_dry_run_counts_without_deleting(self):
+        counts = prune_forecasts(now=self.NOW, dry_run=True)
+        self.assertEqual(self.kept(), self.before)
+        self.assertEqual(prune_forecasts(now=self.NOW), counts)
+
+    def test_same_hour_prunes_same_rows(self):
+        prune_forecasts(now=self.HOUR + timedelta(minutes=5))
+        self.assertEqual(prune_forecasts(now=self.HOUR + timedelta(minutes=55)), (0, 0))
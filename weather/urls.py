@@ -1,8 +1,9 @@
 # weather/urls.py
 from django.urls import path
-from .views import SpotsListView, SpotDetailView
+from .views import SpotsListView, SpotDetailView, SpotForecastHistoryView
 
 urlpatterns = [
     path("", SpotsListView.as_view(), name="spots_list"),
     path("<slug:slug>/", SpotDetailView.as_view(), name="spot_detail"),
+    path("<slug:slug>/historico/", SpotForecastHistoryView.as_view(), name="spot_history"),
 ]
@@ -1,9 +1,19 @@
 # weather/views.py
+from functools import wraps
+
+from django.shortcuts import get_object_or_404
 from django.views.generic import ListView, DetailView
 from django.utils import timezone
 from django.db.models import Count
+from django.utils.decorators import method_decorator
 from datetime import timedelta
+from core.services.conditional import WEATHER_SCOPE, versioned_view
 from .models import Spot, ForecastHour
+from .services.spot_views import record_view
+
+# janela da página do spot (horas antes/depois de agora)
+WINDOW_PAST = timedelta(hours=3)
+WINDOW_AHEAD = timedelta(hours=48)
 
 
 class SpotsListView(ListView):
@@ -24,6 +34,30 @@ class SpotsListView(ListView):
         return ctx
 
 
+def _spot_version(request, slug):
+    """Última atualização do spot, ou a meia hora atual (a "hora atual" da previsão muda com o tempo)."""
+    rows = list(Spot.objects.filter(slug=slug).values_list("last_forecast_update", flat=True)[:1])
+    if not rows:
+        return None
+    now = timezone.now()
+    half_hour = now.replace(minute=now.minute - now.minute % 30, second=0, microsecond=0)
+    return max(filter(None, [rows[0], half_hour]))
+
+
+def count_view(view_func):
+    """Conta a visita (inclusive 304) para a popularidade do spot, sem escrever no banco agora."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            record_view(kwargs["slug"])
+        return response
+
+    return wrapper
+
+
+@method_decorator(count_view, name="dispatch")
+@versioned_view(WEATHER_SCOPE, object_version=_spot_version)
 class SpotDetailView(DetailView):
     model = Spot
     template_name = "weather/spot_detail.html"
@@ -33,25 +67,31 @@ class SpotDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
+        now = timezone.now()
 
-        # todas as horas já salvas no banco
-        hours = list(
-            self.object.forecast_hours.order_by("time")
+        # só a janela em volta de agora; o resto fica no histórico (SpotForecastHistoryView)
+        ctx["hours"] = list(
+            ForecastHour.objects.window(self.object, now - WINDOW_PAST, now + WINDOW_AHEAD)
         )
+        ctx["current_hour"] = ForecastHour.objects.nearest(self.object, now)
+        return ctx
 
-        now = timezone.now()
-
-        # 🔑 acha a previsão mais próxima do horário atual
-        current_hour = None
-        min_diff = None
 
-        for h in hours:
-            diff = abs((h.time - now).total_seconds())
-            if min_diff is None or diff < min_diff:
-                min_diff = diff
-                current_hour = h
+@versioned_view(WEATHER_SCOPE, object_version=_spot_version)
+class SpotForecastHistoryView(ListView):
+    """Horas anteriores à janela da página do spot, da mais recente para a mais antiga."""
+    template_name = "weather/spot_history.html"
+    context_object_name = "hours"
+    paginate_by = 48
 
-        ctx["hours"] = hours
-        ctx["current_hour"] = current_hour
+    def get_queryset(self):
+        self.spot = get_object_or_404(Spot, slug=self.kwargs["slug"])
+        return ForecastHour.objects.filter(
+            spot=self.spot,
+            time__lt=timezone.now() - WINDOW_PAST,
+        ).order_by("-time")
 
-        return ctx
\ No newline at end of file
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["spot"] = self.spot
+        return ctx